@@ -0,0 +1,17 @@
+from http import HTTPStatus
+
+from flask import abort, current_app, jsonify
+
+from openapi_builder.constants import EXTENSION_NAME
+
+from .blueprint import openapi_documentation
+
+
+@openapi_documentation.get("/build-report")
+def build_report():
+    """Get the build report, if enabled by the `build_report_endpoint` option."""
+    documentation = current_app.extensions[EXTENSION_NAME]
+    report = documentation.get_build_report()
+    if not documentation.options.build_report_endpoint or report is None:
+        abort(HTTPStatus.NOT_FOUND)
+    return jsonify(report.to_dict())
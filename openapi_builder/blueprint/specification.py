@@ -1,6 +1,7 @@
-from flask import current_app, jsonify
+from flask import current_app, request
 
 from openapi_builder.constants import EXTENSION_NAME
+from openapi_builder.payload import iter_chunks
 
 from .blueprint import openapi_documentation
 
@@ -8,4 +9,37 @@ from .blueprint import openapi_documentation
 @openapi_documentation.get("/specification")
 def specification():
     """Get Open API specification."""
-    return jsonify(current_app.extensions[EXTENSION_NAME].get_specification())
+    documentation = current_app.extensions[EXTENSION_NAME]
+    if documentation.options.specification_streaming:
+        etag, chunks = documentation.get_specification_stream()
+        response = current_app.response_class(chunks, mimetype="application/json")
+        if etag is not None:  # not known until the specification was streamed once
+            response.set_etag(etag)
+        return _make_conditional(response, documentation)
+
+    payload = documentation.get_specification_payload()
+
+    encoding = request.accept_encodings.best_match(list(payload.encodings))
+    data = payload.data if encoding is None else payload.encodings[encoding]
+
+    if isinstance(data, bytes):
+        response = current_app.response_class(data, mimetype="application/json")
+    else:
+        # memory-mapped payload: serve it in chunks instead of copying it at once.
+        response = current_app.response_class(
+            iter_chunks(data), mimetype="application/json"
+        )
+        response.content_length = len(data)
+    response.set_etag(payload.get_etag(encoding))
+    if encoding is not None:
+        response.content_encoding = encoding
+    if payload.encodings:
+        response.vary.add("Accept-Encoding")
+    return _make_conditional(response, documentation)
+
+
+def _make_conditional(response, documentation):
+    cache_control = documentation.options.specification_cache_control
+    if cache_control is not None:
+        response.headers["Cache-Control"] = cache_control
+    return response.make_conditional(request)
@@ -1,12 +1,18 @@
+import copy
 import enum
+import gc
+import json
+import threading
+import time
 import warnings
 from dataclasses import dataclass, field
-from typing import List, Optional, Type
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Type, Union
 
 from flask import Flask
 from werkzeug.routing import Rule
 
 from .blueprint.blueprint import openapi_documentation
+from .cache import BoundedCache
 from .constants import EXTENSION_NAME, HIDDEN_ATTR_NAME
 from .converters.defaults.base import DefaultsConverter
 from .converters.defaults.manager import DefaultsManager
@@ -15,6 +21,15 @@ from .converters.parameter.manager import ParameterManager
 from .converters.schema.base import SchemaConverter
 from .converters.schema.manager import SchemaManager
 from .documentation import Documentation, DocumentationConfigManager
+from .fingerprint import SpecificationCache, compute_fingerprint
+from .parsers.cache import DocStringCache
+from .payload import (
+    JSONEncodeFunction,
+    SpecificationPayload,
+    SpecificationSnapshot,
+    get_json_encode_function,
+)
+from .report import BuildRecorder, BuildReport
 from .specification import (
     Info,
     MediaType,
@@ -27,7 +42,8 @@ from .specification import (
     Responses,
     Server,
 )
-from .util import openapi_endpoint_name_from_rule
+from .tags import TagRegistry
+from .util import compile_rule, estimate_size
 
 
 @dataclass(unsafe_hash=True, frozen=True)
@@ -38,6 +54,12 @@ class DocumentationOptions:
         FAIL_ON_ERROR = enum.auto()
         SHOW_WARNINGS = enum.auto()
 
+    class BuildStrategy(enum.Enum):
+        BEFORE_FIRST_REQUEST = enum.auto()
+        EAGER = enum.auto()
+        BACKGROUND = enum.auto()
+        LAZY = enum.auto()
+
     include_head_response: bool = True
     include_options_response: bool = True
     server_url: str = "/"
@@ -54,6 +76,50 @@ class DocumentationOptions:
     parameter_converter_classes: List[Type[ParameterConverter]] = field(
         default_factory=list
     )
+    specification_cache_control: Optional[str] = "no-cache"
+    specification_encodings: List[str] = field(default_factory=lambda: ["br", "gzip"])
+    build_strategy: BuildStrategy = BuildStrategy.BEFORE_FIRST_REQUEST
+    specification_streaming: bool = False
+    schema_cache_size: Optional[int] = None
+    docstring_cache_path: Optional[str] = None
+    specification_cache_path: Optional[str] = None
+    build_report: bool = False
+    build_report_endpoint: bool = False
+    freeze_after_build: bool = False
+    specification_encoder: Union[str, JSONEncodeFunction] = "json"
+
+
+@dataclass(frozen=True)
+class BuildMetrics:
+    """Metrics about building the specification."""
+
+    strategy: DocumentationOptions.BuildStrategy
+    """The strategy that was configured for building the specification."""
+
+    started_at: float
+    """Timestamp (seconds since the epoch) at which the build started."""
+
+    duration: float
+    """Duration of the build in seconds."""
+
+    thread_name: str
+    """Name of the thread that executed the build."""
+
+    from_cache: bool = False
+    """Whether the specification was loaded from `specification_cache_path`."""
+
+
+@dataclass(frozen=True)
+class FreezeMetrics:
+    """Metrics about freezing the documentation, see `OpenApiDocumentation.freeze`."""
+
+    reclaimed: int
+    """Estimated memory (in bytes) of the builder and specification objects that were
+    released."""
+
+    payload_size: int
+    """Size (in bytes) of the encoded specification and its compressed variants, which
+    are kept."""
 
 
 class OpenApiDocumentation:
@@ -89,11 +155,28 @@ class OpenApiDocumentation:
         self.options: DocumentationOptions = (
             options if options is not None else DocumentationOptions()
         )
+        get_json_encode_function(self.options.specification_encoder)  # fail early
+        if (
+            self.options.specification_streaming
+            and self.options.specification_encoder != "json"
+        ):
+            # the stream is encoded in chunks by the standard library.
+            raise ValueError(
+                "Streaming the specification requires the 'json' specification encoder."
+            )
         self.specification = OpenAPI(
             info=Info(title=title, version=version),
             servers=[Server(url=self.options.server_url)],
         )
         self.builder = OpenAPIBuilder(open_api_documentation=self)
+        # the serialized specification that is served, see `get_snapshot`.
+        self._snapshot: Optional[SpecificationSnapshot] = None
+        self._built = threading.Event()
+        self._build_lock = threading.Lock()
+        self._build_thread: Optional[threading.Thread] = None
+        self.build_metrics: Optional[BuildMetrics] = None
+        self.freeze_metrics: Optional[FreezeMetrics] = None
+        self._frozen_build_report: Optional[BuildReport] = None
 
         if self.app is not None:
             self.init_app(app)
@@ -110,12 +193,311 @@ class OpenApiDocumentation:
         app.extensions[EXTENSION_NAME] = self
         self.app = app
 
-        app.before_first_request(lambda: self.builder.iterate_endpoints())
+        strategy = self.options.build_strategy
+        if strategy == DocumentationOptions.BuildStrategy.BEFORE_FIRST_REQUEST:
+            app.before_first_request(self.ensure_built)
+        elif strategy == DocumentationOptions.BuildStrategy.EAGER:
+            self.build()
+        elif strategy == DocumentationOptions.BuildStrategy.BACKGROUND:
+            self.start_background_build()
+        elif strategy != DocumentationOptions.BuildStrategy.LAZY:
+            raise ValueError(f"Unknown build strategy: {strategy}")
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the specification has been built."""
+        return self._built.is_set()
+
+    @property
+    def is_frozen(self) -> bool:
+        """Whether the builder was released, see `freeze`."""
+        return self.builder is None
+
+    def build(self):
+        """Builds the specification by processing the endpoints of the application.
+
+        Depending on `DocumentationOptions.build_strategy`, this is executed automatically.
+        It can also be called directly, e.g. at the end of an application factory.
+
+        The build is single-flight: when multiple threads call this function at the same
+        time, only one of them builds the specification, and the others wait for it.
+
+        If `DocumentationOptions.specification_cache_path` is set, the specification is
+        loaded from there instead, when it was built before from the same routes,
+        documentation, options and source code (see `compute_fingerprint`).
+        """
+        with self._build_lock:
+            if self.is_ready:
+                # another thread finished the build while waiting for the lock.
+                return
+
+            started_at, started = time.time(), time.perf_counter()
+            with self.app.app_context():
+                from_cache = self._build_specification()
+            self._publish()
+
+            self.build_metrics = BuildMetrics(
+                strategy=self.options.build_strategy,
+                started_at=started_at,
+                duration=time.perf_counter() - started,
+                thread_name=threading.current_thread().name,
+                from_cache=from_cache,
+            )
+            self._built.set()
+            if self.options.freeze_after_build:
+                self._freeze(keep_value=False)
+
+    def _build_specification(self) -> bool:
+        """Builds the specification, and returns whether it was loaded from the cache."""
+        if self.options.specification_cache_path is None:
+            self.builder.iterate_endpoints()
+            return False
+
+        cache = SpecificationCache(self.options.specification_cache_path)
+        fingerprint = compute_fingerprint(self)
+        specification = cache.load(fingerprint)
+        if specification is not None:
+            self.specification = specification
+            self.builder.schema_manager.restore(specification)
+            rules = self.app.url_map._rules
+            self.builder.processed_rules.update(id(rule) for rule in rules)
+            self.builder.set_seen_rules(rules)
+            return True
+
+        self.builder.iterate_endpoints()
+        cache.store(fingerprint, self.specification, self.builder.get_source_modules())
+        return False
+
+    def update(self) -> bool:
+        """Adds the rules that were added to the application after the build.
+
+        For example the rules of blueprints that are registered lazily. The specification
+        is updated in place, instead of being built again, and published as a new snapshot.
+        This is done automatically when the specification is requested (see `get_snapshot`).
+
+        Rules of which the processing failed before are processed again as well, after
+        which the error is raised again if it's not fixed.
+
+        :return: Whether rules were added.
+        """
+        with self._build_lock:
+            if self.is_frozen:
+                raise RuntimeError("A frozen documentation can't be updated.")
+            return self._update(retry_failed=True)
+
+    def _update(self, retry_failed: bool = False) -> bool:
+        """Like `update`, but must be called while holding the build lock."""
+        if not (
+            self.builder.has_new_rules() or (retry_failed and self.builder.failed_rules)
+        ):
+            return False
+        with self.app.app_context():
+            self.builder.iterate_endpoints()
+        self._publish()
+        return True
+
+    def start_background_build(self) -> threading.Thread:
+        """Builds the specification in a background (daemon) thread.
+
+        Use `is_ready` to check whether the build finished. Requests for the
+        specification wait until the build is finished.
+        """
+        self._build_thread = threading.Thread(
+            target=self.build, name="openapi-builder", daemon=True
+        )
+        self._build_thread.start()
+        return self._build_thread
+
+    def ensure_built(self):
+        """Builds the specification, unless it's already built (or being built)."""
+        if self.is_ready:
+            return
+
+        if self._build_thread is not None:
+            # let the background build finish, instead of building concurrently.
+            self._build_thread.join()
+        self.build()
 
     def get_specification(self):
-        """Returns the OpenAPI configuration specification as a dictionary."""
+        """Returns the OpenAPI configuration specification as a dictionary.
+
+        The specification is built first if that didn't happen yet, and updated if rules
+        were added since (see `update`). The dictionary must not be modified.
+        """
         # TODO: validate spec
-        return self.specification.get_value()
+        snapshot = self.get_snapshot()
+        if snapshot.value is None:  # frozen without keeping the value
+            return json.loads(snapshot.get_payload().data[:])
+        return snapshot.value
+
+    def get_snapshot(self) -> SpecificationSnapshot:
+        """Returns the snapshot of the specification that is served.
+
+        Snapshots are published after building or updating the specification, so readers
+        never serialize the specification while another thread modifies it. Getting the
+        current snapshot doesn't lock. When the specification changed since, a new snapshot
+        is published first, unless another thread is doing so (or is updating the
+        specification), in which case the current snapshot is returned without waiting.
+        """
+        if self.app is not None:
+            self.ensure_built()
+        snapshot = self._snapshot
+        if snapshot is not None and not self._is_outdated(snapshot):
+            return snapshot
+
+        if not self._build_lock.acquire(blocking=snapshot is None):
+            return snapshot
+        try:
+            if self.is_frozen:
+                return self._snapshot
+            if self.app is not None:
+                try:
+                    self._update()
+                except Exception:
+                    if snapshot is None:
+                        raise
+                    # serve the last published snapshot, instead of failing every request
+                    # for the same rule. It's processed again by `update`, or when other
+                    # rules are added.
+                    self.app.logger.exception(
+                        "Unable to add the new rules to the OpenAPI specification."
+                    )
+                    return snapshot
+            return self._publish()
+        finally:
+            self._build_lock.release()
+
+    def _is_outdated(self, snapshot: SpecificationSnapshot) -> bool:
+        """Whether the specification changed since the snapshot was published."""
+        # read in the reverse order in which `_freeze` releases them.
+        specification, builder = self.specification, self.builder
+        if builder is None:
+            return False  # frozen
+        # the cached value of the specification is discarded when it changes.
+        return specification._value is not snapshot.value or (
+            self.app is not None and builder.has_new_rules()
+        )
+
+    def _publish(self) -> SpecificationSnapshot:
+        """Serializes the specification, and publishes it as the current snapshot.
+
+        Must be called while holding the build lock, which guards the specification.
+        """
+        with self.builder.recorder.phase("get_value"):
+            value = self.specification.get_value()
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.value is not value:
+            snapshot = self._snapshot = SpecificationSnapshot(value)
+        return snapshot
+
+    def get_build_report(self) -> Optional[BuildReport]:
+        """Returns where the time of building the specification went.
+
+        Only available if `DocumentationOptions.build_report` is set, otherwise None.
+        """
+        if self.is_frozen:
+            return self._frozen_build_report
+        if not self.builder.recorder.enabled:
+            return None
+        return self.builder.recorder.report()
+
+    def get_specification_payload(self) -> SpecificationPayload:
+        """Returns the encoded specification.
+
+        The payload is cached, and only encoded again after the specification changed.
+        """
+        return self.get_snapshot().get_payload(
+            app=self.app,
+            encodings=self.options.specification_encodings,
+            encoder=self.options.specification_encoder,
+        )
+
+    def get_specification_stream(self) -> Tuple[Optional[str], Iterator[bytes]]:
+        """Returns the entity tag and the chunks of the encoded specification.
+
+        Contrary to `get_specification_payload`, the encoded specification is never held
+        in memory at once. The entity tag is computed from the chunks while they're
+        streamed, so it's None until the specification was streamed completely once
+        (unless the payload was created already), and again after it changed.
+        """
+        return self.get_snapshot().get_stream(
+            app=self.app,
+            payload_etag=self.options.specification_encoder == "json",
+        )
+
+    def freeze(self, keep_value: bool = False) -> FreezeMetrics:
+        """Releases everything that is needed for building the specification.
+
+        After the build, only the encoded specification is served. Freezing keeps the
+        payload, and releases the builder (with its managers, converters and caches) and
+        the specification objects, which saves memory in every worker process. Caches that
+        are shared by the process (like the parsers cached by `DocStringParser`) are kept,
+        since other documentations might use them; call `DocStringParser.clear_cache` to
+        release those as well. The specification is built first, if that didn't happen
+        yet. This is done after the build if `freeze_after_build` is set.
+
+        A frozen specification can't be modified or updated anymore, so rules that are
+        added afterwards are not documented.
+
+        :param keep_value: Whether to keep the specification as dictionary as well, for
+            `get_specification`. Otherwise it's decoded from the payload for every call.
+        :return: The metrics, which are also available as `freeze_metrics`.
+        """
+        if self.app is not None:
+            self.ensure_built()
+        with self._build_lock:
+            if not self.is_frozen:
+                self._freeze(keep_value=keep_value)
+            return self.freeze_metrics
+
+    def _freeze(self, keep_value: bool):
+        """Like `freeze`, but must be called while holding the build lock."""
+        snapshot = self._publish()
+        payload = snapshot.get_payload(
+            app=self.app,
+            encodings=self.options.specification_encodings,
+            encoder=self.options.specification_encoder,
+        )
+        self._frozen_build_report = self.get_build_report()
+        self._snapshot = SpecificationSnapshot(
+            snapshot.value if keep_value else None, payload=payload
+        )
+
+        builder, specification = self.builder, self.specification
+        # readers check whether the builder is released first, see `_is_outdated`.
+        self.builder = None
+        self.specification = None
+        reclaimed = estimate_size([builder, specification, snapshot], exclude=[self])
+        del builder, specification, snapshot
+
+        gc.collect()  # the builder refers to itself through its managers
+        self.freeze_metrics = FreezeMetrics(
+            reclaimed=reclaimed,
+            payload_size=len(payload.data)
+            + sum(len(data) for data in payload.encodings.values()),
+        )
+
+    def preload(self, path: Optional[str] = None, gc_freeze: bool = True):
+        """Builds and encodes the specification in the current process.
+
+        This is meant to be called in the master process of a pre-forking server (e.g.
+        gunicorn with `--preload`), so that forked workers share the specification,
+        instead of building and encoding it in every worker.
+
+        :param path: If given, the payload is written to this path and served from a
+            read-only memory map of the file, which is shared by all workers.
+        :param gc_freeze: Whether to move all objects to the permanent generation of the
+            garbage collector (`gc.freeze`), so that the garbage collector in the workers
+            doesn't write to (and thereby copy) the memory pages of the specification.
+        :return: The encoded specification.
+        """
+        payload = self.get_specification_payload()
+        if path is not None:
+            payload = self.get_snapshot().map_to_files(path)
+
+        if gc_freeze and hasattr(gc, "freeze"):  # gc.freeze was added in Python 3.7
+            gc.freeze()
+        return payload
 
 
 class OpenAPIBuilder:
@@ -130,61 +512,127 @@ class OpenAPIBuilder:
         self.parameter_manager = ParameterManager(builder=self)
         self.parameter_manager.load_converters()
         self.config_manager = DocumentationConfigManager()
+        self.recorder = BuildRecorder(enabled=self.options.build_report)
+        self.schema_cache = BoundedCache(maxsize=self.options.schema_cache_size)
+        self.docstring_cache: Optional[DocStringCache] = None
+        if self.options.docstring_cache_path is not None:
+            self.docstring_cache = DocStringCache(self.options.docstring_cache_path)
+        # converted values by documentation configuration (id), during the build.
+        self.conversions: Dict[int, Tuple[Documentation, Dict[str, Any]]] = {}
+        # ids of the rules that were processed, and of the rules that failed to process.
+        self.processed_rules: Set[int] = set()
+        self.failed_rules: Set[int] = set()
+        # the number and the last of the rules of the url map, when they were iterated.
+        self.seen_rules: Tuple[int, Optional[Rule]] = (0, None)
+        # classes of the converted values, of which the source is part of the cache entry.
+        self.source_classes: Set[type] = set()
+
+    def get_source_modules(self) -> Set[str]:
+        """Returns the modules that define the converted classes, or their base classes."""
+        return {
+            klass.__module__ for cls in self.source_classes for klass in cls.__mro__
+        }
 
     def iterate_endpoints(self):
         """Iterates the endpoints of the Flask application to generate the documentation.
 
         This function is executed before the first request is processed in the corresponding
         Flask application, but after OpenApiBuilder.append_converter_classs.
+
+        Rules that were processed before are skipped, so calling this again only adds the
+        rules that were added to the application since. Only the paths, components and
+        tags that changed are serialized again.
         """
-        for rule in self.open_api_documentation.app.url_map._rules:
-            view_func = self.open_api_documentation.app.view_functions[rule.endpoint]
-            config: Documentation = getattr(view_func, HIDDEN_ATTR_NAME, None)
-            if config is None:
-                # endpoint has no documentation configuration -> skip
-                continue
-
-            blueprint_name = rule.endpoint.split(".")[0]
-            blueprint = self.open_api_documentation.app.blueprints.get(blueprint_name)
-            resource_options = getattr(blueprint, HIDDEN_ATTR_NAME, None)
-
-            if resource_options is not None:
-                tag_names = [
-                    tag.name for tag in self.open_api_documentation.specification.tags
-                ]
-                for tag in resource_options.tags:
-                    if tag.name not in tag_names:
-                        self.open_api_documentation.specification.tags.append(tag)
-                        self.open_api_documentation.specification.tags.sort(
-                            key=lambda t: t.name  # sort alphabetically
-                        )
-
-            with self.config_manager.use_documentation_context(config):
+        specification = self.open_api_documentation.specification
+        with self.recorder.phase("iterate_endpoints"):
+            self.conversions = {}
+            tags = TagRegistry(specification.tags)
+            # a copy, since rules might be added meanwhile (e.g. by another thread while
+            # building in the background), which are processed by the next update.
+            rules = list(self.open_api_documentation.app.url_map._rules)
+            self.set_seen_rules(rules)
+            for rule in rules:
+                if id(rule) in self.processed_rules:
+                    continue
+
+                view_func = self.open_api_documentation.app.view_functions.get(
+                    rule.endpoint
+                )
+                if view_func is None:
+                    # Flask adds the rule before its view function, so the rule is still
+                    # being added: process it with the next update.
+                    self.seen_rules = (0, None)
+                    continue
+                config: Documentation = getattr(view_func, HIDDEN_ATTR_NAME, None)
+                if config is None:
+                    # endpoint has no documentation configuration -> skip
+                    self.processed_rules.add(id(rule))
+                    continue
+
+                blueprint_name = rule.endpoint.split(".")[0]
+                blueprint = self.open_api_documentation.app.blueprints.get(
+                    blueprint_name
+                )
+                resource_options = getattr(blueprint, HIDDEN_ATTR_NAME, None)
+
                 if resource_options is not None:
                     for tag in resource_options.tags:
-                        if tag.name not in self.config.tags:
-                            self.config.tags.append(tag.name)
-
-                self.process_rule(rule)
+                        tags.add(tag)
+
+                with self.config_manager.use_documentation_context(config):
+                    if resource_options is not None:
+                        for tag in resource_options.tags:
+                            if tag.name not in self.config.tags:
+                                self.config.tags.append(tag.name)
+
+                    try:
+                        with self.recorder.phase(
+                            "process_rule", item=rule.rule, category="endpoints"
+                        ):
+                            self.process_rule(rule)
+                    except BaseException:
+                        self.failed_rules.add(id(rule))
+                        raise
+                    # only after processing succeeded, so a failing rule is retried.
+                    self.failed_rules.discard(id(rule))
+                    self.processed_rules.add(id(rule))
+
+            if tags.changed:
+                specification.tags = tags.sorted()  # sort alphabetically, once
+            self.conversions = {}
+
+    def set_seen_rules(self, rules: List[Rule]):
+        """Records the rules of the url map, which are compared by `has_new_rules`."""
+        self.seen_rules = (len(rules), rules[-1] if rules else None)
+
+    def has_new_rules(self) -> bool:
+        """Whether the rules of the application changed since they were iterated.
+
+        Rules are only appended to the url map, so comparing the number of rules and the
+        last rule is enough, which is done for every request of the specification.
+        """
+        rules = self.open_api_documentation.app.url_map._rules
+        count, last_rule = self.seen_rules
+        return len(rules) != count or (count > 0 and rules[-1] is not last_rule)
 
     def process_rule(self, rule: Rule):
         """Processes a Werkzeug rule."""
+        template = compile_rule(rule)
         parameters = list(self.config.parameters)
-        for argument, converter_class in rule._converters.items():
-            schema = self.parameter_manager.process(converter_class)
+        for argument in template.arguments:
+            schema = self.parameter_manager.process(
+                rule._converters[argument], shared=True
+            )
             parameters.append(
                 Parameter(name=argument, in_="path", required=True, schema=schema)
             )
-        endpoint_name = openapi_endpoint_name_from_rule(rule)
-
-        if endpoint_name not in self.paths.values:
-            self.paths.values[endpoint_name] = PathItem(parameters=parameters)
-        path_item = self.paths.values[endpoint_name]
+        endpoint_name = template.path
 
+        operations = {}
         for method in rule.methods:
             values = {}
             for key, schema in self.config.response.items():
-                reference = self.schema_manager.process(schema, name=key)
+                reference = self.convert(f"response.{key}", schema, name=key)
                 values[key] = Response(
                     description="",
                     content={
@@ -200,7 +648,14 @@ class OpenAPIBuilder:
             )
             self.process_request_query(operation)
             self.process_request_data(operation)
+            operations[method] = operation
+
+        # added after all operations are processed, so a failing rule adds nothing.
+        if endpoint_name not in self.paths.values:
+            self.paths.values[endpoint_name] = PathItem(parameters=parameters)
+        path_item = self.paths.values[endpoint_name]
 
+        for method, operation in operations.items():
             if method == "GET":
                 path_item.get = operation
             if method == "HEAD" and self.options.include_head_response:
@@ -214,11 +669,32 @@ class OpenAPIBuilder:
             if method == "DELETE":
                 path_item.delete = operation
 
+    def convert(self, key: str, value: Any, name: str):
+        """Converts a value of the documentation configuration, once per build.
+
+        All methods of a rule, and all rules of a view function, use the converted
+        value of the same documentation configuration. Every call returns a private copy
+        of it, so modifying the result for one operation doesn't modify the others.
+
+        :param key: The key of the value in the documentation configuration.
+        """
+        config = self.config
+        entry = self.conversions.get(id(config))
+        if entry is None:  # the entry keeps the configuration, so its id isn't reused
+            entry = self.conversions[id(config)] = (config, {})
+        converted = entry[1]
+        if key not in converted:
+            converted[key] = self.schema_manager.process(value, name=name, shared=True)
+        # shared schemas within the value are kept, since they can't be modified.
+        return copy.deepcopy(converted[key])
+
     def process_request_query(self, operation):
         if self.config.request_query is None:
             return
 
-        reference = self.schema_manager.process(self.config.request_query, name="query")
+        reference = self.convert(
+            "request_query", self.config.request_query, name="query"
+        )
         try:
             schema = reference.get_schema(self.open_api_documentation.specification)
         except KeyError:
@@ -238,7 +714,7 @@ class OpenAPIBuilder:
         request_data = self.config.request_data
         if request_data is None:
             return
-        reference = self.schema_manager.process(request_data, name="request_data")
+        reference = self.convert("request_data", request_data, name="request_data")
         operation.request_body = RequestBody(
             description=self.config.description,
             content={
@@ -0,0 +1,47 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class BoundedCache:
+    """Thread-safe cache, which optionally evicts the least recently used items.
+
+    :param maxsize: The maximum number of items in the cache, or None for no maximum.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None):
+        if maxsize is not None and maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, not {maxsize}.")
+        self.maxsize = maxsize
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the cached value for the key, and marks it as recently used."""
+        with self._lock:
+            try:
+                self._items.move_to_end(key)
+            except KeyError:
+                return default
+            return self._items[key]
+
+    def set(self, key: Hashable, value: Any):
+        """Caches the value for the key, and evicts the least recently used item if needed."""
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            if self.maxsize is not None and len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        """Removes all items from the cache."""
+        with self._lock:
+            self._items.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._items
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
@@ -29,6 +29,8 @@ class ListConverter(DefaultsConverter):
 
 @append_converter_class
 class CallableConverter(DefaultsConverter):
+    matches_by_type = True
+
     def matches(self, value) -> bool:
         return callable(value)
 
@@ -47,6 +49,8 @@ class EnumConverter(DefaultsConverter):
 
 @append_converter_class
 class NoneConverter(DefaultsConverter):
+    matches_by_type = True
+
     def matches(self, value) -> bool:
         return value is None
 
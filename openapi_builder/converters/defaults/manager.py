@@ -3,6 +3,7 @@ import warnings
 
 from openapi_builder.exceptions import MissingDefaultConverter
 
+from ..dispatch import ConverterDispatcher
 from .default_converters import ALL_DEFAULT_CONVERTER_CLASSES
 from .base import DefaultsConverter
 
@@ -14,6 +15,9 @@ class DefaultsManager:
     def __init__(self, builder: "OpenAPIBuilder"):
         self.builder: OpenAPIBuilder = builder
         self.converters: typing.List[DefaultsConverter] = []
+        self.dispatcher = ConverterDispatcher(
+            self.converters, base_class=DefaultsConverter
+        )
 
     def load_converters(self):
         """Load all converters, including the defaults."""
@@ -26,14 +30,12 @@ class DefaultsManager:
     def register(self, converter_class: typing.Type["DefaultsConverter"]):
         converter = converter_class(manager=self)
         self.converters.append(converter)
+        self.dispatcher.clear()
 
     def process(self, value: typing.Any):
         """Processes an instance, and returns a schema, or reference to that schema."""
-        try:
-            converter = next(
-                converter for converter in self.converters if converter.matches(value)
-            )
-        except StopIteration:
+        converter = self.dispatcher.find(value)
+        if converter is None:
             if self.options.strict_mode == self.options.StrictMode.FAIL_ON_ERROR:
                 raise MissingDefaultConverter()
             elif self.options.strict_mode == self.options.StrictMode.SHOW_WARNINGS:
@@ -41,7 +43,7 @@ class DefaultsManager:
                 return None
             else:
                 raise ValueError(f"Unknown strict mode: {self.options.strict_mode}")
-        else:
+        with self.builder.recorder.phase("defaults_manager.process"):
             return converter.convert(value=value)
 
     @property
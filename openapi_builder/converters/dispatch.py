@@ -0,0 +1,62 @@
+import typing
+
+
+def matches_by_type(converter, base_class: type) -> bool:
+    """Returns whether the result of `converter.matches(value)` only depends on the type of the value.
+
+    This is specified by the `matches_by_type` attribute of the converter. If the attribute is
+    None, this is True for converters that use the `matches` of the base class, which is an
+    `isinstance` check.
+    """
+    if converter.matches_by_type is not None:
+        return converter.matches_by_type
+    return type(converter).matches is base_class.matches
+
+
+class DispatchPlan(typing.NamedTuple):
+    """The converters that might match a value of a certain type, in registration order."""
+
+    value_converters: typing.Tuple[typing.Any, ...]
+    """Converters of which `matches` depends on the value, registered before `converter`."""
+
+    converter: typing.Any
+    """The first converter of which `matches` only depends on the type, that matches."""
+
+
+class ConverterDispatcher:
+    """Finds the first matching converter of a manager.
+
+    Instead of calling `matches` of every converter for every value, the converters that can
+    match are resolved once per type of the value. Converters of which `matches` depends on
+    the value (see `matches_by_type`) are still checked for every value, in registration
+    order.
+    """
+
+    def __init__(self, converters: typing.List[typing.Any], base_class: type):
+        self.converters = converters
+        self.base_class = base_class
+        self._plans: typing.Dict[type, DispatchPlan] = {}
+
+    def clear(self):
+        """Clears the resolved converters, e.g. after registering a converter."""
+        self._plans = {}
+
+    def find(self, value: typing.Any) -> typing.Optional[typing.Any]:
+        """Returns the first converter that matches the value, or None."""
+        plan = self._plans.get(type(value))
+        if plan is None:
+            plan = self._plans[type(value)] = self._create_plan(value)
+
+        for converter in plan.value_converters:
+            if converter.matches(value):
+                return converter
+        return plan.converter
+
+    def _create_plan(self, value: typing.Any) -> DispatchPlan:
+        value_converters = []
+        for converter in self.converters:
+            if not matches_by_type(converter, self.base_class):
+                value_converters.append(converter)
+            elif converter.matches(value):
+                return DispatchPlan(tuple(value_converters), converter)
+        return DispatchPlan(tuple(value_converters), None)
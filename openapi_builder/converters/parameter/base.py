@@ -13,6 +13,14 @@ class ParameterConverter(ABC):
     converts_class = None
     """Specification of the class that it converts."""
 
+    matches_by_type: typing.Optional[bool] = None
+    """Whether the result of `matches` only depends on the type of the value.
+
+    The manager resolves converters of which `matches` only depends on the type once per type.
+    If None, this is True unless `matches` is overridden. Set this explicitly for
+    converters that override `matches`.
+    """
+
     def __init__(self, manager: "ParameterManager"):
         self.manager: ParameterManager = manager
 
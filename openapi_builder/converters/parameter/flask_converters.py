@@ -8,7 +8,7 @@ from werkzeug.routing import (
     UUIDConverter,
 )
 
-from openapi_builder.specification import Schema
+from openapi_builder.specification import Schema, intern_schema
 
 from .base import ParameterConverter
 
@@ -27,7 +27,7 @@ class UnicodeParameterConverter(ParameterConverter):
 
     @property
     def schema(self) -> Schema:
-        return Schema(type="string", format="string")
+        return intern_schema(Schema(type="string", format="string"))
 
 
 @append_converter_class
@@ -36,7 +36,7 @@ class AnyParameterConverter(ParameterConverter):
 
     @property
     def schema(self) -> Schema:
-        return Schema(type="string", format="string")
+        return intern_schema(Schema(type="string", format="string"))
 
 
 @append_converter_class
@@ -45,7 +45,7 @@ class PathParameterConverter(ParameterConverter):
 
     @property
     def schema(self) -> Schema:
-        return Schema(type="string", format="string")
+        return intern_schema(Schema(type="string", format="string"))
 
 
 @append_converter_class
@@ -54,7 +54,7 @@ class IntParameterConverter(ParameterConverter):
 
     @property
     def schema(self) -> Schema:
-        return Schema(type="number", format="integer")
+        return intern_schema(Schema(type="number", format="integer"))
 
 
 @append_converter_class
@@ -63,7 +63,7 @@ class FloatParameterConverter(ParameterConverter):
 
     @property
     def schema(self) -> Schema:
-        return Schema(type="number", format="float")
+        return intern_schema(Schema(type="number", format="float"))
 
 
 @append_converter_class
@@ -72,4 +72,4 @@ class UUIDParameterConverter(ParameterConverter):
 
     @property
     def schema(self) -> Schema:
-        return Schema(type="string", format="hex")
+        return intern_schema(Schema(type="string", format="hex"))
@@ -3,8 +3,9 @@ import warnings
 
 
 from openapi_builder.exceptions import MissingParameterConverter
-from openapi_builder.specification import Schema
+from openapi_builder.specification import Schema, intern_schema
 
+from ..dispatch import ConverterDispatcher
 from .base import ParameterConverter
 from .flask_converters import ALL_PARAMETER_CONVERTER_CLASSES
 
@@ -16,6 +17,9 @@ class ParameterManager:
     def __init__(self, builder: "OpenAPIBuilder"):
         self.builder: OpenAPIBuilder = builder
         self.converters: typing.List[ParameterConverter] = []
+        self.dispatcher = ConverterDispatcher(
+            self.converters, base_class=ParameterConverter
+        )
 
     def load_converters(self):
         """Load all converters, including the defaults."""
@@ -28,23 +32,26 @@ class ParameterManager:
     def register(self, converter_class: typing.Type[ParameterConverter]):
         converter = converter_class(manager=self)
         self.converters.append(converter)
-
-    def process(self, value: typing.Any):
-        """Processes an instance, and returns a schema, or reference to that schema."""
-        try:
-            return next(
-                converter.schema
-                for converter in self.converters
-                if converter.matches(value)
-            )
-        except StopIteration:
-            if self.options.strict_mode == self.options.StrictMode.FAIL_ON_ERROR:
+        self.dispatcher.clear()
+
+    def process(self, value: typing.Any, shared: bool = False):
+        """Processes an instance, and returns a schema, or reference to that schema.
+
+        :param shared: Whether the result may be a shared schema (see `intern_schema`),
+            which can't be modified. Otherwise, a shared schema is copied first.
+        """
+        with self.builder.recorder.phase("parameter_manager.process"):
+            converter = self.dispatcher.find(value)
+            if converter is not None:
+                schema = converter.schema
+            elif self.options.strict_mode == self.options.StrictMode.FAIL_ON_ERROR:
                 raise MissingParameterConverter()
             elif self.options.strict_mode == self.options.StrictMode.SHOW_WARNINGS:
                 warnings.warn(f"Missing converter for: {value}", UserWarning)
-                return Schema(example="<unknown>")
+                schema = intern_schema(Schema(example="<unknown>"))
             else:
                 raise ValueError(f"Unknown strict mode: {self.options.strict_mode}")
+            return schema if shared else schema.writable()
 
     @property
     def options(self):
@@ -1,7 +1,7 @@
 import typing
 from abc import ABC, abstractmethod
 
-from openapi_builder.specification import Schema
+from openapi_builder.specification import OpenAPI, Schema
 
 if typing.TYPE_CHECKING:
     from .manager import SchemaManager
@@ -13,6 +13,14 @@ class SchemaConverter(ABC):
     converts_class = None
     """Specification of the class that it converts."""
 
+    matches_by_type: typing.Optional[bool] = None
+    """Whether the result of `matches` only depends on the type of the value.
+
+    The manager resolves converters of which `matches` only depends on the type once per type.
+    If None, this is True unless `matches` is overridden. Set this explicitly for
+    converters that override `matches`.
+    """
+
     def __init__(self, manager: "SchemaManager"):
         self.manager: SchemaManager = manager
 
@@ -20,6 +28,14 @@ class SchemaConverter(ABC):
         """Returns True if the Converter can match the specified class."""
         return isinstance(value, self.converts_class)
 
+    def restore(self, specification: OpenAPI):
+        """Restores the state of the converter for a specification loaded from the cache.
+
+        Rules that are added afterwards are converted into the same specification, so
+        converters that keep track of the components they added must take the components
+        of the cached specification into account.
+        """
+
     @abstractmethod
     def convert(self, value, name) -> Schema:
         raise NotImplementedError()
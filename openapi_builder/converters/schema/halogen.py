@@ -1,11 +1,16 @@
 import datetime
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 import halogen
 
 from openapi_builder.constants import HIDDEN_ATTR_NAME
 from openapi_builder.documentation import SchemaOptions
-from openapi_builder.specification import Discriminator, Reference, Schema
+from openapi_builder.specification import (
+    Discriminator,
+    Reference,
+    Schema,
+    intern_schema,
+)
 
 from .base import SchemaConverter
 from openapi_builder.parsers.docstring import DocStringParser
@@ -23,7 +28,7 @@ class ListConverter(SchemaConverter):
     converts_class = halogen.types.List
 
     def convert(self, value: halogen.types.List, name) -> Schema:
-        items = self.manager.process(value.item_type, name=name)
+        items = self.manager.process(value.item_type, name=name, shared=True)
         schema = Schema(type="array", items=items)
 
         if value.allow_scalar:
@@ -76,7 +81,7 @@ class StringConverter(SchemaConverter):
     converts_class = halogen.types.String
 
     def convert(self, value: halogen.types.String, name) -> Schema:
-        return Schema(type="string")
+        return intern_schema(Schema(type="string"))
 
 
 @append_converter_class
@@ -84,7 +89,7 @@ class IntConverter(SchemaConverter):
     converts_class = halogen.types.Int
 
     def convert(self, value: halogen.types.Int, name) -> Schema:
-        return Schema(type="integer")
+        return intern_schema(Schema(type="integer"))
 
 
 @append_converter_class
@@ -92,7 +97,7 @@ class BooleanConverter(SchemaConverter):
     converts_class = halogen.types.Boolean
 
     def convert(self, value: halogen.types.Boolean, name) -> Schema:
-        return Schema(type="boolean")
+        return intern_schema(Schema(type="boolean"))
 
 
 @append_converter_class
@@ -103,8 +108,8 @@ class AmountConverter(SchemaConverter):
         return Schema(
             type="object",
             properties={
-                "amount": Schema(type="string"),
-                "currency": Schema(type="string"),
+                "amount": intern_schema(Schema(type="string")),
+                "currency": intern_schema(Schema(type="string")),
             },
         )
 
@@ -122,6 +127,7 @@ class NullableConverter(SchemaConverter):
 @append_converter_class
 class LinkConverter(SchemaConverter):
     converts_class = halogen.schema._SchemaType
+    matches_by_type = False
 
     def matches(self, value) -> bool:
         return super().matches(value) and value.__name__ == "LinkSchema"
@@ -130,7 +136,9 @@ class LinkConverter(SchemaConverter):
         properties = {}
 
         for prop in value.__attrs__.values():
-            properties[prop.key] = Schema(type="string", format="url", example="<url>")
+            properties[prop.key] = intern_schema(
+                Schema(type="string", format="url", example="<url>")
+            )
 
         return Schema(type="object", properties=properties)
 
@@ -138,6 +146,7 @@ class LinkConverter(SchemaConverter):
 @append_converter_class
 class CurieConverter(SchemaConverter):
     converts_class = halogen.schema._SchemaType
+    matches_by_type = False
     currie_attributes = {"href", "name", "templated", "type"}
 
     def matches(self, value) -> bool:
@@ -149,10 +158,10 @@ class CurieConverter(SchemaConverter):
         return Schema(
             type="object",
             properties={
-                "href": Schema(type="string", format="url"),
-                "name": Schema(type="string"),
-                "templated": Schema(type="boolean"),
-                "type": Schema(type="string"),
+                "href": intern_schema(Schema(type="string", format="url")),
+                "name": intern_schema(Schema(type="string")),
+                "templated": intern_schema(Schema(type="boolean")),
+                "type": intern_schema(Schema(type="string")),
             },
         )
 
@@ -161,21 +170,57 @@ class CurieConverter(SchemaConverter):
 class SchemaConverter(SchemaConverter):
     converts_class = halogen.schema._SchemaType
 
-    cache = {}
-
-    def convert(self, value, name) -> Schema:
-        if value.__name__ in self.cache:
-            return self.cache[value.__name__]
-        else:
-            self.cache[value.__name__] = Reference.from_schema(
-                schema_name=value.__name__,
-                schema=Schema(type="object"),
+    def __init__(self, manager):
+        super().__init__(manager=manager)
+        # components by schema class, while the schema class is being converted.
+        self.converting: Dict[Any, Tuple[str, Schema]] = {}
+        # schema classes by component name, to give classes with equal names unique names.
+        self.component_names: Dict[str, Any] = {}
+
+    def convert(self, value, name) -> Reference:
+        # keyed by the schema class itself, since (generated) schema classes from different
+        # modules can have the same name.
+        key = ("halogen", value)
+        component = self.converting.get(key) or self.manager.builder.schema_cache.get(
+            key
+        )
+        if component is None:
+            component = self.convert_component(key, value)
+            self.manager.builder.schema_cache.set(key, component)
+
+        schema_name, schema = component
+        # A new reference for every usage, since the caller can modify it.
+        return Reference.from_schema(schema_name=schema_name, schema=schema)
+
+    def restore(self, specification):
+        # The schema classes of the cached components are unknown, so their names are
+        # reserved, and schema classes that are converted afterwards get another name.
+        self.component_names = dict.fromkeys(specification.components.schemas)
+
+    def get_component_name(self, value) -> str:
+        """Returns a unique component name for the schema class."""
+        schema_name, index = value.__name__, 1
+        while self.component_names.setdefault(schema_name, value) is not value:
+            index += 1
+            schema_name = f"{value.__name__}{index}"
+        return schema_name
+
+    def convert_component(self, key, value) -> Tuple[str, Schema]:
+        """Converts the schema class to a component."""
+        schema_name = self.get_component_name(value)
+        # Schema classes that refer to themselves (indirectly), refer to the component.
+        self.converting[key] = schema_name, Schema(type="object")
+        try:
+            return schema_name, self.convert_schema(value, schema_name)
+        finally:
+            del self.converting[key]
+
+    def convert_schema(self, value, schema_name) -> Schema:
+        with self.manager.builder.recorder.phase("docstring_parser"):
+            docstrings = DocStringParser.from_class(value).get_docstrings(
+                value.__name__, cache=self.manager.builder.docstring_cache
             )
 
-        parser = DocStringParser.from_class(value)
-        parser.parse()
-
-        schema_name = value.__name__
         schema_options: Optional["SchemaOptions"] = getattr(
             value, HIDDEN_ATTR_NAME, None
         )
@@ -192,14 +237,20 @@ class SchemaConverter(SchemaConverter):
             attr = self.manager.process(
                 value=prop.attr_type,
                 name=f"{schema_name}.{prop.key}",
+                shared=True,
             )
-            if parser.result.get(f"{schema_name}.{key}"):
-                attr.description = parser.result.get(f"{schema_name}.{key}")
-            if schema_options is not None and key in schema_options.options:
+            description = docstrings.get(f"{value.__name__}.{key}")
+            has_options = schema_options is not None and key in schema_options.options
+            has_default = hasattr(prop, "default")
+            if description or has_options or prop.required is False or has_default:
+                attr = attr.writable()  # the attribute might be shared
+            if description:
+                attr.description = description
+            if has_options:
                 attr.options = schema_options.options[key]
             if prop.required is False:
                 attr.required = False
-            if hasattr(prop, "default"):
+            if has_default:
                 attr.required = False
                 attr.default = self.manager.builder.default_manager.process(
                     prop.default
@@ -212,14 +263,14 @@ class SchemaConverter(SchemaConverter):
 
         self.manager.builder.schemas[schema_name] = schema
         if not schema_options or not schema_options.discriminator:
-            return Reference.from_schema(schema_name=schema_name, schema=schema)
+            return schema
 
         # process discriminator configuration
         new_schema = Schema(type="object")
         self.manager.builder.schemas[schema_name] = new_schema
 
         mapping = {
-            key: self.manager.process(value=value, name=key)
+            key: self.manager.process(value=value, name=key, shared=True)
             for key, value in schema_options.discriminator.mapping.items()
         }
         if schema_options.discriminator.all_of:
@@ -234,4 +285,4 @@ class SchemaConverter(SchemaConverter):
             mapping={key: reference.ref for key, reference in mapping.items()},
         )
 
-        return Reference.from_schema(schema_name=schema_name, schema=new_schema)
+        return new_schema
@@ -2,8 +2,9 @@ import typing
 import warnings
 
 from openapi_builder.exceptions import MissingConverter
-from openapi_builder.specification import Schema
+from openapi_builder.specification import OpenAPI, Schema, intern_schema
 
+from ..dispatch import ConverterDispatcher
 from .base import SchemaConverter
 
 if typing.TYPE_CHECKING:
@@ -16,6 +17,11 @@ class SchemaManager:
     def __init__(self, builder: "OpenAPIBuilder"):
         self.builder: OpenAPIBuilder = builder
         self.converters: typing.List[SchemaConverter] = []
+        self.stack: typing.List[typing.Any] = []
+        """The values that are being processed, from outer to inner."""
+        self.dispatcher = ConverterDispatcher(
+            self.converters, base_class=SchemaConverter
+        )
 
     def load_converters(self):
         """Load all converters, including the defaults."""
@@ -39,23 +45,41 @@ class SchemaManager:
     def register(self, converter_class: typing.Type[SchemaConverter]):
         converter = converter_class(manager=self)
         self.converters.append(converter)
+        self.dispatcher.clear()
 
-    def process(self, value: typing.Any, name: str):
-        """Processes an instance, and returns a schema, or reference to that schema."""
-        try:
-            converter = next(
-                converter for converter in self.converters if converter.matches(value)
-            )
-        except StopIteration:
+    def restore(self, specification: OpenAPI):
+        """Restores the state of the converters for a specification loaded from the cache."""
+        for converter in self.converters:
+            converter.restore(specification)
+
+    def process(self, value: typing.Any, name: str, shared: bool = False):
+        """Processes an instance, and returns a schema, or reference to that schema.
+
+        :param shared: Whether the result may be a shared schema (see `intern_schema`),
+            which can't be modified. Otherwise, a shared schema is copied first.
+        """
+        converter = self.dispatcher.find(value)
+        if converter is None:
             if self.options.strict_mode == self.options.StrictMode.FAIL_ON_ERROR:
                 raise self.exception_class()
             elif self.options.strict_mode == self.options.StrictMode.SHOW_WARNINGS:
                 warnings.warn(f"Missing converter for: {value}: {name}", UserWarning)
-                return Schema(example="<unknown>")
+                schema = intern_schema(Schema(example="<unknown>"))
+                return schema if shared else schema.writable()
             else:
                 raise ValueError(f"Unknown strict mode: {self.options.strict_mode}")
-        else:
-            return converter.convert(value=value, name=name)
+        self.builder.source_classes.add(
+            value if isinstance(value, type) else type(value)
+        )
+        self.stack.append(value)
+        try:
+            with self.builder.recorder.phase(
+                "schema_manager.process", item=value, category="schemas", path=name
+            ):
+                schema = converter.convert(value=value, name=name)
+        finally:
+            self.stack.pop()
+        return schema if shared else schema.writable()
 
     @property
     def options(self):
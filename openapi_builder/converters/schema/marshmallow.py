@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Union
+from typing import Dict, FrozenSet, NamedTuple, Optional, Tuple, Union
 
 import marshmallow
 
-from openapi_builder.specification import Reference, Schema
+from openapi_builder.constants import HIDDEN_ATTR_NAME
+from openapi_builder.documentation import SchemaOptions
+from openapi_builder.specification import Reference, Schema, intern_schema
 
 from .base import SchemaConverter
 
@@ -43,7 +45,7 @@ class EmailConverter(MarshmallowConverter):
     def convert(self, value, name) -> Schema:
         schema = Schema(type="string", format="email")
         self.set_additional_properties(schema, value)
-        return schema
+        return intern_schema(schema)
 
 
 @append_converter_class
@@ -53,7 +55,7 @@ class StringConverter(MarshmallowConverter):
     def convert(self, value, name) -> Schema:
         schema = Schema(type="string")
         self.set_additional_properties(schema, value)
-        return schema
+        return intern_schema(schema)
 
 
 @append_converter_class
@@ -63,7 +65,7 @@ class BooleanConverter(MarshmallowConverter):
     def convert(self, value, name) -> Schema:
         schema = Schema(type="boolean")
         self.set_additional_properties(schema, value)
-        return schema
+        return intern_schema(schema)
 
 
 @append_converter_class
@@ -73,7 +75,7 @@ class NumberConverter(MarshmallowConverter):
     def convert(self, value, name) -> Schema:
         schema = Schema(type="number")
         self.set_additional_properties(schema, value)
-        return schema
+        return intern_schema(schema)
 
 
 @append_converter_class
@@ -83,7 +85,7 @@ class IntegerConverter(MarshmallowConverter):
     def convert(self, value, name) -> Schema:
         schema = Schema(type="integer")
         self.set_additional_properties(schema, value)
-        return schema
+        return intern_schema(schema)
 
 
 @append_converter_class
@@ -93,7 +95,7 @@ class FloatConverter(MarshmallowConverter):
     def convert(self, value, name) -> Schema:
         schema = Schema(type="float")
         self.set_additional_properties(schema, value)
-        return schema
+        return intern_schema(schema)
 
 
 @append_converter_class
@@ -103,7 +105,7 @@ class UUIDConverter(MarshmallowConverter):
     def convert(self, value, name) -> Schema:
         schema = Schema(type="string", format="uuid")
         self.set_additional_properties(schema, value)
-        return schema
+        return intern_schema(schema)
 
 
 @append_converter_class
@@ -113,7 +115,7 @@ class DecimalConverter(MarshmallowConverter):
     def convert(self, value, name) -> Schema:
         schema = Schema(type="number")
         self.set_additional_properties(schema, value)
-        return schema
+        return intern_schema(schema)
 
 
 @append_converter_class
@@ -123,7 +125,7 @@ class DateConverter(MarshmallowConverter):
     def convert(self, value, name) -> Schema:
         schema = Schema(type="string", format="date")
         self.set_additional_properties(schema, value)
-        return schema
+        return intern_schema(schema)
 
 
 @append_converter_class
@@ -133,7 +135,7 @@ class DateTimeConverter(MarshmallowConverter):
     def convert(self, value, name) -> Schema:
         schema = Schema(type="string", format="date-time")
         self.set_additional_properties(schema, value)
-        return schema
+        return intern_schema(schema)
 
 
 @append_converter_class
@@ -143,7 +145,7 @@ class TimeConverter(MarshmallowConverter):
     def convert(self, value, name) -> Schema:
         schema = Schema(type="string", format="time")
         self.set_additional_properties(schema, value)
-        return schema
+        return intern_schema(schema)
 
 
 @append_converter_class
@@ -153,7 +155,19 @@ class URLConverter(MarshmallowConverter):
     def convert(self, value, name) -> Schema:
         schema = Schema(type="string", format="URL")
         self.set_additional_properties(schema, value)
-        return schema
+        return intern_schema(schema)
+
+
+@append_converter_class
+class InferredConverter(MarshmallowConverter):
+    """Converts the fields that marshmallow infers for `Meta.fields` and `Meta.additional`."""
+
+    converts_class = marshmallow.fields.Inferred
+
+    def convert(self, value, name) -> Schema:
+        schema = Schema()  # the type is inferred from the value when serializing
+        self.set_additional_properties(schema, value)
+        return intern_schema(schema)
 
 
 @append_converter_class
@@ -161,12 +175,44 @@ class NestedConverter(MarshmallowConverter):
     converts_class = marshmallow.fields.Nested
 
     def convert(self, value, name) -> Union[Schema, Reference]:
-        schema = self.manager.process(value.nested, name=name)
-        if value.many:
+        nested = self.resolve_nested(value)
+        many = value.many and not nested.many
+        # the schema is modified below, unless it's wrapped in an array.
+        schema = self.manager.process(nested, name=name, shared=many)
+        if many:
             schema = Schema(type="array", items=schema)
         self.set_additional_properties(schema, value)
         return schema
 
+    def resolve_nested(self, value: marshmallow.fields.Nested):
+        """Resolves the nested schema like `Nested.schema`, but without instantiating classes."""
+        nested = value.nested
+        if callable(nested) and not isinstance(nested, type):
+            nested = nested()
+        if isinstance(nested, marshmallow.Schema):
+            # Nested.schema copies the instance and applies only/exclude of the field.
+            return value.schema
+
+        if isinstance(nested, marshmallow.schema.SchemaMeta):
+            schema_class = nested
+        elif nested == "self":
+            schema_class = self.get_processing_schema_class()
+        else:
+            schema_class = marshmallow.class_registry.get_class(nested)
+        return DeclaredSchema(
+            schema_class=schema_class,
+            many=value.many,
+            only=None if value.only is None else frozenset(value.only),
+            exclude=frozenset(value.exclude),
+        )
+
+    def get_processing_schema_class(self) -> marshmallow.schema.SchemaMeta:
+        """Returns the class of the schema of which the fields are being processed."""
+        for value in reversed(self.manager.stack):
+            if isinstance(value, DeclaredSchema):
+                return value.schema_class
+        raise ValueError("Nested('self') is only supported inside a schema.")
+
 
 @append_converter_class
 class ListConverter(MarshmallowConverter):
@@ -175,7 +221,18 @@ class ListConverter(MarshmallowConverter):
     def convert(self, value, name) -> Schema:
         schema = Schema(type="array", items=None)
         self.set_additional_properties(schema, value)
-        return schema
+        return intern_schema(schema)
+
+
+class DeclaredSchema(NamedTuple):
+    """A marshmallow schema class, with the arguments for instantiating it."""
+
+    schema_class: marshmallow.schema.SchemaMeta
+    many: bool = False
+    only: Optional[FrozenSet[str]] = None
+    exclude: FrozenSet[str] = frozenset()
+    instance: Optional[marshmallow.Schema] = None
+    """The instance of the schema class, if it was instantiated already."""
 
 
 @append_converter_class
@@ -183,9 +240,7 @@ class SchemaMetaConverter(MarshmallowConverter):
     converts_class = marshmallow.schema.SchemaMeta
 
     def convert(self, value, name) -> Schema:
-        # instantiating a SchemaMeta creates a Schema
-        schema = self.manager.process(value=value(), name=name)
-        return schema
+        return self.manager.process(value=DeclaredSchema(value), name=name, shared=True)
 
 
 @append_converter_class
@@ -193,19 +248,124 @@ class MarshmallowConverter(MarshmallowConverter):
     converts_class = marshmallow.schema.Schema
 
     def convert(self, value, name) -> Schema:
-        schema_name = value.__class__.__name__  # class name
-        properties = {
-            key: self.manager.process(value=prop, name=f"{schema_name}.{key}")
-            for key, prop in value._declared_fields.items()
-        }
+        declared_schema = DeclaredSchema(
+            schema_class=value.__class__,
+            many=value.many,
+            only=None if value.only is None else frozenset(value.only),
+            exclude=frozenset(value.exclude),
+            instance=value,
+        )
+        return self.manager.process(value=declared_schema, name=name, shared=True)
 
-        schema = Schema(type="object", properties=properties)
-        self.manager.builder.schemas[schema_name] = schema
+
+@append_converter_class
+class DeclaredSchemaConverter(MarshmallowConverter):
+    converts_class = DeclaredSchema
+
+    def __init__(self, manager):
+        super().__init__(manager=manager)
+        # converted schemas by (schema class, only, exclude), with their component name.
+        self.components: Dict[Tuple, Tuple[str, Schema]] = {}
+
+    def convert(self, value: DeclaredSchema, name) -> Schema:
+        key = (value.schema_class, value.only, value.exclude)
+        component = self.components.get(key)
+        if (
+            component is None
+            or self.manager.builder.schemas.get(component[0]) is not component[1]
+        ):
+            component = self.convert_component(key, value)
+
+        schema_name, schema = component
+        # A new reference for every usage, since the caller can modify it.
         reference = Reference.from_schema(schema_name=schema_name, schema=schema)
         if value.many:
             return Schema(type="array", items=reference)
         return reference
 
+    def convert_component(self, key, value: DeclaredSchema) -> Tuple[str, Schema]:
+        """Converts the schema to a component, which is referenced by every usage of the schema."""
+        schema_name = value.schema_class.__name__  # class name
+        if value.only is not None:
+            schema_name += "-only-" + "-".join(sorted(value.only))
+        if value.exclude:
+            schema_name += "-exclude-" + "-".join(sorted(value.exclude))
+
+        # Register the component before converting the fields, so that (indirectly)
+        # self-referencing schemas refer to it, instead of being converted endlessly.
+        schema = Schema(type="object")
+        self.components[key] = schema_name, schema
+        self.manager.builder.source_classes.add(value.schema_class)
+        self.manager.builder.schemas[schema_name] = schema
+
+        schema.properties = {
+            field_name: self.manager.process(
+                value=field, name=f"{schema_name}.{field_name}", shared=True
+            )
+            for field_name, field in self.get_fields(value).items()
+        }
+        return schema_name, schema
+
+    def get_fields(self, value: DeclaredSchema) -> Dict[str, marshmallow.fields.Field]:
+        """Returns the fields of the schema, after applying only/exclude, in the order of declaration.
+
+        The fields are read from the class, unless the schema is instantiated already, the
+        schema options ask for instantiating it (`SchemaOptions.instantiate`), or marshmallow
+        does more than filtering the declared fields (see `requires_instance`).
+        """
+        schema_options: Optional[SchemaOptions] = getattr(
+            value.schema_class, HIDDEN_ATTR_NAME, None
+        )
+        declared_fields = value.schema_class._declared_fields
+        opts = value.schema_class.opts
+        instance = value.instance
+        if instance is None and (
+            (schema_options is not None and schema_options.instantiate)
+            or self.requires_instance(value, declared_fields, opts)
+        ):
+            instance = value.schema_class(
+                many=value.many, only=value.only, exclude=value.exclude
+            )
+
+        if instance is not None:
+            # the declared fields first, followed by the inferred fields.
+            fields = instance.fields
+            return {
+                field_name: fields[field_name]
+                for field_name in (*instance.declared_fields, *fields)
+                if field_name in fields
+            }
+
+        exclude = value.exclude.union(opts.exclude)
+        return {
+            field_name: field
+            for field_name, field in declared_fields.items()
+            if (not opts.fields or field_name in opts.fields)
+            and (value.only is None or field_name in value.only)
+            and field_name not in exclude
+        }
+
+    @staticmethod
+    def requires_instance(
+        value: DeclaredSchema,
+        declared_fields: Dict[str, marshmallow.fields.Field],
+        opts: marshmallow.SchemaOpts,
+    ) -> bool:
+        """Whether the fields can only be determined by instantiating the schema class.
+
+        That's the case if marshmallow infers fields that aren't declared (`Meta.fields`
+        or `Meta.additional`), if only/exclude refer to the fields of nested schemas, or
+        if only/exclude contain unknown fields, for which marshmallow raises a ValueError.
+        """
+        if opts.fields:
+            available = set(opts.fields)
+        else:
+            available = set(declared_fields).union(opts.additional)
+        if not available.issubset(declared_fields):
+            return True
+        names = value.exclude.union(opts.exclude, value.only or ())
+        return any("." in name or name not in available for name in names)
+
 
 @append_converter_class
 class DictConverter(MarshmallowConverter):
@@ -214,4 +374,4 @@ class DictConverter(MarshmallowConverter):
     def convert(self, value, name) -> Schema:
         schema = Schema(type="object")
         self.set_additional_properties(schema, value)
-        return schema
+        return intern_schema(schema)
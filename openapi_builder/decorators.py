@@ -74,6 +74,7 @@ def set_schema_options(
     schema: Any,
     options: Dict[str, Any] = None,
     discriminator: Optional[DiscriminatorOptions] = None,
+    instantiate: Optional[bool] = None,
 ):
     """Adds schema options for a given class.
 
@@ -92,6 +93,8 @@ def set_schema_options(
         kwargs["options"] = options
     if discriminator is not None:
         kwargs["discriminator"] = discriminator
+    if instantiate is not None:
+        kwargs["instantiate"] = instantiate
 
     value = SchemaOptions(**kwargs)
     setattr(schema, HIDDEN_ATTR_NAME, value)
@@ -1,4 +1,5 @@
 import contextlib
+import contextvars
 from dataclasses import dataclass, field
 from http import HTTPStatus
 from typing import Any, Dict, List, Optional, Union
@@ -44,8 +45,10 @@ class DiscriminatorOptions:
 class SchemaOptions:
     """Additional options to be serialized for a certain schema."""
 
-    discriminator: DiscriminatorOptions
+    discriminator: Optional[DiscriminatorOptions] = None
     options: Dict[str, Any] = field(default_factory=dict)
+    instantiate: bool = False
+    """Whether the schema class must be instantiated for reading its fields (marshmallow)."""
 
 
 @dataclass()
@@ -55,9 +58,21 @@ class ResourceOptions:
     tags: List[Tag] = field(default_factory=list)
 
 
+_configs: contextvars.ContextVar = contextvars.ContextVar(
+    "openapi_builder_documentation_configs", default={}
+)
+"""The documentation configuration of the current context, by manager.
+
+A context variable, so that threads processing endpoints at the same time don't
+overwrite each other's configuration. The mapping is never modified, but replaced.
+"""
+
+
 class DocumentationConfigManager:
-    def __init__(self):
-        self.config = None
+    @property
+    def config(self) -> Optional[Documentation]:
+        """The documentation configuration of the current context."""
+        return _configs.get().get(self)
 
     @contextlib.contextmanager
     def use_documentation_context(self, documentation_config: Documentation):
@@ -67,9 +82,13 @@ class DocumentationConfigManager:
                 f"{documentation_config} is not an instance of Documentation."
             )
 
-        self.config = documentation_config
-        yield
-        self.config = None
+        configs = dict(_configs.get())
+        configs[self] = documentation_config
+        token = _configs.set(configs)
+        try:
+            yield
+        finally:
+            _configs.reset(token)
 
     def ensure_valid_config(self):
         """Ensures that the function is executed within the documentation context."""
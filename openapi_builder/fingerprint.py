@@ -0,0 +1,258 @@
+import dataclasses
+import enum
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+import typing
+import warnings
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from .__meta__ import version
+from .constants import HIDDEN_ATTR_NAME
+
+try:
+    from importlib import metadata as importlib_metadata
+except ImportError:  # Python < 3.8
+    importlib_metadata = None
+
+if typing.TYPE_CHECKING:
+    from .builder import OpenApiDocumentation
+    from .specification import OpenAPI
+
+LIBRARIES = ("Flask", "Werkzeug", "marshmallow", "halogen")
+"""Distributions of which the installed version is part of the fingerprint."""
+
+
+def get_library_versions() -> Dict[str, Optional[str]]:
+    """Returns the installed version of every library, or None if it's not installed."""
+    versions = {}
+    for name in LIBRARIES:
+        if importlib_metadata is not None:
+            try:
+                versions[name] = importlib_metadata.version(name)
+            except importlib_metadata.PackageNotFoundError:
+                versions[name] = None
+        else:
+            module = sys.modules.get(name.lower())
+            versions[name] = getattr(module, "__version__", None)
+    return versions
+
+
+def get_source_filename(module_name: str) -> Optional[str]:
+    """Returns the source file of a loaded module, or None (e.g. for built-in modules)."""
+    filename = getattr(sys.modules.get(module_name), "__file__", None)
+    if not filename:
+        return None
+    return os.path.splitext(filename)[0] + ".py"  # convert .pyc to .py
+
+
+def hash_file(filename: str) -> Optional[str]:
+    """Returns the hash of the content of a file, or None if it can't be read."""
+    try:
+        with open(filename, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def get_source_hashes(module_names: Iterable[str]) -> Dict[str, Optional[str]]:
+    """Returns the hash of the source of every loaded module, by module name."""
+    hashes = {}
+    for module_name in sorted(module_names):
+        filename = get_source_filename(module_name)
+        if filename is not None:
+            hashes[module_name] = hash_file(filename)
+    return hashes
+
+
+def compute_fingerprint(documentation: "OpenApiDocumentation") -> str:
+    """Computes a fingerprint of everything the specification is built from.
+
+    The fingerprint changes when one of the following changes:
+    - the versions of Python, openapi_builder and the libraries (see `LIBRARIES`);
+    - the documentation options (including the converter classes) and the initial
+      specification (e.g. the title, servers and security schemes);
+    - the rules of the application (path, endpoint, methods and converters);
+    - the documentation of the endpoints, and the options of the blueprints;
+    - the source of the modules of the endpoints, of the classes referenced by the
+      documentation (and their super classes), and of all loaded modules within the
+      root path of the application.
+
+    The modules of the schemas that are only found while building (e.g. the schema of a
+    nested field in another package) are checked when loading the cached specification,
+    see `SpecificationCache`.
+    """
+    app = documentation.app
+    collector = _Collector()
+    parts: Dict[str, Any] = {
+        "python": list(sys.version_info[:2]),
+        "openapi_builder": version,
+        "libraries": get_library_versions(),
+        "options": collector.describe(documentation.options),
+        "specification": json.dumps(
+            documentation.specification.get_value(), sort_keys=True, default=str
+        ),
+        "rules": [],
+    }
+
+    for rule in sorted(app.url_map.iter_rules(), key=lambda r: (r.rule, r.endpoint)):
+        view_func = app.view_functions.get(rule.endpoint)
+        blueprint = app.blueprints.get(rule.endpoint.split(".")[0])
+        parts["rules"].append(
+            {
+                "rule": rule.rule,
+                "endpoint": rule.endpoint,
+                "methods": sorted(rule.methods or ()),
+                "converters": {
+                    name: collector.describe(type(converter))
+                    for name, converter in sorted(rule._converters.items())
+                },
+                "documentation": collector.describe(
+                    getattr(view_func, HIDDEN_ATTR_NAME, None)
+                ),
+                "resource_options": collector.describe(
+                    getattr(blueprint, HIDDEN_ATTR_NAME, None)
+                ),
+            }
+        )
+        if view_func is not None:
+            collector.add_module(getattr(view_func, "__module__", None))
+
+    collector.add_modules_within(app.root_path)
+    parts["sources"] = collector.get_source_hashes()
+
+    data = json.dumps(parts, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class _Collector:
+    """Describes values in a stable way (independent of memory addresses), and collects
+    the modules of the classes that are referenced."""
+
+    def __init__(self):
+        self.modules: Set[str] = set()
+
+    def add_module(self, module_name: typing.Optional[str]):
+        if module_name is not None:
+            self.modules.add(module_name)
+
+    def add_modules_within(self, path: str):
+        """Adds all loaded modules of which the source is within the path."""
+        path = os.path.abspath(path) + os.sep
+        for module_name, module in list(sys.modules.items()):
+            filename = getattr(module, "__file__", None)
+            if filename and os.path.abspath(filename).startswith(path):
+                self.modules.add(module_name)
+
+    def get_source_hashes(self) -> Dict[str, Optional[str]]:
+        """Returns the hash of the source of every collected module, by module name."""
+        return get_source_hashes(self.modules)
+
+    def describe(self, value: Any, depth: int = 0) -> Any:
+        """Returns a JSON serializable description of the value."""
+        if depth > 20:  # protect against (indirectly) self-referencing values
+            return "..."
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, enum.Enum):
+            return repr(value)
+        if isinstance(value, type):
+            for klass in value.__mro__:
+                self.add_module(klass.__module__)
+            return f"{value.__module__}.{value.__qualname__}"
+        if isinstance(value, dict):
+            return sorted(
+                [self.describe(k, depth + 1), self.describe(v, depth + 1)]
+                for k, v in value.items()
+            )
+        if isinstance(value, (list, tuple)):
+            return [self.describe(item, depth + 1) for item in value]
+        if isinstance(value, (set, frozenset)):
+            return sorted((self.describe(item, depth + 1) for item in value), key=repr)
+        if dataclasses.is_dataclass(value):
+            return {
+                "class": self.describe(type(value)),
+                "fields": {
+                    f.name: self.describe(getattr(value, f.name, None), depth + 1)
+                    for f in dataclasses.fields(value)
+                },
+            }
+        if callable(value) and hasattr(value, "__qualname__"):
+            self.add_module(getattr(value, "__module__", None))
+            return f"{getattr(value, '__module__', None)}.{value.__qualname__}"
+        # Other instances (e.g. schemas) are described by their class; the arguments they
+        # are created with are part of the source of the module that creates them.
+        return {"instance": self.describe(type(value))}
+
+
+class SpecificationCache:
+    """Persistent cache for built specifications, stored in a directory.
+
+    A specification is stored under the fingerprint of the documentation it was built
+    from (see `compute_fingerprint`), together with the source hashes of the modules of
+    the converted schemas. A cached specification is only loaded when nothing it was
+    built from changed. Outdated entries are never loaded (and not removed).
+
+    The specifications are pickled, so the directory must only be writable by trusted users.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self, fingerprint: str) -> "Optional[OpenAPI]":
+        """Returns the specification that is stored for the fingerprint, or None.
+
+        None is returned as well when the source of one of the modules of the converted
+        schemas changed since.
+        """
+        try:
+            with open(self._get_entry_path(fingerprint), "rb") as f:
+                specification, source_hashes = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:  # e.g. a truncated file or a class that was removed
+            warnings.warn(f"Ignoring invalid cached specification: {e!r}")
+            return None
+        for filename, source_hash in source_hashes.items():
+            if hash_file(filename) != source_hash:
+                return None
+        return specification
+
+    def store(
+        self,
+        fingerprint: str,
+        specification: "OpenAPI",
+        source_modules: Iterable[str] = (),
+    ):
+        """Stores the specification for the fingerprint.
+
+        :param source_modules: The modules of the converted schemas, see `load`.
+        """
+        # by filename, since the modules might not be imported yet when loading.
+        filenames = filter(None, map(get_source_filename, source_modules))
+        entry: Tuple[OpenAPI, Dict[str, Optional[str]]] = (
+            specification,
+            {filename: hash_file(filename) for filename in filenames},
+        )
+        try:
+            data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:  # e.g. a lambda in the specification
+            warnings.warn(f"Unable to cache the specification: {e!r}")
+            return
+
+        os.makedirs(self.path, exist_ok=True)
+        # write to a temporary file first, so concurrent readers never see a partial file.
+        fd, temporary_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temporary_path, self._get_entry_path(fingerprint))
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    def _get_entry_path(self, fingerprint: str) -> str:
+        return os.path.join(self.path, f"{fingerprint}.pickle")
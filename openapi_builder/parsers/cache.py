@@ -0,0 +1,121 @@
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+import threading
+import typing
+from typing import Optional, Tuple
+
+if typing.TYPE_CHECKING:
+    from .docstring import DocStringParser
+
+
+FileState = Tuple[str, int, int, str]
+"""The path, modification time (ns), size and content hash of a file."""
+
+
+class DocStringCache:
+    """Persistent cache for the results of `DocStringParser`, stored in a directory.
+
+    A result is loaded from the cache when the parsed file, and the files of its super
+    classes, didn't change. A file is unchanged when its modification time and size are
+    equal, or otherwise when the hash of its content is equal.
+
+    Usage:
+    >>> cache = DocStringCache("/tmp/openapi-builder")
+    >>> parser = DocStringParser.from_class(A)
+    >>> parser.parse(cache=cache)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        """Number of results that were loaded from the cache."""
+        self.misses = 0
+        """Number of results that were not in the cache (or outdated)."""
+        self._lock = threading.Lock()
+
+    def load(self, parser: "DocStringParser") -> bool:
+        """Loads the result of the parser from the cache, and returns whether that succeeded."""
+        entry = self._read(self._get_entry_path(parser))
+        if entry is not None and all(
+            self._is_unchanged(file_state) for file_state in entry["files"]
+        ):
+            parser.result = entry["result"]
+            parser.import_names = entry["import_names"]
+            parser.dependencies = [file_state[0] for file_state in entry["files"][1:]]
+            self._count(hit=True)
+            return True
+
+        self._count(hit=False)
+        return False
+
+    def store(self, parser: "DocStringParser"):
+        """Stores the result of the (parsed) parser in the cache."""
+        try:
+            files = [
+                self._get_file_state(filename)
+                # without duplicates, in order.
+                for filename in dict.fromkeys([parser.filename, *parser.dependencies])
+            ]
+        except OSError:
+            return  # a file was removed, don't cache anything
+
+        entry = {
+            "files": files,
+            "result": parser.result,
+            "import_names": parser.import_names,
+        }
+        os.makedirs(self.path, exist_ok=True)
+        # write to a temporary file first, so concurrent readers never see a partial file.
+        fd, temporary_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                marshal.dump(entry, f)
+            os.replace(temporary_path, self._get_entry_path(parser))
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _get_entry_path(self, parser: "DocStringParser") -> str:
+        key = f"{os.path.abspath(parser.filename)}\0{parser.prefix}"
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        # marshal's format depends on the Python version.
+        return os.path.join(
+            self.path, f"{digest}.{sys.implementation.cache_tag}.marshal"
+        )
+
+    @staticmethod
+    def _read(entry_path: str) -> Optional[dict]:
+        try:
+            with open(entry_path, "rb") as f:
+                return marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def _hash(filename: str) -> str:
+        with open(filename, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def _get_file_state(self, filename: str) -> FileState:
+        stat = os.stat(filename)
+        return filename, stat.st_mtime_ns, stat.st_size, self._hash(filename)
+
+    def _is_unchanged(self, file_state: FileState) -> bool:
+        filename, mtime, size, digest = file_state
+        try:
+            stat = os.stat(filename)
+            if (stat.st_mtime_ns, stat.st_size) == (mtime, size):
+                return True
+            return self._hash(filename) == digest
+        except OSError:
+            return False
@@ -2,8 +2,18 @@ import ast
 import functools
 import inspect
 import os
-from typing import Optional
 import sys
+import threading
+import typing
+from typing import Dict, Optional
+
+if typing.TYPE_CHECKING:
+    from .cache import DocStringCache
+
+_parser_lock = threading.RLock()
+"""Guards the parsers, which are shared by the process (see `DocStringParser.from_class`)
+and might be used by several builds at once (e.g. while building in the background).
+A single (reentrant) lock, since parsers use the parsers of their super classes."""
 
 
 class DocStringParser:
@@ -24,20 +34,40 @@ class DocStringParser:
     >>> parser.result
     >>> {}
 
+    The docstrings of a single class (and its attributes) can also be retrieved without
+    parsing the whole module:
+    >>> parser.get_class_result("A")
+    >>> {}
+
     Limitations:
     - The class must be placed in a file (doesn't work from a python shell)
     - The class must be defined in the root content of a file (a class
       definition in a function is not supported).
     """
 
-    def __init__(self, module, prefix=None):
-        self.module = module
+    def __init__(self, module=None, prefix=None, filename=None):
+        self._module = module
+        self.filename = filename
+        """The file of the module. If given, the module is parsed when it's needed."""
         self.prefix = prefix
         self.import_names = {}
         """Dict to get the full import name:
         i.e. 'import typing as t' results in: {'t': 'typing'}
         """
         self.result = {}
+        self.dependencies = []
+        """Files of the super classes, from which docstrings are used in the result."""
+        self.cache: Optional["DocStringCache"] = None
+        self.parsed = False
+        self._class_nodes: Optional[Dict[str, ast.ClassDef]] = None
+        self._class_results: Dict[str, Dict[str, Optional[str]]] = {}
+
+    @property
+    def module(self):
+        if self._module is None:
+            with open(self.filename, "r") as f:
+                self._module = ast.parse(f.read())
+        return self._module
 
     @classmethod
     @functools.lru_cache(maxsize=64)
@@ -49,10 +79,13 @@ class DocStringParser:
     @functools.lru_cache(maxsize=64)
     def from_file(cls, filename, prefix=None):
         filename = os.path.splitext(filename)[0] + ".py"  # convert .pyc to .py
-        with open(filename, "r") as f:
-            file_contents = f.read()
+        return cls(filename=filename, prefix=prefix)
 
-        return cls(module=ast.parse(file_contents), prefix=prefix)
+    @classmethod
+    def clear_cache(cls):
+        """Releases the parsers that are cached by `from_class` and `from_file`."""
+        cls.from_class.cache_clear()
+        cls.from_file.cache_clear()
 
     def get_name(self, node):
         prefix = "" if self.prefix is None else f"{self.prefix}."
@@ -64,24 +97,95 @@ class DocStringParser:
         else:
             return prefix + node.value.id
 
-    def parse(self):
+    def parse(self, cache: Optional["DocStringCache"] = None):
+        """Parses the module. Parsing a module a second time has no effect.
+
+        :param cache: If given, the result of a file is loaded from the cache when the file
+            (and the files it depends on) didn't change, instead of parsing the file.
+        """
+        with _parser_lock:
+            self._parse(cache=cache)
+
+    def _parse(self, cache: Optional["DocStringCache"]):
+        """Like `parse`, but must be called while holding the parser lock."""
+        if self.parsed:
+            return
+
+        use_cache = cache is not None and self.filename is not None
+        if use_cache and cache.load(self):
+            self.parsed = True
+            return
+
+        self.cache = cache
+        self._index()
         for index, node in enumerate(self.module.body):
             next_node = (
                 self.module.body[index + 1]
                 if len(self.module.body) > index + 1
                 else None
             )
-            if isinstance(node, ast.ImportFrom):
-                self._process_import_from(node=node)
-            elif isinstance(node, ast.Import):
-                self._process_import(node=node)
-            elif isinstance(node, ast.ClassDef):
-                self._process_class_definition(node=node)
+            if isinstance(node, ast.ClassDef):
+                self.result.update(self.get_class_result(self.get_name(node)))
             elif isinstance(node, ast.Assign) and isinstance(next_node, ast.Expr):
                 self._process_docstring_from_assignment(node=node, next_node=next_node)
             elif isinstance(node, ast.FunctionDef):
                 self._process_function_def(node=node)
 
+        self.parsed = True
+        if use_cache:
+            cache.store(self)
+
+    def get_docstrings(
+        self, class_name: str, cache: Optional["DocStringCache"] = None
+    ) -> Dict[str, Optional[str]]:
+        """Returns the docstrings of the class and its attributes, by 'Class' and 'Class.attr'.
+
+        :param cache: If given, the whole module is parsed (and cached), otherwise only
+            the class and its super classes are processed.
+        """
+        if cache is not None:
+            self.parse(cache=cache)
+            return self.result
+        return self.get_class_result(class_name)
+
+    def get_class_result(self, class_name: str) -> Dict[str, Optional[str]]:
+        """Returns the docstrings of a class in the module, including inherited docstrings.
+
+        Only the class and its super classes are processed, and the result is kept for
+        subsequent calls.
+        """
+        result = self._class_results.get(class_name)
+        if result is None:
+            with _parser_lock:
+                result = self._class_results.get(class_name)
+                if result is None:
+                    node = self._index().get(class_name)
+                    result = (
+                        {}
+                        if node is None
+                        else self._process_class_definition(node=node)
+                    )
+                    self._class_results[class_name] = result
+        return result
+
+    def _index(self) -> Dict[str, ast.ClassDef]:
+        """Indexes the imports and class definitions of the module, once.
+
+        Must be called while holding the parser lock.
+        """
+        if self._class_nodes is None:
+            self._class_nodes = {}
+            for node in self.module.body:
+                if isinstance(node, ast.ImportFrom):
+                    self._process_import_from(node=node)
+                elif isinstance(node, ast.Import):
+                    self._process_import(node=node)
+                elif isinstance(node, ast.ClassDef):
+                    name = self.get_name(node)
+                    self._class_nodes[name] = node
+                    self.import_names[name] = name
+        return self._class_nodes
+
     def _process_import_from(self, node: ast.ImportFrom):
         """Processes 'from package import class' statements."""
         for name in node.names:
@@ -116,46 +220,55 @@ class DocStringParser:
 
         return None
 
-    def _process_class_definition(self, node: ast.ClassDef):
+    def _process_class_definition(self, node: ast.ClassDef) -> Dict[str, Optional[str]]:
         """Processes 'class A(Base): ... definitions."""
+        result = {}
         name = self.get_name(node)
         for base in node.bases:  # parse super classes
             full_name = self.__get_class_name(base)
             if not full_name:
-                return
+                return result
             real_class_name = full_name.split(".")[-1]  # e.g. 'ClassA'.
             module_name = ".".join(full_name.split(".")[:-1])  # e.g. 'package.sub'
 
             if not module_name:  # parent module found in same file
-                for key, docstring in list(self.result.items()):
+                for key, docstring in self.get_class_result(full_name).items():
                     super_module_name = ".".join(key.split(".")[:-1])
                     if super_module_name == full_name:
                         super_real_class_name = key.split(".")[-1]
-                        self.result[f"{name}.{super_real_class_name}"] = docstring
+                        result[f"{name}.{super_real_class_name}"] = docstring
 
                 continue
 
             super_class_parser = DocStringParser.from_file(
                 sys.modules[module_name].__file__
             )
-            super_class_parser.parse()
-            for key, docstring in super_class_parser.result.items():
+            if self.cache is not None:
+                super_class_parser.parse(cache=self.cache)
+                super_class_result = super_class_parser.result
+            else:
+                super_class_result = super_class_parser.get_class_result(
+                    real_class_name
+                )
+            self.dependencies.append(super_class_parser.filename)
+            self.dependencies.extend(super_class_parser.dependencies)
+            for key, docstring in super_class_result.items():
                 # e.g. key='ClassA.attr_a'
                 if key.startswith(f"{real_class_name}."):  # 'ClassA.'
                     attribute_name = key.split(".")[-1]  # e.g. 'attr_a'
                     own_class_name = f"{node.name}.{attribute_name}"
                     # e.g. own_class_name = 'package.sub.ClassA'
-                    self.result[own_class_name] = docstring
+                    result[own_class_name] = docstring
 
         # docstring from class attributes
         current_class_parser = DocStringParser(module=node, prefix=node.name)
         current_class_parser.parse()
         for key, value in current_class_parser.result.items():
-            self.result[key] = value
+            result[key] = value
 
         # docstring from class definition.
-        self.import_names[name] = name
-        self.result[name] = ast.get_docstring(node)
+        result[name] = ast.get_docstring(node)
+        return result
 
     def _process_docstring_from_assignment(self, node: ast.Assign, next_node: ast.Expr):
         """
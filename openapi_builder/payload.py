@@ -0,0 +1,321 @@
+import dataclasses
+import gzip
+import hashlib
+import io
+import mmap
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from flask import Flask, json
+
+CHUNK_SIZE = 64 * 1024
+"""Size (in bytes) of the chunks in which a payload is served."""
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # ujson is optional
+    ujson = None
+
+
+def compress_gzip(data: bytes) -> bytes:
+    """Compresses the data using gzip, without a timestamp to keep the output stable."""
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=9, mtime=0) as f:
+        f.write(data)
+    return buffer.getvalue()
+
+
+def compress_brotli(data: bytes) -> bytes:
+    """Compresses the data using brotli."""
+    return brotli.compress(data, quality=11)
+
+
+def map_file(path: str) -> mmap.mmap:
+    """Maps the (non-empty) file read-only into memory."""
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def iter_chunks(data: Union[bytes, mmap.mmap], chunk_size: int = CHUNK_SIZE):
+    """Yields the data in chunks of (at most) `chunk_size` bytes."""
+    for start in range(0, len(data), chunk_size):
+        yield data[start : start + chunk_size]
+
+
+def iter_encode(
+    value: Any, app: Optional[Flask] = None, chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Encodes the value in chunks of (roughly) `chunk_size` bytes.
+
+    The concatenated chunks are identical to the data of `SpecificationPayload.from_value`,
+    but the encoded value is never held in memory at once. The encoder is configured
+    directly, so the chunks can be consumed outside of the application context.
+    """
+    encoder = _get_json_encoder(app)
+    return _iter_buffered(encoder.iterencode(value), chunk_size)
+
+
+def _get_json_encoder(app: Optional[Flask] = None) -> json.JSONEncoder:
+    """Returns the JSON encoder of the application, configured like `flask.json.dumps`."""
+    if app is None:
+        return json.JSONEncoder(separators=(",", ":"), sort_keys=True)
+    return app.json_encoder(
+        separators=(",", ":"),
+        ensure_ascii=app.config.get("JSON_AS_ASCII", True),
+        sort_keys=app.config.get("JSON_SORT_KEYS", True),
+    )
+
+
+JSONEncodeFunction = Callable[[Any, Optional[Flask]], bytes]
+"""Function that encodes a value to UTF-8 JSON, using the configuration of the app."""
+
+
+def encode_json(value: Any, app: Optional[Flask] = None) -> bytes:
+    """Encodes the value using the standard library, like `flask.json.dumps`."""
+    return _get_json_encoder(app).encode(value).encode("utf-8")
+
+
+def encode_orjson(value: Any, app: Optional[Flask] = None) -> bytes:
+    """Encodes the value using orjson.
+
+    Values that orjson serializes differently than the JSON encoder of the application
+    (e.g. dates), or doesn't support, are serialized by the encoder of the application.
+    The output is equal to `encode_json` after decoding, apart from the escaping of
+    non-ASCII characters.
+    """
+    encoder = _get_json_encoder(app)
+    option = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+    if encoder.sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    return orjson.dumps(value, default=encoder.default, option=option)
+
+
+def encode_ujson(value: Any, app: Optional[Flask] = None) -> bytes:
+    """Encodes the value using ujson, see `encode_orjson`."""
+    encoder = _get_json_encoder(app)
+    return ujson.dumps(
+        value,
+        ensure_ascii=False,
+        escape_forward_slashes=False,
+        sort_keys=encoder.sort_keys,
+        default=encoder.default,
+    ).encode("utf-8")
+
+
+JSON_ENCODERS: Dict[str, JSONEncodeFunction] = {"json": encode_json}
+"""Functions for encoding the specification, by name."""
+
+if orjson is not None:
+    JSON_ENCODERS["orjson"] = encode_orjson
+if ujson is not None:
+    JSON_ENCODERS["ujson"] = encode_ujson
+
+
+def get_json_encode_function(
+    encoder: Union[str, JSONEncodeFunction]
+) -> JSONEncodeFunction:
+    """Returns the function for encoding the specification (`specification_encoder`).
+
+    :param encoder: The name of a function in `JSON_ENCODERS`, or a function.
+    """
+    if callable(encoder):
+        return encoder
+    try:
+        return JSON_ENCODERS[encoder]
+    except KeyError:
+        raise ValueError(f"Unknown or unavailable JSON encoder: {encoder}") from None
+
+
+def _iter_buffered(parts: Iterable[str], chunk_size: int) -> Iterator[bytes]:
+    buffer, size = [], 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+COMPRESSORS = {"gzip": compress_gzip}
+"""Functions for creating the content-codings of the payload, by name."""
+
+if brotli is not None:
+    COMPRESSORS["br"] = compress_brotli
+
+
+@dataclass(frozen=True)
+class SpecificationPayload:
+    """The encoded specification, as it is served by the documentation blueprint.
+
+    The payload is created once after the specification is built, and reused for every
+    request until the specification changes.
+
+    The data can also be backed by memory-mapped files (see `map_to_files`), which are
+    shared between the processes that map the same files.
+    """
+
+    data: Union[bytes, mmap.mmap]
+    """The specification encoded as UTF-8 JSON."""
+
+    etag: str
+    """Strong entity tag, derived from the content of the data."""
+
+    encodings: Dict[str, Union[bytes, mmap.mmap]] = field(default_factory=dict)
+    """Compressed variants of the data, by content-coding (e.g. 'gzip')."""
+
+    @classmethod
+    def from_value(
+        cls,
+        value: Any,
+        app: Optional[Flask] = None,
+        encodings: Iterable[str] = (),
+        encoder: Union[str, JSONEncodeFunction] = "json",
+    ):
+        """Encodes the value that is returned by `OpenApiDocumentation.get_specification`.
+
+        :param value: The specification as a dictionary.
+        :param app: The Flask application, for using its JSON configuration.
+        :param encodings: Content-codings for which a compressed variant is created.
+            Content-codings that are not supported in this environment are skipped.
+        :param encoder: The JSON encoder, see `get_json_encode_function`.
+        """
+        data = get_json_encode_function(encoder)(value, app)
+        return cls(
+            data=data,
+            etag=hashlib.sha256(data).hexdigest(),
+            encodings={
+                encoding: COMPRESSORS[encoding](data)
+                for encoding in encodings
+                if encoding in COMPRESSORS
+            },
+        )
+
+    def get_etag(self, encoding: Optional[str] = None) -> str:
+        """Returns the entity tag of the variant for the given content-coding."""
+        if encoding is None:
+            return self.etag
+        return f"{self.etag}-{encoding}"
+
+    def map_to_files(self, path: str) -> "SpecificationPayload":
+        """Writes the payload to files, and returns a payload backed by memory maps of these.
+
+        The data is written to `path`, and the variant of every content-coding to
+        `path.<content-coding>` (e.g. 'openapi.json.gzip').
+        """
+        data = self._write_and_map(path, self.data)
+        encodings = {
+            encoding: self._write_and_map(f"{path}.{encoding}", encoded)
+            for encoding, encoded in self.encodings.items()
+        }
+        return dataclasses.replace(self, data=data, encodings=encodings)
+
+    @staticmethod
+    def _write_and_map(path: str, data: Union[bytes, mmap.mmap]) -> mmap.mmap:
+        # write to a temporary file, which replaces the file afterwards, so processes that
+        # mapped the previous file (e.g. old workers during a graceful reload) keep it.
+        fd, temporary_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+        return map_file(path)
+
+
+class SpecificationSnapshot:
+    """The serialized specification at a certain moment, which is never modified.
+
+    Readers use the current snapshot without locking, and keep using it while a new
+    snapshot is published after the specification changed. An old snapshot (and its
+    payload) is released once the last reader is done with it.
+
+    The payload and the entity tag of the stream are created when they're first used.
+    Threads that create them at the same time create equal values, so that's harmless.
+    """
+
+    __slots__ = ("value", "_payload", "_stream_etag", "__weakref__")
+
+    def __init__(
+        self, value: Optional[dict], payload: Optional[SpecificationPayload] = None
+    ):
+        self.value = value
+        """The specification as a dictionary, which must not be modified. None for the
+        snapshot of a frozen documentation that only kept the payload."""
+        self._payload = payload
+        self._stream_etag: Optional[str] = None
+
+    def get_payload(
+        self,
+        app: Optional[Flask] = None,
+        encodings: Iterable[str] = (),
+        encoder: Union[str, JSONEncodeFunction] = "json",
+    ) -> SpecificationPayload:
+        """Returns the encoded value, see `SpecificationPayload.from_value`."""
+        payload = self._payload
+        if payload is None:
+            payload = SpecificationPayload.from_value(
+                self.value, app=app, encodings=encodings, encoder=encoder
+            )
+            self._payload = payload
+        return payload
+
+    def map_to_files(self, path: str) -> SpecificationPayload:
+        """Serves the payload from memory-mapped files, see `SpecificationPayload.map_to_files`.
+
+        The payload must have been created already, using `get_payload`.
+        """
+        payload = self._payload.map_to_files(path)
+        self._payload = payload
+        return payload
+
+    def get_stream(
+        self, app: Optional[Flask] = None, payload_etag: bool = True
+    ) -> Tuple[Optional[str], Iterator[bytes]]:
+        """Returns the entity tag and the chunks of the encoded value, see `iter_encode`.
+
+        The entity tag is computed from the chunks while they're streamed, so it's None
+        until the value was streamed completely once. When the payload exists already,
+        its entity tag is used instead, since the stream is identical to the payload.
+
+        :param payload_etag: Whether the payload is encoded like the stream (by the
+            standard library), so that its entity tag can be used.
+        """
+        if self.value is None:  # frozen without keeping the value
+            return self._payload.etag, iter_chunks(self._payload.data)
+        etag = self._stream_etag
+        if etag is None and payload_etag and self._payload is not None:
+            etag = self._stream_etag = self._payload.etag
+        chunks = iter_encode(self.value, app=app)
+        if etag is None:
+            chunks = self._iter_hashed(chunks)
+        return etag, chunks
+
+    def _iter_hashed(self, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        digest = hashlib.sha256()
+        for chunk in chunks:
+            digest.update(chunk)
+            yield chunk
+        # only reached when the stream was consumed completely.
+        self._stream_etag = digest.hexdigest()
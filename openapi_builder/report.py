@@ -0,0 +1,191 @@
+import heapq
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+SLOWEST_AMOUNT = 10
+"""Number of slowest endpoints and schemas that are kept in the report."""
+
+
+@dataclass(frozen=True)
+class PhaseStats:
+    """Call count and cumulative duration of a phase of the build."""
+
+    calls: int
+    """Number of times the phase was executed."""
+
+    total: float
+    """Cumulative duration in seconds, including nested phases (e.g. nested schemas)."""
+
+
+@dataclass(frozen=True)
+class TimedItem:
+    """The duration of processing an endpoint or schema."""
+
+    name: str
+    duration: float
+    """Duration in seconds, including nested phases."""
+
+
+@dataclass(frozen=True)
+class BuildReport:
+    """Where the time of building the specification went.
+
+    Created by `OpenApiDocumentation.get_build_report`, if the `build_report` option is set.
+    """
+
+    phases: Dict[str, PhaseStats] = field(default_factory=dict)
+    """Statistics by phase, e.g. 'process_rule' or 'schema_manager.process'."""
+
+    slowest_endpoints: List[TimedItem] = field(default_factory=list)
+    """The slowest rules, slowest first."""
+
+    slowest_schemas: List[TimedItem] = field(default_factory=list)
+    """The slowest values processed by the schema manager, slowest first."""
+
+    def to_dict(self) -> dict:
+        """Returns the report as JSON serializable dictionary."""
+        return asdict(self)
+
+
+def get_item_name(item: Any, path: Optional[str] = None) -> str:
+    """Returns the name of an endpoint or schema (class) in the report.
+
+    :param path: The name under which the item is converted (e.g. 'Bird.name' for a
+        field), which names instances that aren't schemas.
+    """
+    if isinstance(item, str):
+        return item
+    if isinstance(item, type):
+        return item.__qualname__
+    schema_class = getattr(item, "schema_class", None)  # e.g. `DeclaredSchema`
+    if isinstance(schema_class, type):
+        return schema_class.__qualname__
+    if path is not None:
+        return f"{path} ({type(item).__qualname__})"
+    return f"{type(item).__qualname__} instance"
+
+
+class _Timer:
+    __slots__ = ("recorder", "phase", "item", "category", "path", "started")
+
+    def __init__(self, recorder, phase, item, category, path):
+        self.recorder = recorder
+        self.phase = phase
+        self.item = item
+        self.category = category
+        self.path = path
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.recorder.add(
+            self.phase,
+            time.perf_counter() - self.started,
+            self.item,
+            self.category,
+            self.path,
+        )
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class BuildRecorder:
+    """Records the call count and duration of the phases of the build.
+
+    Recording costs two calls to `time.perf_counter` per phase, so it can be left on in
+    production. When disabled, the phases are not timed at all.
+
+    Usage:
+    >>> recorder = BuildRecorder(enabled=True)
+    >>> with recorder.phase("process_rule", item="/users", category="endpoints"):
+    >>>     ...
+    >>> recorder.report()
+    """
+
+    def __init__(self, enabled: bool = True, slowest_amount: int = SLOWEST_AMOUNT):
+        self.enabled = enabled
+        self.slowest_amount = slowest_amount
+        self._lock = threading.Lock()
+        self._phases: Dict[str, List] = {}  # [calls, total] by phase
+        # min-heaps of (duration, name), so the fastest item is replaced first.
+        self._slowest: Dict[str, List[Tuple[float, str]]] = {}
+
+    def phase(
+        self,
+        name: str,
+        item: Any = None,
+        category: Optional[str] = None,
+        path: Optional[str] = None,
+    ):
+        """Returns a context manager that times a phase.
+
+        :param name: The name of the phase.
+        :param item: The endpoint (name) or schema that is processed, if any.
+        :param category: The category of the slowest items the item is recorded in.
+        :param path: The name under which the item is processed, see `get_item_name`.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, item, category, path)
+
+    def add(
+        self,
+        name: str,
+        duration: float,
+        item: Any = None,
+        category: Optional[str] = None,
+        path: Optional[str] = None,
+    ):
+        """Records a duration (in seconds) of a phase."""
+        with self._lock:
+            stats = self._phases.get(name)
+            if stats is None:
+                stats = self._phases[name] = [0, 0.0]
+            stats[0] += 1
+            stats[1] += duration
+
+            if item is None or category is None:
+                return
+            slowest = self._slowest.setdefault(category, [])
+            if len(slowest) < self.slowest_amount:
+                heapq.heappush(slowest, (duration, get_item_name(item, path)))
+            elif duration > slowest[0][0]:
+                heapq.heapreplace(slowest, (duration, get_item_name(item, path)))
+
+    def clear(self):
+        """Removes all recorded phases."""
+        with self._lock:
+            self._phases = {}
+            self._slowest = {}
+
+    def report(self) -> BuildReport:
+        """Returns a snapshot of the recorded phases."""
+        with self._lock:
+            return BuildReport(
+                phases={
+                    name: PhaseStats(calls=calls, total=total)
+                    for name, (calls, total) in self._phases.items()
+                },
+                slowest_endpoints=self._get_slowest("endpoints"),
+                slowest_schemas=self._get_slowest("schemas"),
+            )
+
+    def _get_slowest(self, category: str) -> List[TimedItem]:
+        return [
+            TimedItem(name=name, duration=duration)
+            for duration, name in sorted(self._slowest.get(category, []), reverse=True)
+        ]
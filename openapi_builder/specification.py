@@ -3,14 +3,629 @@
 This is described on this page:
 https://github.com/OAI/OpenAPI-Specification/blob/main/versions/3.0.3.md
 """
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Union
+import copy
+import operator
+import threading
+import weakref
+from dataclasses import MISSING, Field, FrozenInstanceError, dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple, Union
 
-missing = object()
 
+class _Missing:
+    """Sentinel for values that are not set, which survives copying and pickling."""
 
-@dataclass()
-class OpenAPI:
+    def __repr__(self):
+        return "<missing>"
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return "missing"
+
+
+missing = _Missing()
+
+
+_SHARED = ()
+"""The parents of a shared object, which doesn't track its parents (see `intern_schema`)."""
+
+
+class SpecificationObject:
+    """Base class for all specification objects.
+
+    The serialized value of an object is cached by `get_value`. Assigning an attribute,
+    or modifying one of its lists or dicts, marks the object and all objects that
+    contain it as changed. Serializing again after a small change therefore only
+    serializes the changed objects and the objects that contain them.
+
+    Lists and dicts (also nested ones) are copied into tracked containers when they're
+    assigned, so modifying the assigned container afterwards doesn't change the object:
+    >>> schema.properties = properties
+    >>> schema.properties["name"] = Schema(type="string")  # not `properties["name"] = ...`
+
+    The fields are stored in slots (see `specification_dataclass`). Other attributes can
+    still be assigned, in which case a `__dict__` is allocated for the object.
+
+    Objects can be shared by multiple parents (see `intern_schema`). Shared objects are
+    immutable and don't track their parents. Use `writable` before modifying an object
+    that might be shared.
+    """
+
+    __slots__ = ("_value", "_parents", "__dict__", "__weakref__")
+
+    _lazy_fields: FrozenSet[str] = frozenset()
+    """The list and dict fields, which are allocated when first written to."""
+
+    _field_slots: Tuple[str, ...] = ()
+    """The slots in which the fields are stored."""
+
+    _get_field_slots = staticmethod(lambda value: ())
+    """Returns the values of the field slots as tuple."""
+
+    def __new__(cls, *args, **kwargs):
+        self = super().__new__(cls)
+        object.__setattr__(self, "_value", None)
+        object.__setattr__(self, "_parents", None)  # allocated by `add_parent`
+        return self
+
+    def __setattr__(self, name, value):
+        if self._parents is _SHARED:
+            raise FrozenInstanceError(
+                f"cannot assign to {name!r} of a shared {type(self).__name__}, "
+                f"use writable() to get a private copy"
+            )
+        if name in self._lazy_fields:
+            value = track_lazy(value, owner=self)
+        elif isinstance(value, (list, dict, SpecificationObject)):
+            value = track(value, owner=self)
+        if name not in self.__dataclass_fields__:
+            _other_attribute_names.add(name)
+        object.__setattr__(self, name, value)
+        if self._value is not None:
+            self.set_changed()
+
+    def __getstate__(self):
+        state = dict(getattr(self, "__dict__", {}))
+        for name in self.__dataclass_fields__:
+            value = _get_raw(self, name)
+            if value is not None or name not in self._lazy_fields:
+                state[name] = value
+        return state
+
+    def __setstate__(self, state):
+        for name in self._lazy_fields:
+            object.__setattr__(self, f"_{name}", None)
+        for name, value in state.items():
+            if name in self._lazy_fields:
+                value = track_lazy(value, owner=self)
+            else:
+                value = track(value, owner=self)
+            if name not in self.__dataclass_fields__:
+                _other_attribute_names.add(name)
+            object.__setattr__(self, name, value)
+
+    def __reduce_ex__(self, protocol):
+        if self._parents is _SHARED:
+            return _restore_shared, (type(self), self.__getstate__())
+        return super().__reduce_ex__(protocol)
+
+    def __deepcopy__(self, memo):
+        if self._parents is _SHARED:
+            return self  # shared objects never change, so the copy can share them
+        value = type(self).__new__(type(self))
+        memo[id(self)] = value
+        value.__setstate__(copy.deepcopy(self.__getstate__(), memo))
+        return value
+
+    @property
+    def is_shared(self) -> bool:
+        """Whether the object is shared, and therefore can't be modified."""
+        return self._parents is _SHARED
+
+    def writable(self):
+        """Returns the object itself, or a private copy if it's shared."""
+        if self._parents is not _SHARED:
+            return self
+        # shared objects only contain immutable values, so the slots can be copied as is.
+        private = type(self).__new__(type(self))
+        for name in self._field_slots:
+            object.__setattr__(private, name, getattr(self, name))
+        return private
+
+    def add_parent(self, parent: "SpecificationObject"):
+        """Registers an object containing this object, to inform it about changes."""
+        parents = self._parents
+        if parents is None:
+            parents = {}
+            object.__setattr__(self, "_parents", parents)
+        elif parents is _SHARED:
+            return  # shared objects never change
+        parents[id(parent)] = weakref.ref(parent)
+
+    def set_changed(self):
+        """Discards the cached value of this object, and all objects containing it."""
+        if self._value is None:
+            return  # not serialized yet, so neither are the objects containing it
+
+        object.__setattr__(self, "_value", None)
+        for reference in list((self._parents or {}).values()):
+            parent = reference()
+            if parent is not None:
+                parent.set_changed()
+
+    def get_value(self):
+        """Returns the serialized value. It must not be modified, since it's cached."""
+        value = self._value
+        if value is None:
+            value = self._get_value()
+            object.__setattr__(self, "_value", value)
+        return value
+
+    def _get_value(self):
+        raise NotImplementedError()
+
+
+class TrackedContainer:
+    """Mixin for containers that inform the specification object owning them about changes."""
+
+    __slots__ = ()
+
+    def set_owner(self, owner: Optional[SpecificationObject]):
+        self._owner = None if owner is None else weakref.ref(owner)
+
+    def is_owned_by(self, owner: SpecificationObject) -> bool:
+        return self._owner is not None and self._owner() is owner
+
+    def _track(self, item):
+        """Prepares an item to be stored, see `track`.
+
+        Nested lists and dicts are tracked as well, so that modifying them (e.g. the
+        lists of a `SecurityRequirement`) also informs the owner.
+        """
+        owner = self._owner and self._owner()
+        if owner is None:
+            return item
+        return track(item, owner)
+
+    def _set_changed(self):
+        owner = self._owner and self._owner()
+        if owner is not None:
+            owner.set_changed()
+
+
+class TrackedList(TrackedContainer, list):
+    """List that informs the specification object that owns it about changes."""
+
+    __slots__ = ("_owner", "_field")
+
+    def __init__(self, iterable=(), owner: Optional[SpecificationObject] = None):
+        self.set_owner(owner)
+        list.__init__(self, map(self._track, iterable))
+
+    def __reduce_ex__(self, protocol):
+        return list, (list(self),)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(map(self._track, value))
+        else:
+            value = self._track(value)
+        super().__setitem__(index, value)
+        self._set_changed()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._set_changed()
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __imul__(self, other):
+        super().__imul__(other)
+        self._set_changed()
+        return self
+
+    def append(self, item):
+        super().append(self._track(item))
+        self._set_changed()
+
+    def extend(self, iterable):
+        super().extend(list(map(self._track, iterable)))
+        self._set_changed()
+
+    def insert(self, index, item):
+        super().insert(index, self._track(item))
+        self._set_changed()
+
+    def pop(self, *args):
+        item = super().pop(*args)
+        self._set_changed()
+        return item
+
+    def remove(self, item):
+        super().remove(item)
+        self._set_changed()
+
+    def clear(self):
+        super().clear()
+        self._set_changed()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._set_changed()
+
+    def reverse(self):
+        super().reverse()
+        self._set_changed()
+
+
+class TrackedDict(TrackedContainer, dict):
+    """Dict that informs the specification object that owns it about changes."""
+
+    __slots__ = ("_owner", "_field")
+
+    def __init__(self, *args, owner: Optional[SpecificationObject] = None, **kwargs):
+        self.set_owner(owner)
+        dict.__init__(self, *args, **kwargs)
+        if self and self._owner is not None:
+            for key, value in self.items():
+                dict.__setitem__(self, key, self._track(value))
+
+    def __reduce_ex__(self, protocol):
+        return dict, (dict(self),)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, self._track(value))
+        self._set_changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._set_changed()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        items = dict(*args, **kwargs)
+        super().update({key: self._track(value) for key, value in items.items()})
+        self._set_changed()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, *args):
+        item = super().pop(*args)
+        self._set_changed()
+        return item
+
+    def popitem(self):
+        item = super().popitem()
+        self._set_changed()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._set_changed()
+
+
+class _LazyContainer:
+    """Mixin for the empty container of a list or dict field that is not allocated yet.
+
+    It's returned when reading the field, and stored in the field (becoming a regular
+    tracked container) when it's first written to. Writes to a container that was read
+    before another container was stored in the field, are redirected to the stored one.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, *args, **kwargs):
+        # creating a container of the same type (e.g. `dataclasses.asdict` does) returns
+        # a regular list or dict, since it doesn't belong to a field.
+        return cls._base_class(*args, **kwargs)
+
+    @classmethod
+    def for_field(cls, owner: SpecificationObject, name: str):
+        """Returns the lazy container of the field of the owner."""
+        value = cls._base_class.__new__(cls)
+        value._owner = weakref.ref(owner)
+        value._field = name
+        return value
+
+    def _get_target(self):
+        owner = self._owner()
+        target = _get_raw(owner, self._field)
+        if target is None:
+            if owner.is_shared:
+                raise FrozenInstanceError(
+                    f"cannot modify {self._field!r} of a shared "
+                    f"{type(owner).__name__}, use writable() to get a private copy"
+                )
+            self.__class__ = self._tracked_class
+            object.__setattr__(owner, self._field, self)
+            return self
+        return target
+
+
+def _redirect(tracked_class, name):
+    method = getattr(tracked_class, name)
+
+    def redirect(self, *args, **kwargs):
+        return method(self._get_target(), *args, **kwargs)
+
+    redirect.__name__ = name
+    return redirect
+
+
+class _LazyList(_LazyContainer, TrackedList):
+    __slots__ = ()
+    _base_class = list
+    _tracked_class = TrackedList
+
+
+class _LazyDict(_LazyContainer, TrackedDict):
+    __slots__ = ()
+    _base_class = dict
+    _tracked_class = TrackedDict
+
+
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+):
+    setattr(_LazyList, _name, _redirect(TrackedList, _name))
+
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__ior__",
+    "update",
+    "setdefault",
+    "pop",
+    "popitem",
+    "clear",
+):
+    setattr(_LazyDict, _name, _redirect(TrackedDict, _name))
+
+
+class _Unallocated:
+    """Default of list and dict fields, which are allocated when first written to."""
+
+    def __repr__(self):
+        return "<unallocated>"
+
+    def __reduce__(self):
+        return "unallocated"
+
+
+unallocated = _Unallocated()
+
+
+class _LazyField:
+    """Descriptor of a list or dict field, of which the value is stored in the slot
+    named after the field with an underscore prefix (e.g. `_properties`).
+
+    An unallocated field holds None in its slot. Serializing objects (`_get_value`)
+    reads these slots directly, to avoid creating empty containers.
+    """
+
+    __slots__ = ("slot", "name", "lazy_class")
+
+    def __init__(self, slot, name: str, lazy_class: type):
+        self.slot = slot
+        self.name = name
+        self.lazy_class = lazy_class
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = self.slot.__get__(instance, owner)
+        if value is None:
+            # created without calling __init__, since this is done for every read.
+            value = self.lazy_class.for_field(instance, self.name)
+        return value
+
+    def __set__(self, instance, value):
+        self.slot.__set__(instance, value)
+
+
+def _get_raw(instance: SpecificationObject, name: str):
+    """Returns the value of the field, or None for a list or dict that is not allocated."""
+    if name in instance._lazy_fields:
+        return getattr(instance, f"_{name}")
+    return getattr(instance, name)
+
+
+def _tuple_getter(names: Tuple[str, ...]):
+    """Returns a function that returns the values of the attributes as tuple."""
+    getter = operator.attrgetter(*names)
+    if len(names) == 1:
+        return lambda value: (getter(value),)
+    return getter
+
+
+def specification_dataclass(cls):
+    """Creates a dataclass of which the fields are stored in slots.
+
+    Fields with a list or dict as default (`field(default_factory=list)`) are allocated
+    when they're first written to. Reading them before that returns an empty container.
+    The constructor and attributes are the same as for a regular dataclass.
+    """
+    lazy_classes = {}
+    lazy_defaults = []
+    for name, value in list(cls.__dict__.items()):
+        if isinstance(value, Field) and value.default_factory in (list, dict):
+            lazy_classes[name] = (
+                _LazyList if value.default_factory is list else _LazyDict
+            )
+            lazy_defaults.append((value, value.default_factory))
+            value.default_factory = MISSING
+            value.default = unallocated
+
+    cls = dataclass(cls)
+    # only the generated constructor uses `unallocated`, `dataclasses.fields` doesn't.
+    for value, default_factory in lazy_defaults:
+        value.default = MISSING
+        value.default_factory = default_factory
+    names = list(cls.__dataclass_fields__)
+    namespace = {
+        key: value
+        for key, value in cls.__dict__.items()
+        if key not in names and key not in ("__dict__", "__weakref__")
+    }
+    namespace["__slots__"] = tuple(
+        f"_{name}" if name in lazy_classes else name for name in names
+    )
+    namespace["_lazy_fields"] = lazy_fields = cls._lazy_fields | frozenset(lazy_classes)
+    namespace["_field_slots"] = field_slots = tuple(
+        f"_{name}" if name in lazy_fields else name for name in names
+    )
+    namespace["_get_field_slots"] = staticmethod(_tuple_getter(field_slots))
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+    for name, lazy_class in lazy_classes.items():
+        slot = slotted_cls.__dict__[f"_{name}"]
+        setattr(slotted_cls, name, _LazyField(slot, name, lazy_class))
+    return slotted_cls
+
+
+def track(value, owner: SpecificationObject):
+    """Prepares a value to be assigned to an attribute of the owner.
+
+    Lists and dicts (including the lists and dicts they contain) are copied into
+    containers that inform the owner about changes.
+    """
+    if isinstance(value, SpecificationObject):
+        value.add_parent(owner)
+    elif isinstance(value, list):
+        if not (isinstance(value, TrackedList) and value.is_owned_by(owner)):
+            value = TrackedList(value, owner=owner)
+    elif isinstance(value, dict):
+        if not (isinstance(value, TrackedDict) and value.is_owned_by(owner)):
+            value = TrackedDict(value, owner=owner)
+    return value
+
+
+def track_lazy(value, owner: SpecificationObject):
+    """Prepares a value to be assigned to a list or dict field of the owner.
+
+    Unlike `track`, an unallocated (or empty) value is stored as None.
+    """
+    if value is unallocated or value is None:
+        return None
+    if isinstance(value, _LazyContainer):
+        return None  # nothing was written to it, otherwise it wouldn't be lazy anymore
+    return track(value, owner)
+
+
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+
+
+def _copy_value(value):
+    """Returns a copy of a value supplied by the user (e.g. an example) for a serialized
+    value, which must not change when the value is modified afterwards."""
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return value
+    return copy.deepcopy(value)  # tracked containers are copied to regular ones
+
+
+_other_attribute_names: Set[str] = set()
+"""Names of the attributes other than fields that were assigned to any object (e.g.
+`nullable`), which are stored in the `__dict__` of the object."""
+
+_missing_attribute = object()
+
+_shared_objects = weakref.WeakValueDictionary()
+"""Shared objects by their type and field values, see `intern_schema`."""
+
+_shared_objects_lock = threading.Lock()
+
+
+def _has_other_attributes(value: SpecificationObject) -> bool:
+    """Whether attributes other than the fields were assigned to the object.
+
+    Reading `__dict__` would allocate it for every object, so only the names that were
+    assigned to any object are looked up, which doesn't allocate it.
+    """
+    fields = value.__dataclass_fields__
+    for name in _other_attribute_names:
+        if name in fields:
+            continue  # a field of this object, but not of the object it was assigned to
+        if getattr(value, name, _missing_attribute) is not _missing_attribute:
+            return True
+    return False
+
+
+def _get_shared_key(value: SpecificationObject):
+    """Returns the key of an object in the shared objects, or None if it can't be shared.
+
+    Only objects without nested objects, lists and dicts can be shared. The types of the
+    field values are part of the key, since `1`, `1.0` and `True` are equal.
+    """
+    items = value._get_field_slots(value)  # unallocated lists and dicts are None
+    for item in items:
+        if isinstance(item, (SpecificationObject, list, dict)):
+            return None
+    if _has_other_attributes(value):
+        return None  # other attributes (e.g. `nullable`) aren't compared
+    key = (type(value), items, tuple(map(type, items)))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def intern_schema(schema: "Schema") -> "Schema":
+    """Returns the shared instance of a schema that is equal to the given schema.
+
+    This avoids keeping thousands of equal schemas (e.g. `Schema(type="string")`), and
+    serializing each of them. Shared schemas are immutable, so that modifying a schema
+    for one usage doesn't modify the other usages. Modify a copy instead:
+    >>> schema = schema.writable()
+    >>> schema.description = "Name of the user."
+
+    Schemas that contain other objects, lists or dicts, or that are contained by other
+    objects already, are returned as is.
+    """
+    if schema._parents is not None:  # shared already, or contained by other objects
+        return schema
+    key = _get_shared_key(schema)
+    if key is None:
+        return schema
+    with _shared_objects_lock:
+        shared = _shared_objects.get(key)
+        if shared is None:
+            object.__setattr__(schema, "_parents", _SHARED)
+            _shared_objects[key] = shared = schema
+    return shared
+
+
+def _restore_shared(cls, state):
+    """Restores a shared object after unpickling it."""
+    value = cls.__new__(cls)
+    value.__setstate__(state)
+    return intern_schema(value)
+
+
+@specification_dataclass
+class OpenAPI(SpecificationObject):
     """Root document object of the OpenAPI document.
 
     Open API root object as described here:
@@ -56,25 +671,25 @@ class OpenAPI:
     external_docs: Optional["ExternalDocumentation"] = None
     """Additional external documentation."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {
             "openapi": self.openapi,
             "info": self.info.get_value(),
-            "servers": [server.get_value() for server in self.servers],
+            "servers": [server.get_value() for server in self._servers or ()],
             "paths": self.paths.get_value(),
             "components": self.components.get_value(),
         }
-        if self.security:
+        if self._security:
             value["security"] = [
-                requirement.get_value() for requirement in self.security
+                requirement.get_value() for requirement in self._security
             ]
-        if self.tags:
-            value["tags"] = [tag.get_value() for tag in self.tags]
+        if self._tags:
+            value["tags"] = [tag.get_value() for tag in self._tags]
         return value
 
 
-@dataclass()
-class Info:
+@specification_dataclass
+class Info(SpecificationObject):
     """The object provides metadata about the API.
 
     The metadata MAY be used by the clients if needed, and MAY be presented in editing
@@ -121,7 +736,7 @@ class Info:
     license: Optional["License"] = None
     """The license information for the exposed API."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {
             "title": self.title,
             "version": self.version,
@@ -139,8 +754,8 @@ class Info:
         return value
 
 
-@dataclass()
-class Contact:
+@specification_dataclass
+class Contact(SpecificationObject):
     """Contact information for the exposed API.
 
     Open API contact object as described here:
@@ -165,7 +780,7 @@ class Contact:
     """The email address of the contact person/organization. MUST be in the format
     of an email address."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {}
 
         if self.name is not None:
@@ -178,8 +793,8 @@ class Contact:
         return value
 
 
-@dataclass()
-class License:
+@specification_dataclass
+class License(SpecificationObject):
     """License information for the exposed API.
 
     Open API license object as described here:
@@ -198,7 +813,7 @@ class License:
     url: str = None
     """A URL to the license used for the API. MUST be in the format of a URL."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {"name": self.name}
 
         if self.url is not None:
@@ -207,8 +822,8 @@ class License:
         return value
 
 
-@dataclass()
-class Server:
+@specification_dataclass
+class Server(SpecificationObject):
     """An object representing a Server.
 
     Open API server object as described here:
@@ -252,22 +867,22 @@ class Server:
     """A map between a variable name and its value. The value is used for
     substitution in the server's URL template."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {"url": self.url}
 
         if self.description is not None:
             value["description"] = self.description
-        if self.variables:
+        if self._variables:
             value["variables"] = {
                 key: server_variable.get_value()
-                for key, server_variable in self.variables.items()
+                for key, server_variable in self._variables.items()
             }
 
         return value
 
 
-@dataclass()
-class ServerVariable:
+@specification_dataclass
+class ServerVariable(SpecificationObject):
     """An object representing a Server Variable for server URL template substitution.
 
     Open API server variable object as described here:
@@ -289,19 +904,19 @@ class ServerVariable:
     """An optional description for the server variable. CommonMark syntax MAY be
     used for rich text representation."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {"default": self.default}
 
-        if self.enum:
-            value["enum"] = self.enum
+        if self._enum:
+            value["enum"] = list(self._enum)
         if self.description is not None:
             value["description"] = self.description
 
         return value
 
 
-@dataclass()
-class Components:
+@specification_dataclass
+class Components(SpecificationObject):
     """Holds a set of reusable objects for different aspects of the OAS.
 
     All objects defined within the components object will have no effect on the API
@@ -342,51 +957,51 @@ class Components:
     callbacks: Dict[str, Union["Callback", "Reference"]] = field(default_factory=dict)
     """An object to hold reusable Callback Objects."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {}
 
-        if self.schemas:
+        if self._schemas:
             value["schemas"] = {
-                key: value.get_value() for key, value in self.schemas.items()
+                key: value.get_value() for key, value in self._schemas.items()
             }
-        if self.responses:
+        if self._responses:
             value["responses"] = {
-                key: value.get_value() for key, value in self.responses.items()
+                key: value.get_value() for key, value in self._responses.items()
             }
-        if self.parameters:
+        if self._parameters:
             value["parameters"] = {
-                key: value.get_value() for key, value in self.parameters.items()
+                key: value.get_value() for key, value in self._parameters.items()
             }
-        if self.examples:
+        if self._examples:
             value["examples"] = {
-                key: value.get_value() for key, value in self.examples.items()
+                key: value.get_value() for key, value in self._examples.items()
             }
-        if self.request_bodies:
+        if self._request_bodies:
             value["request_bodies"] = {
-                key: value.get_value() for key, value in self.request_bodies.items()
+                key: value.get_value() for key, value in self._request_bodies.items()
             }
-        if self.headers:
+        if self._headers:
             value["headers"] = {
-                key: value.get_value() for key, value in self.headers.items()
+                key: value.get_value() for key, value in self._headers.items()
             }
-        if self.security_schemes:
+        if self._security_schemes:
             value["securitySchemes"] = {
-                key: value.get_value() for key, value in self.security_schemes.items()
+                key: value.get_value() for key, value in self._security_schemes.items()
             }
-        if self.links:
+        if self._links:
             value["links"] = {
-                key: value.get_value() for key, value in self.links.items()
+                key: value.get_value() for key, value in self._links.items()
             }
-        if self.callbacks:
+        if self._callbacks:
             value["callbacks"] = {
-                key: value.get_value() for key, value in self.callbacks.items()
+                key: value.get_value() for key, value in self._callbacks.items()
             }
 
         return value
 
 
-@dataclass()
-class Paths:
+@specification_dataclass
+class Paths(SpecificationObject):
     """Holds the relative paths to the individual endpoints and their operations.
 
     The path is appended to the URL from the Server Object in order to construct the
@@ -430,13 +1045,13 @@ class Paths:
     are identical. In case of ambiguous matching, it's up to the tooling to decide
     which one to use."""
 
-    def get_value(self):
-        value = {key: value.get_value() for key, value in self.values.items()}
+    def _get_value(self):
+        value = {key: value.get_value() for key, value in (self._values or {}).items()}
         return value
 
 
-@dataclass()
-class PathItem:
+@specification_dataclass
+class PathItem(SpecificationObject):
     """Describes the operations available on a single path.
 
     A Paths Item MAY be empty, due to ACL constraints. The path itself is still
@@ -496,7 +1111,7 @@ class PathItem:
     can use the Reference Object to link to parameters that are defined at the
     OpenAPI Object's components/parameters."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {}
 
         if self.ref is not None:
@@ -521,18 +1136,18 @@ class PathItem:
             value["patch"] = self.patch.get_value()
         if self.trace is not None:
             value["trace"] = self.trace.get_value()
-        if self.servers:
-            value["servers"] = [server.get_value() for server in self.servers]
-        if self.parameters:
+        if self._servers:
+            value["servers"] = [server.get_value() for server in self._servers]
+        if self._parameters:
             value["parameters"] = [
-                parameter.get_value() for parameter in self.parameters
+                parameter.get_value() for parameter in self._parameters
             ]
 
         return value
 
 
-@dataclass()
-class Operation:
+@specification_dataclass
+class Operation(SpecificationObject):
     """Describes a single API operation on a path.
 
     Open API operation object as described here:
@@ -601,11 +1216,11 @@ class Operation:
     server object is specified at the Paths Item Object or Root level, it will be
     overridden by this value."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {}
 
-        if self.tags:
-            value["tags"] = self.tags
+        if self._tags:
+            value["tags"] = list(self._tags)
         if self.summary is not None:
             value["summary"] = self.summary
         if self.description is not None:
@@ -614,33 +1229,33 @@ class Operation:
             value["externalDocs"] = self.external_docs.get_value()
         if self.operation_id is not None:
             value["operationId"] = self.operation_id
-        if self.parameters:
+        if self._parameters:
             value["parameters"] = [
-                parameter.get_value() for parameter in self.parameters
+                parameter.get_value() for parameter in self._parameters
             ]
         if self.request_body is not None:
             value["requestBody"] = self.request_body.get_value()
         if self.responses is not None:
             value["responses"] = self.responses.get_value()
-        if self.callbacks:
+        if self._callbacks:
             value["callbacks"] = {
-                key: callback.get_value() for key, callback in self.callbacks.items()
+                key: callback.get_value() for key, callback in self._callbacks.items()
             }
         if self.deprecated is True:
             value["deprecated"] = True
-        if self.security:
+        if self._security:
             value["security"] = [
                 security_requirement.get_value()
-                for security_requirement in self.security
+                for security_requirement in self._security
             ]
-        if self.servers:
-            value["servers"] = [server.get_value() for server in self.servers]
+        if self._servers:
+            value["servers"] = [server.get_value() for server in self._servers]
 
         return value
 
 
-@dataclass()
-class ExternalDocumentation:
+@specification_dataclass
+class ExternalDocumentation(SpecificationObject):
     """Allows referencing an external resource for extended documentation.
 
     Open API external docs object as described here:
@@ -661,7 +1276,7 @@ class ExternalDocumentation:
     """A short description of the target documentation. CommonMark syntax MAY be
     used for rich text representation."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {"url": self.url}
 
         if self.description is not None:
@@ -670,8 +1285,8 @@ class ExternalDocumentation:
         return value
 
 
-@dataclass()
-class Parameter:
+@specification_dataclass
+class Parameter(SpecificationObject):
     """Describes a single operation parameter.
 
     A unique parameter is defined by a combination of a name and location (in_).
@@ -734,7 +1349,7 @@ class Parameter:
     the value of allowEmptyValue SHALL be ignored. Use of this property is NOT
     RECOMMENDED, as it is likely to be removed in a later revision."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {"in": self.in_, "name": self.name}
 
         if self.description is not None:
@@ -751,8 +1366,8 @@ class Parameter:
         return value
 
 
-@dataclass()
-class RequestBody:
+@specification_dataclass
+class RequestBody(SpecificationObject):
     """Describes a single request body.
 
     Open API request body object as described here:
@@ -772,10 +1387,11 @@ class RequestBody:
     """Determines if the request body is required in the request. Defaults to
     false."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {
             "content": {
-                key: media_type.get_value() for key, media_type in self.content.items()
+                key: media_type.get_value()
+                for key, media_type in (self._content or {}).items()
             }
         }
 
@@ -787,8 +1403,8 @@ class RequestBody:
         return value
 
 
-@dataclass()
-class MediaType:
+@specification_dataclass
+class MediaType(SpecificationObject):
     """Provides schema and examples for the media type identified by its key.
 
     Open API media type object as described here:
@@ -816,28 +1432,28 @@ class MediaType:
     SHALL only apply to requestBody objects when the media type is multipart or
     application/x-www-form-urlencoded."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {}
 
         if self.schema:
             value["schema"] = self.schema.get_value()
         if self.example is not None:
-            value["example"] = self.example
-        elif self.examples:
+            value["example"] = _copy_value(self.example)
+        elif self._examples:
             value["examples"] = {
-                key: example.get_value() for key, example in self.examples.items()
+                key: example.get_value() for key, example in self._examples.items()
             }
-        elif self.encoding:
+        elif self._encoding:
             value["encoding"] = {
                 key: encoding_obj.get_value()
-                for key, encoding_obj in self.encoding.items()
+                for key, encoding_obj in self._encoding.items()
             }
 
         return value
 
 
-@dataclass()
-class Encoding:
+@specification_dataclass
+class Encoding(SpecificationObject):
     """A single encoding definition applied to a single schema property.
 
     Open API encoding object as described here:
@@ -879,14 +1495,14 @@ class Encoding:
     The default value is false. This property SHALL be ignored if the request body
     media type is not application/x-www-form-urlencoded."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {}
 
         if self.content_type is not None:
             value["contentType"] = self.content_type
-        if self.headers:
+        if self._headers:
             value["headers"] = {
-                key: header.get_value() for key, header in self.headers.items()
+                key: header.get_value() for key, header in self._headers.items()
             }
         if self.style is not None:
             value["style"] = self.style
@@ -898,8 +1514,8 @@ class Encoding:
         return value
 
 
-@dataclass()
-class Responses:
+@specification_dataclass
+class Responses(SpecificationObject):
     """A container for the expected responses of an operation.
 
     The container maps a HTTP response code to the expected response. The documentation
@@ -941,13 +1557,13 @@ class Responses:
     Object can link to a response that the OpenAPI Object's components/responses
     section defines."""
 
-    def get_value(self):
-        value = {key: value.get_value() for key, value in self.values.items()}
+    def _get_value(self):
+        value = {key: value.get_value() for key, value in (self._values or {}).items()}
         return value
 
 
-@dataclass()
-class Response:
+@specification_dataclass
+class Response(SpecificationObject):
     """Describes a single response from an API Operation.
 
     This response is including design-time, static links to operations based on the
@@ -996,25 +1612,27 @@ class Response:
         if self.description is None:
             raise ValueError("Invalid description")
 
-    def get_value(self):
+    def _get_value(self):
         value = {"description": self.description}
 
-        if self.headers:
+        if self._headers:
             value["headers"] = {
-                key: header.get_value() for key, header in self.headers.items()
+                key: header.get_value() for key, header in self._headers.items()
             }
-        if self.content:
+        if self._content:
             value["content"] = {
-                key: media_type.get_value() for key, media_type in self.content.items()
+                key: media_type.get_value() for key, media_type in self._content.items()
+            }
+        if self._links:
+            value["links"] = {
+                key: link.get_value() for key, link in self._links.items()
             }
-        if self.links:
-            value["links"] = {key: link.get_value() for key, link in self.links.items()}
 
         return value
 
 
-@dataclass()
-class Callback:
+@specification_dataclass
+class Callback(SpecificationObject):
     """A map of possible out-of band callbacks related to the parent operation.
 
     Each value in the map is a Paths Item Object that describes a set of requests that
@@ -1030,13 +1648,16 @@ class Callback:
     """A Paths Item Object used to define a callback request and expected
     responses."""
 
-    def get_value(self):
-        value = {key: path_item.get_value() for key, path_item in self.values.items()}
+    def _get_value(self):
+        value = {
+            key: path_item.get_value()
+            for key, path_item in (self._values or {}).items()
+        }
         return value
 
 
-@dataclass()
-class Example:
+@specification_dataclass
+class Example(SpecificationObject):
     """Open API example object.
 
      As described here:
@@ -1061,7 +1682,7 @@ class Example:
     reference examples that cannot easily be included in JSON or YAML documents.
     The value field and externalValue field are mutually exclusive."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {}
 
         if self.summary is not None:
@@ -1069,15 +1690,15 @@ class Example:
         if self.description is not None:
             value["description"] = self.description
         if self.value is not None:
-            value["value"] = self.value
+            value["value"] = _copy_value(self.value)
         if self.external_value is not None:
             value["externalValue"] = self.external_value
 
         return value
 
 
-@dataclass()
-class Link:
+@specification_dataclass
+class Link(SpecificationObject):
     """The Link object represents a possible design-time link for a response.
 
     The presence of a link does not guarantee the caller's ability to successfully
@@ -1117,17 +1738,19 @@ class Link:
     server: Optional["Server"] = None
     """A server object to be used by the target operation."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {}
 
         if self.operation_ref is not None:
             value["operationRef"] = self.operation_ref
         if self.operation_id is not None:
             value["operationId"] = self.operation_id
-        if self.parameters:
-            value["parameters"] = {key: value for key, value in self.parameters.items()}
+        if self._parameters:
+            value["parameters"] = {
+                key: _copy_value(value) for key, value in self._parameters.items()
+            }
         if self.request_body:
-            value["requestBody"] = self.request_body
+            value["requestBody"] = _copy_value(self.request_body)
         if self.description is not None:
             value["description"] = self.description
         if self.server is not None:
@@ -1136,8 +1759,8 @@ class Link:
         return value
 
 
-@dataclass()
-class Header:
+@specification_dataclass
+class Header(SpecificationObject):
     """The Header Object.
 
     It follows the structure of the Parameter Object with the following changes:
@@ -1178,7 +1801,7 @@ class Header:
     allowEmptyValue SHALL be ignored. Use of this property is NOT RECOMMENDED, as
     it is likely to be removed in a later revision."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {}
 
         if self.description is not None:
@@ -1193,8 +1816,8 @@ class Header:
         return value
 
 
-@dataclass()
-class Tag:
+@specification_dataclass
+class Tag(SpecificationObject):
     """Adds metadata to a single tag that is used by the Operation Object.
 
     It is not mandatory to have a Tag Object per tag defined in the Operation Object
@@ -1220,7 +1843,7 @@ class Tag:
     external_docs: Optional[ExternalDocumentation] = None
     """Additional external documentation for this tag."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {"name": self.name}
 
         if self.description is not None:
@@ -1231,8 +1854,8 @@ class Tag:
         return value
 
 
-@dataclass()
-class Reference:
+@specification_dataclass
+class Reference(SpecificationObject):
     """A simple object to allow referencing other components in the specification.
 
     The Reference may refer to something internally and externally. The Reference
@@ -1289,14 +1912,14 @@ class Reference:
             "This function only works when the reference is created via from_schema"
         )
 
-    def get_value(self):
+    def _get_value(self):
         value = {"$ref": self.ref}
 
         return value
 
 
-@dataclass()
-class Schema:
+@specification_dataclass
+class Schema(SpecificationObject):
     """The Schema Object allows the definition of input and output data types.
 
     These types can be objects, but also primitives and arrays.
@@ -1337,7 +1960,7 @@ class Schema:
     options: Optional[Dict] = None  # can only be set via after Schema is created
     discriminator: Optional["Discriminator"] = None
 
-    def get_value(self):
+    def _get_value(self):
         value = {}
 
         if self.title is not None:
@@ -1368,29 +1991,29 @@ class Schema:
             value["maxProperties"] = self.max_properties
         if self.min_properties is not None:
             value["minProperties"] = self.min_properties
-        if self.enum:
+        if self._enum:
             value["enum"] = [
-                item.get_value() if isinstance(item, Schema) else item
-                for item in self.enum
+                item.get_value() if isinstance(item, Schema) else _copy_value(item)
+                for item in self._enum
             ]
         if self.type is not None:
-            value["type"] = self.type
-        if self.all_of:
-            value["allOf"] = [item.get_value() for item in self.all_of]
-        if self.any_of:
-            value["anyOf"] = [item.get_value() for item in self.any_of]
-        if self.one_of:
-            value["oneOf"] = [item.get_value() for item in self.one_of]
+            value["type"] = _copy_value(self.type)
+        if self._all_of:
+            value["allOf"] = [item.get_value() for item in self._all_of]
+        if self._any_of:
+            value["anyOf"] = [item.get_value() for item in self._any_of]
+        if self._one_of:
+            value["oneOf"] = [item.get_value() for item in self._one_of]
         if self.not_ is not None:
             value["not"] = self.not_.get_value()
         if self.items is not None:
             value["items"] = self.items.get_value()
-        if self.properties:
+        if self._properties:
             value["properties"] = {
-                key: prop.get_value() for key, prop in self.properties.items()
+                key: prop.get_value() for key, prop in self._properties.items()
             }
             required_properties = [
-                key for key, value in self.properties.items() if value.required
+                key for key, value in self._properties.items() if value.required
             ]
             if required_properties:
                 value["required"] = required_properties
@@ -1401,26 +2024,26 @@ class Schema:
         if self.format is not None:
             value["format"] = self.format
         if self.default is not missing:
-            value["default"] = self.default
-        if self.example is not None and self.examples:
+            value["default"] = _copy_value(self.default)
+        if self.example is not None and self._examples:
             raise ValueError("`example` and `examples` are mutually exclusive")
         if self.example is not None:
-            value["example"] = self.example
-        if self.examples:
+            value["example"] = _copy_value(self.example)
+        if self._examples:
             value["examples"] = {
-                key: example.get_value() for key, example in self.examples.items()
+                key: example.get_value() for key, example in self._examples.items()
             }
         if self.discriminator is not None:
             value["discriminator"] = self.discriminator.get_value()
 
         if self.options is not None:
-            value.update(self.options)
+            value.update(_copy_value(self.options))
 
         return value
 
 
-@dataclass()
-class Discriminator:
+@specification_dataclass
+class Discriminator(SpecificationObject):
     """The Discriminator object.
 
     When request bodies or response payloads may be one of a number of different
@@ -1441,17 +2064,17 @@ class Discriminator:
     """An object to hold mappings between payload values and schema names or
     references."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {"propertyName": self.property_name}
 
-        if self.mapping:
-            value["mapping"] = {key: value for key, value in self.mapping.items()}
+        if self._mapping:
+            value["mapping"] = {key: value for key, value in self._mapping.items()}
 
         return value
 
 
-@dataclass()
-class SecurityScheme:
+@specification_dataclass
+class SecurityScheme(SpecificationObject):
     """Defines a security scheme that can be used by the operations.
 
     Supported schemes are HTTP authentication, an API key (either as a header, a cookie
@@ -1496,15 +2119,15 @@ class SecurityScheme:
     """REQUIRED. An object containing configuration information for the flow types
     supported."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {"type": self.type, "in": self.in_}
 
         if self.name is not None:
             value["name"] = self.name
         if self.scheme is not None:
             value["scheme"] = self.scheme
-        if self.flows:
-            value["flows"] = [flow.get_value() for flow in self.flows]
+        if self._flows:
+            value["flows"] = [flow.get_value() for flow in self._flows]
         if self.open_id_connect_url is not None:
             value["openIdConnectUrl"] = self.open_id_connect_url
         if self.description:
@@ -1515,8 +2138,8 @@ class SecurityScheme:
         return value
 
 
-@dataclass()
-class OAuthFlows:
+@specification_dataclass
+class OAuthFlows(SpecificationObject):
     """Allows configuration of the supported OAuth Flows.
 
     Open API OAuth flows object as described here:
@@ -1537,7 +2160,7 @@ class OAuthFlows:
     """Configuration for the OAuth Authorization Code flow. Previously called
     accessCode in OpenAPI 2.0."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {}
 
         if self.implicit is not None:
@@ -1552,8 +2175,8 @@ class OAuthFlows:
         return value
 
 
-@dataclass()
-class OAuthFlow:
+@specification_dataclass
+class OAuthFlow(SpecificationObject):
     """Configuration details for a supported OAuth Flow.
 
     Open API OAuth flow object as described here:
@@ -1576,11 +2199,11 @@ class OAuthFlow:
     """REQUIRED. The available scopes for the OAuth2 security scheme. A map between
     the scope name and a short description for it. The map MAY be empty."""
 
-    def get_value(self):
+    def _get_value(self):
         value = {
             "authorizationUrl": self.authorization_url,
             "tokenUrl": self.token_url,
-            "scopes": self.scopes,
+            "scopes": dict(self._scopes or {}),
         }
 
         if self.refresh_url is not None:
@@ -1589,8 +2212,8 @@ class OAuthFlow:
         return value
 
 
-@dataclass()
-class SecurityRequirement:
+@specification_dataclass
+class SecurityRequirement(SpecificationObject):
     """Lists the required security schemes to execute this operation.
 
     The name used for each property MUST correspond to a security scheme declared in
@@ -1608,5 +2231,6 @@ class SecurityRequirement:
     not require a specified scope. For other security scheme types, the array MUST
     be empty."""
 
-    def get_value(self):
-        return self.values
+    def _get_value(self):
+        # copies, since the serialized value must not change with the tracked containers.
+        return {name: list(scopes) for name, scopes in (self._values or {}).items()}
@@ -0,0 +1,36 @@
+from typing import Dict, Iterable, List
+
+from .specification import Tag
+
+
+class TagRegistry:
+    """Ordered collection of tags, with constant-time lookups by name.
+
+    Tags are kept in insertion order, and only sorted when requested, instead of after
+    every insertion.
+    """
+
+    def __init__(self, tags: Iterable[Tag] = ()):
+        self._tags: Dict[str, Tag] = {}
+        for tag in tags:
+            self.add(tag)
+        self.changed = False
+        """Whether a tag was added after creating the registry."""
+
+    def add(self, tag: Tag) -> bool:
+        """Adds the tag, unless a tag with the same name exists, and returns whether it was added."""
+        if tag.name in self._tags:
+            return False
+        self._tags[tag.name] = tag
+        self.changed = True
+        return True
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tags
+
+    def __len__(self) -> int:
+        return len(self._tags)
+
+    def sorted(self) -> List[Tag]:
+        """Returns the tags, sorted alphabetically by name."""
+        return sorted(self._tags.values(), key=lambda tag: tag.name)
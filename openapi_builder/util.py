@@ -1,4 +1,46 @@
-import re
+import functools
+import gc
+import sys
+from typing import Any, Iterable, Iterator, NamedTuple, Set, Tuple
+
+from werkzeug.routing import Rule
+
+
+class RouteTemplate(NamedTuple):
+    """A Werkzeug rule, compiled to an OpenAPI path template."""
+
+    path: str
+    """The OpenAPI path, e.g. '/users/{user_id}' for '/users/<int:user_id>'."""
+
+    arguments: Tuple[str, ...]
+    """The names of the path parameters, in order of appearance."""
+
+
+def compile_rule(rule: Rule) -> RouteTemplate:
+    """Compiles a rule (e.g. '/users/<int:user_id>') to an OpenAPI path template.
+
+    The rule must be bound to a url map (e.g. of the application), which parses it. The
+    parsed parts are used, so converters with arguments (e.g. '<string(length=2):code>')
+    are handled the same as by the router. The result is cached per parsed rule.
+    """
+    return _compile_trace(tuple(rule._trace))
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_trace(trace: Tuple[Tuple[bool, str], ...]) -> RouteTemplate:
+    # the trace of a bound rule: (is_dynamic, data) for every part, in which the
+    # subdomain (or host) is separated from the path by a static '|'.
+    parts, arguments = [], []
+    for is_dynamic, data in trace[trace.index((False, "|")) + 1 :]:
+        if is_dynamic:
+            parts.append(f"{{{data}}}")
+            arguments.append(data)
+        else:
+            parts.append(data)
+    return RouteTemplate(path="".join(parts), arguments=tuple(arguments))
+
+
+compile_rule.cache_clear = _compile_trace.cache_clear
 
 
 def openapi_endpoint_name_from_rule(rule):
@@ -6,10 +48,42 @@ def openapi_endpoint_name_from_rule(rule):
 
     It replace '/users/<user_id>' with the OpenAPI standard: '/users/{user_id}'.
     """
-    name = rule.rule
+    return compile_rule(rule).path
+
+
+_FOLLOWED_TYPES = (dict, list, tuple, set, frozenset)
+_COUNTED_TYPES = _FOLLOWED_TYPES + (str, bytes, int, float)
+
+
+def _iter_reachable(roots: Iterable[Any], seen: Set[int]) -> Iterator[Any]:
+    """Yields the objects that are reachable from the roots, apart from the seen objects.
+
+    Only containers and objects of this package are followed, and only these and
+    scalars are yielded, since other objects (e.g. schema classes or the application) are
+    usually referenced elsewhere as well.
+    """
+    stack = list(roots)
+    while stack:
+        value = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        followed = isinstance(value, _FOLLOWED_TYPES) or type(
+            value
+        ).__module__.startswith("openapi_builder.")
+        if not followed and not isinstance(value, _COUNTED_TYPES):
+            continue
+        yield value
+        if followed:
+            stack.extend(gc.get_referents(value))
 
-    for argument in rule.arguments:
-        openapi_name = f"{{{argument}}}"
-        name = re.sub(rf"<[a-zA-Z:]*{argument}>", openapi_name, name)
 
-    return name
+def estimate_size(roots: Iterable[Any], exclude: Iterable[Any] = ()) -> int:
+    """Estimates the memory (in bytes) of the objects that are reachable from the roots.
+
+    Objects that are reachable from `exclude` are not counted, since they're kept.
+    """
+    seen: Set[int] = set()
+    for _ in _iter_reachable(exclude, seen):
+        pass
+    return sum(sys.getsizeof(value) for value in _iter_reachable(roots, seen))
@@ -0,0 +1,90 @@
+"""Baseline results of the benchmarks, for spotting regressions across releases.
+
+The benchmarks measure wall-clock time and memory, which depend on the machine, so
+they're skipped by default. Run them with:
+`OPENAPI_BUILDER_BENCHMARKS=1 python -m pytest tests/benchmarks -s`
+
+The baseline is stored in `baseline.json` next to this module. Results that are slower
+than `TOLERANCE` times the baseline are reported with a `BenchmarkRegressionWarning`.
+Since timings depend on the machine, a regression doesn't fail the benchmark.
+
+To update the baseline (e.g. before a release), run:
+`OPENAPI_BUILDER_UPDATE_BASELINE=1 python -m pytest tests/benchmarks -s`
+
+To compare the baseline with another revision (e.g. before an optimization), see
+`tests/benchmarks/compare.py`.
+"""
+import json
+import os
+import threading
+import warnings
+from typing import Dict
+
+import pytest
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+TOLERANCE = 1.5
+"""Factor by which a result may be slower than the baseline."""
+
+_lock = threading.Lock()
+
+
+class BenchmarkRegressionWarning(UserWarning):
+    """A benchmark is slower than its baseline."""
+
+
+def should_update() -> bool:
+    return os.environ.get("OPENAPI_BUILDER_UPDATE_BASELINE", "") not in ("", "0")
+
+
+def should_run() -> bool:
+    return should_update() or (
+        os.environ.get("OPENAPI_BUILDER_BENCHMARKS", "") not in ("", "0")
+    )
+
+
+benchmark = pytest.mark.skipif(
+    not should_run(), reason="set OPENAPI_BUILDER_BENCHMARKS=1 to run the benchmarks"
+)
+"""Marks the benchmarks, which only run when they're enabled."""
+
+
+def load() -> Dict[str, Dict[str, float]]:
+    try:
+        with open(BASELINE_PATH) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def check(case: str, results: Dict[str, float], unit: str = "ms"):
+    """Compares the results of a case with the baseline, and prints them.
+
+    The results are durations in milliseconds, or another quantity of which lower is
+    better (e.g. memory in KiB), given by the unit.
+
+    If the baseline is being updated, the results are stored as the new baseline instead.
+    """
+    with _lock:
+        baseline = load()
+        if should_update():
+            baseline[case] = {key: round(value, 3) for key, value in results.items()}
+            with open(BASELINE_PATH, "w") as f:
+                json.dump(baseline, f, indent=2, sort_keys=True)
+                f.write("\n")
+
+    expected = baseline.get(case, {})
+    print(f"\n{case}:")
+    for key, value in results.items():
+        if key not in expected:
+            print(f"  {key}: {value:.2f}{unit} (no baseline)")
+            continue
+        ratio = value / expected[key] if expected[key] else 1.0
+        print(f"  {key}: {value:.2f}{unit} ({ratio:.2f}x baseline)")
+        if ratio > TOLERANCE:
+            warnings.warn(
+                f"{case} {key}: {value:.2f}{unit} is {ratio:.2f}x the baseline of "
+                f"{expected[key]:.2f}{unit}",
+                BenchmarkRegressionWarning,
+            )
@@ -0,0 +1,73 @@
+"""Runs the benchmarks of the working tree against the package of another revision.
+
+This measures the benchmarks before an optimization, and compares them with the
+baseline of the working tree (see `tests/benchmarks/baseline.py`). The revision is
+checked out in a temporary git worktree, in which the benchmark modules of the working
+tree replace its own. For example, the memory at the revision before an optimization:
+
+`python -m tests.benchmarks.compare <revision> tests/benchmarks/test_memory.py`
+
+Arguments after the revision are passed to pytest. Benchmarks that use features that
+didn't exist at the revision fail, and can be deselected using `-k`.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import List
+
+BENCHMARKS_PATH = os.path.dirname(os.path.abspath(__file__))
+ROOT_PATH = os.path.dirname(os.path.dirname(BENCHMARKS_PATH))
+
+
+def run(revision: str, pytest_args: List[str]) -> int:
+    """Runs pytest with the benchmarks against the revision, and returns its exit code."""
+    with tempfile.TemporaryDirectory() as directory:
+        worktree = os.path.join(directory, revision)
+        subprocess.run(
+            ["git", "worktree", "add", "--detach", worktree, revision],
+            cwd=ROOT_PATH,
+            check=True,
+        )
+        try:
+            shutil.copytree(
+                BENCHMARKS_PATH,
+                os.path.join(worktree, "tests", "benchmarks"),
+                ignore=shutil.ignore_patterns("__pycache__"),
+                dirs_exist_ok=True,
+            )
+            # the package is imported from the worktree, which is the working directory.
+            return subprocess.run(
+                [sys.executable, "-m", "pytest", "-s", "-p", "no:cacheprovider"]
+                + (pytest_args or ["tests/benchmarks"]),
+                cwd=worktree,
+                env={
+                    **os.environ,
+                    "OPENAPI_BUILDER_BENCHMARKS": "1",
+                    "OPENAPI_BUILDER_UPDATE_BASELINE": "",
+                },
+            ).returncode
+        finally:
+            subprocess.run(
+                ["git", "worktree", "remove", "--force", worktree],
+                cwd=ROOT_PATH,
+                check=True,
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("revision", help="The git revision to run the benchmarks at.")
+    parser.add_argument(
+        "pytest_args", nargs=argparse.REMAINDER, help="Arguments passed to pytest."
+    )
+    args = parser.parse_args()
+    sys.exit(run(args.revision, args.pytest_args))
+
+
+if __name__ == "__main__":
+    main()
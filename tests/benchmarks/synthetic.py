@@ -0,0 +1,144 @@
+"""Synthetic Flask applications for benchmarking, with many routes and (nested) schemas.
+
+The schemas are written to a module on disk, like in a real application, since the
+docstrings of halogen schemas are parsed from their source file.
+"""
+import importlib.util
+import sys
+import textwrap
+from typing import List, NamedTuple
+
+from flask import Flask, jsonify
+
+from openapi_builder import (
+    DocumentationOptions,
+    OpenApiDocumentation,
+    add_documentation,
+)
+from tests.factories.builder import DocumentationOptionsFactory
+
+
+class AppSize(NamedTuple):
+    """The size of a synthetic application."""
+
+    routes: int
+    """Number of routes, each with a request and a response schema."""
+
+    schemas: int
+    """Number of (root) schemas, which are shared by the routes."""
+
+    depth: int
+    """Nesting depth of every schema, i.e. the number of schema classes per root schema."""
+
+    fields: int = 10
+    """Number of string fields of every schema class."""
+
+    @property
+    def name(self) -> str:
+        return f"{self.routes}r-{self.schemas}s-{self.depth}d"
+
+
+MARSHMALLOW_SCHEMA = '''
+class {name}(marshmallow.Schema):
+    """Synthetic schema {name}."""
+
+{fields}
+'''
+
+MARSHMALLOW_FIELD = "    {name} = marshmallow.fields.String()\n"
+
+MARSHMALLOW_NESTED = "    {name} = marshmallow.fields.Nested({schema}, many=True)\n"
+
+HALOGEN_SCHEMA = '''
+class {name}(halogen.Schema):
+    """Synthetic schema {name}."""
+
+{fields}
+'''
+
+HALOGEN_FIELD = '''    {name} = halogen.Attr(halogen.types.String())
+    """Synthetic field {name}."""
+'''
+
+HALOGEN_NESTED = '''    {name} = halogen.Attr(halogen.types.List({schema}))
+    """Synthetic nested schema {schema}."""
+'''
+
+TEMPLATES = {
+    "marshmallow": (MARSHMALLOW_SCHEMA, MARSHMALLOW_FIELD, MARSHMALLOW_NESTED),
+    "halogen": (HALOGEN_SCHEMA, HALOGEN_FIELD, HALOGEN_NESTED),
+}
+
+
+def generate_schema_source(kind: str, size: AppSize) -> str:
+    """Generates the source of a module with the schema classes of the given kind."""
+    schema_template, field_template, nested_template = TEMPLATES[kind]
+    parts = [f"import {kind}\n"]
+    for index in range(size.schemas):
+        # the deepest schema first, since every schema nests the schema one level deeper.
+        for level in reversed(range(size.depth)):
+            fields = "".join(
+                field_template.format(name=f"field_{field}")
+                for field in range(size.fields)
+            )
+            if level < size.depth - 1:
+                fields += nested_template.format(
+                    name="children", schema=schema_name(index, level + 1)
+                )
+            parts.append(
+                schema_template.format(name=schema_name(index, level), fields=fields)
+            )
+    return "\n".join(parts)
+
+
+def schema_name(index: int, level: int) -> str:
+    return f"Item{index}Level{level}"
+
+
+def import_schema_module(
+    kind: str, size: AppSize, directory, monkeypatch
+) -> List[type]:
+    """Writes and imports a module with synthetic schemas, and returns the root schemas.
+
+    The module is removed from `sys.modules` again when the monkeypatch is undone.
+    """
+    module_name = f"synthetic_{kind}_{size.name.replace('-', '_')}"
+    path = directory / f"{module_name}.py"
+    path.write_text(textwrap.dedent(generate_schema_source(kind, size)))
+
+    spec = importlib.util.spec_from_file_location(module_name, str(path))
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, module_name, module)
+    spec.loader.exec_module(module)
+    return [getattr(module, schema_name(index, 0)) for index in range(size.schemas)]
+
+
+def add_routes(app: Flask, schemas: List[type], routes: int):
+    """Adds routes with a request and response schema, cycling through the schemas."""
+    for index in range(routes):
+        schema = schemas[index % len(schemas)]
+
+        @add_documentation(response=schema, request_data=schema)
+        def view(**kwargs):
+            return jsonify({})
+
+        app.add_url_rule(
+            f"/resources{index}/<int:resource_id>",
+            endpoint=f"resource{index}",
+            view_func=view,
+            methods=["GET", "PUT"],
+        )
+
+
+def create_documentation(kind: str, size: AppSize, schemas: List[type], **options):
+    """Creates a synthetic application and its (unbuilt) documentation."""
+    app = Flask(__name__)
+    app.config["SERVER_NAME"] = "127.0.0.1"
+    add_routes(app, schemas, size.routes)
+    options = DocumentationOptionsFactory(
+        include_marshmallow_converters=kind == "marshmallow",
+        include_halogen_converters=kind == "halogen",
+        build_strategy=DocumentationOptions.BuildStrategy.LAZY,
+        **options,
+    )
+    return OpenApiDocumentation(app=app, options=options)
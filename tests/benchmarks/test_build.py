@@ -0,0 +1,95 @@
+"""Benchmarks of building and serving the specification of synthetic applications.
+
+Run with `OPENAPI_BUILDER_BENCHMARKS=1 python -m pytest tests/benchmarks -s` to see the
+timings, compared to the baseline (see `tests/benchmarks/baseline.py`).
+"""
+import time
+
+import pytest
+from flask import url_for
+
+from openapi_builder.payload import JSON_ENCODERS, SpecificationPayload, iter_encode
+
+from . import baseline
+from .synthetic import AppSize, create_documentation, import_schema_module
+
+pytestmark = baseline.benchmark
+
+SIZES = [
+    AppSize(routes=50, schemas=10, depth=2),
+    AppSize(routes=200, schemas=40, depth=4),
+]
+
+REPEAT = 3
+"""Number of times every step is measured, of which the fastest time is used."""
+
+REQUESTS = 50
+"""Number of requests for measuring the throughput of the specification endpoint."""
+
+
+def measure(function, *args):
+    """Returns the result and the duration (in milliseconds) of calling the function."""
+    started = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - started) * 1e3
+
+
+def measure_build(kind, size, schemas):
+    """Measures building a fresh specification, and returns its documentation."""
+    results = {}
+    for _ in range(REPEAT):
+        documentation = create_documentation(kind, size, schemas, build_report=True)
+        documentation.build()
+        phases = documentation.get_build_report().phases
+        durations = [
+            (phase, phases[phase].total * 1e3)
+            for phase in ("iterate_endpoints", "get_value")
+        ]
+
+        value = documentation.get_specification()
+        for name in JSON_ENCODERS:
+            _, encode_time = measure(
+                lambda: SpecificationPayload.from_value(
+                    value, documentation.app, encoder=name
+                )
+            )
+            durations.append(
+                ("encode" if name == "json" else f"encode_{name}", encode_time)
+            )
+        _, stream_time = measure(lambda: list(iter_encode(value, documentation.app)))
+        durations.append(("encode_stream", stream_time))
+
+        for key, duration in durations:
+            results[key] = min(results.get(key, duration), duration)
+    return documentation, results
+
+
+def measure_requests(documentation, headers=None):
+    """Returns the mean duration (in milliseconds) of requesting the specification."""
+    with documentation.app.app_context():
+        uri = url_for("openapi_documentation.specification")
+    with documentation.app.test_client() as client:
+        client.get(uri)  # encode the payload
+        started = time.perf_counter()
+        for _ in range(REQUESTS):
+            response = client.get(uri, headers=headers)
+            assert response.status_code in (200, 304)
+        return (time.perf_counter() - started) * 1e3 / REQUESTS
+
+
+@pytest.mark.parametrize("size", SIZES, ids=[size.name for size in SIZES])
+@pytest.mark.parametrize("kind", ["marshmallow", "halogen"])
+def test_build_benchmark(kind, size, tmp_path, monkeypatch):
+    schemas = import_schema_module(kind, size, tmp_path, monkeypatch)
+    documentation, results = measure_build(kind, size, schemas)
+
+    specification = documentation.get_specification()
+    assert len(specification["paths"]) == size.routes
+    assert len(specification["components"]["schemas"]) >= size.schemas * size.depth
+
+    results["request"] = measure_requests(documentation)
+    etag = documentation.get_specification_payload().etag
+    results["request_not_modified"] = measure_requests(
+        documentation, headers={"If-None-Match": f'"{etag}"'}
+    )
+    baseline.check(f"{kind}-{size.name}", results)
@@ -0,0 +1,70 @@
+"""Benchmarks of the converter dispatch, compared to scanning the converters.
+
+Run with `OPENAPI_BUILDER_BENCHMARKS=1 python -m pytest tests/benchmarks -s` to see the
+timings.
+"""
+import timeit
+
+import pytest
+
+from openapi_builder.converters.dispatch import ConverterDispatcher
+from openapi_builder.converters.schema.base import SchemaConverter
+
+from . import baseline
+
+pytestmark = baseline.benchmark
+
+
+def create_converter_classes(amount):
+    """Creates converters for distinct classes, like a large set of custom fields."""
+    converter_classes = []
+    for index in range(amount):
+        converts_class = type(f"Field{index}", (), {})
+        converter_classes.append(
+            type(
+                f"Field{index}Converter",
+                (SchemaConverter,),
+                {"converts_class": converts_class, "convert": lambda self, v, n: None},
+            )
+        )
+    return converter_classes
+
+
+def scan(converters, value):
+    """The lookup of the managers, before using the dispatcher."""
+    return next(converter for converter in converters if converter.matches(value))
+
+
+@pytest.mark.parametrize("amount", [10, 100, 500])
+def test_dispatch_benchmark(amount):
+    converters = [
+        converter_class(manager=None)
+        for converter_class in create_converter_classes(amount)
+    ]
+    dispatcher = ConverterDispatcher(converters, base_class=SchemaConverter)
+    # values matched by the first, middle and last converter.
+    values = [converters[i].converts_class() for i in (0, amount // 2, amount - 1)]
+
+    for value in values:
+        assert dispatcher.find(value) is scan(converters, value)
+
+    scan_time = min(
+        timeit.repeat(
+            lambda: [scan(converters, value) for value in values],
+            number=200,
+            repeat=3,
+        )
+    )
+    dispatch_time = min(
+        timeit.repeat(
+            lambda: [dispatcher.find(value) for value in values],
+            number=200,
+            repeat=3,
+        )
+    )
+    print(
+        f"\n{amount} converters: scan {scan_time * 1e3:.2f}ms, "
+        f"dispatch {dispatch_time * 1e3:.2f}ms ({scan_time / dispatch_time:.1f}x)"
+    )
+    if amount >= 100:
+        assert dispatch_time < scan_time
@@ -0,0 +1,61 @@
+"""Benchmarks of converting marshmallow schema classes, with and without instantiating them.
+
+Run with `OPENAPI_BUILDER_BENCHMARKS=1 python -m pytest tests/benchmarks -s` to see the
+timings.
+"""
+import timeit
+
+import marshmallow
+
+from openapi_builder import OpenApiDocumentation
+from openapi_builder.constants import HIDDEN_ATTR_NAME
+from openapi_builder.documentation import SchemaOptions
+
+from . import baseline
+
+pytestmark = baseline.benchmark
+
+
+def create_schema_classes(amount, fields):
+    """Creates schema classes with many fields, which nest the next class."""
+    schema_classes = []
+    for index in range(amount):
+        attrs = {
+            f"field_{field}": marshmallow.fields.String() for field in range(fields)
+        }
+        if schema_classes:
+            attrs["nested"] = marshmallow.fields.Nested(schema_classes[-1], many=True)
+        schema_classes.append(marshmallow.Schema.from_dict(attrs, name=f"S{index}"))
+    return schema_classes
+
+
+def convert(schema_class):
+    documentation = OpenApiDocumentation()
+    documentation.builder.schema_manager.process(schema_class, name="benchmark")
+    return documentation
+
+
+def test_schema_class_benchmark(monkeypatch):
+    schema_classes = create_schema_classes(amount=20, fields=50)
+    outer = schema_classes[-1]
+
+    declared = convert(outer).specification.components.get_value()
+    declared_time = min(timeit.repeat(lambda: convert(outer), number=5, repeat=3))
+
+    for schema_class in schema_classes:
+        monkeypatch.setattr(
+            schema_class,
+            HIDDEN_ATTR_NAME,
+            SchemaOptions(instantiate=True),
+            raising=False,
+        )
+    instantiated = convert(outer).specification.components.get_value()
+    instantiate_time = min(timeit.repeat(lambda: convert(outer), number=5, repeat=3))
+
+    print(
+        f"\nschema classes: declared fields {declared_time * 1e3:.2f}ms, "
+        f"instantiated {instantiate_time * 1e3:.2f}ms "
+        f"({instantiate_time / declared_time:.1f}x)"
+    )
+    assert declared == instantiated
+    assert declared_time < instantiate_time
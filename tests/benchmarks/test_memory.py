@@ -0,0 +1,89 @@
+"""Benchmarks of the memory used by specification objects, measured with tracemalloc.
+
+Run with `OPENAPI_BUILDER_BENCHMARKS=1 python -m pytest tests/benchmarks -s` to see the
+sizes, compared to the baseline (see `tests/benchmarks/baseline.py`).
+"""
+import gc
+import tracemalloc
+
+from openapi_builder.specification import Reference, Schema
+
+from . import baseline
+from .synthetic import AppSize, create_documentation, import_schema_module
+
+pytestmark = baseline.benchmark
+
+
+def measure(function):
+    """Returns the result of the function, and the memory (in KiB) that it retains."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, size / 1024
+
+
+def create_schemas(amount):
+    """Creates schemas like the converters do: an object schema per 10 string fields."""
+    schemas = []
+    for index in range(amount // 10):
+        properties = {
+            f"field_{field}": Schema(type="string", description=f"Field {field}.")
+            for field in range(9)
+        }
+        properties["nested"] = Reference(
+            ref=f"#/components/schemas/S{index}", required=True
+        )
+        schemas.append(Schema(type="object", properties=properties))
+    return schemas
+
+
+def test_schema_memory_benchmark():
+    schemas, size = measure(lambda: create_schemas(10000))
+    assert len(schemas) == 1000
+    baseline.check("memory-10000-schemas", {"retained": size}, unit="KiB")
+
+
+def test_specification_memory_benchmark(tmp_path, monkeypatch):
+    size = AppSize(routes=200, schemas=40, depth=4)
+    schemas = import_schema_module("marshmallow", size, tmp_path, monkeypatch)
+
+    def build():
+        documentation = create_documentation("marshmallow", size, schemas)
+        with documentation.app.app_context():
+            documentation.builder.iterate_endpoints()
+        return documentation
+
+    documentation, retained = measure(build)
+    assert len(documentation.specification.paths.values) == size.routes
+    baseline.check(
+        f"memory-marshmallow-{size.name}", {"retained": retained}, unit="KiB"
+    )
+
+
+def test_freeze_memory_benchmark(tmp_path, monkeypatch):
+    size = AppSize(routes=200, schemas=40, depth=4)
+    schemas = import_schema_module("marshmallow", size, tmp_path, monkeypatch)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        documentation = create_documentation("marshmallow", size, schemas)
+        documentation.get_specification_payload()
+        gc.collect()
+        built, _ = tracemalloc.get_traced_memory()
+        metrics = documentation.freeze()
+        frozen, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    print(f"\nfreeze: estimated {metrics.reclaimed / 1024:.2f}KiB reclaimed")
+    baseline.check(
+        f"memory-freeze-marshmallow-{size.name}",
+        {"built": built / 1024, "frozen": frozen / 1024},
+        unit="KiB",
+    )
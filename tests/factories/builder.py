@@ -17,6 +17,17 @@ class DocumentationOptionsFactory(factory.Factory):
     strict_mode = DocumentationOptions.StrictMode.SHOW_WARNINGS
     request_content_type = "application/json"
     response_content_type = "application/json"
+    specification_cache_control = "no-cache"
+    specification_encodings = ["br", "gzip"]
+    build_strategy = DocumentationOptions.BuildStrategy.BEFORE_FIRST_REQUEST
+    specification_streaming = False
+    schema_cache_size = None
+    docstring_cache_path = None
+    specification_cache_path = None
+    build_report = False
+    build_report_endpoint = False
+    freeze_after_build = False
+    specification_encoder = "json"
 
 
 class OpenApiDocumentationFactory(factory.Factory):
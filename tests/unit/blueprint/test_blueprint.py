@@ -1,8 +1,26 @@
+import dataclasses
+import datetime
+import decimal
+import gc
+import gzip
+import hashlib
+import json
+import uuid
 from http import HTTPStatus
 
+import flask
 import pytest
 from werkzeug.routing import BuildError
 
+from openapi_builder import OpenApiDocumentation
+from openapi_builder.payload import (
+    JSON_ENCODERS,
+    SpecificationPayload,
+    encode_json,
+    iter_encode,
+)
+from openapi_builder.specification import Schema
+
 
 @pytest.mark.usefixtures("open_api_documentation")
 def test_get(http):
@@ -43,3 +61,288 @@ def test_specification(http):
     assert "openapi" in data
     assert "paths" in data
     assert "servers" in data
+
+
+@pytest.mark.usefixtures("open_api_documentation")
+def test_specification_etag(http):
+    uri = http.make_uri("openapi_documentation.specification")
+    response = http.get(uri)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    response = http.get(uri, headers={"If-None-Match": response.headers["ETag"]})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.get_data() == b""
+
+    response = http.get(uri, headers={"If-None-Match": '"something-else"'})
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.parametrize(
+    "documentation_options__specification_cache_control", ["public, max-age=60"]
+)
+@pytest.mark.usefixtures("open_api_documentation")
+def test_specification_cache_control(http):
+    response = http.get(http.make_uri("openapi_documentation.specification"))
+
+    assert response.headers["Cache-Control"] == "public, max-age=60"
+
+
+def test_specification_payload_cache(http, open_api_documentation):
+    uri = http.make_uri("openapi_documentation.specification")
+    etag = http.get(uri).headers["ETag"]
+    payload = open_api_documentation.get_specification_payload()
+    assert open_api_documentation.get_specification_payload() is payload
+
+    open_api_documentation.specification.info.description = "Changed"
+    assert open_api_documentation.get_specification_payload() is not payload
+
+    response = http.get(uri)
+    assert response.headers["ETag"] != etag
+    assert response.parsed_data["info"]["description"] == "Changed"
+
+
+@pytest.mark.parametrize(
+    "encoding, decompress",
+    [
+        ("gzip", gzip.decompress),
+        ("br", lambda data: pytest.importorskip("brotli").decompress(data)),
+    ],
+)
+def test_specification_payload_encodings(open_api_documentation, encoding, decompress):
+    payload = open_api_documentation.get_specification_payload()
+    assert decompress(payload.encodings[encoding]) == payload.data
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br"])
+def test_specification_content_encoding(http, open_api_documentation, encoding):
+    if encoding == "br":
+        pytest.importorskip("brotli")
+    uri = http.make_uri("openapi_documentation.specification")
+    identity = http.get(uri)
+    assert identity.content_encoding is None
+    assert "Accept-Encoding" in identity.vary
+
+    response = http.get(uri, headers={"Accept-Encoding": f"{encoding}, identity"})
+    assert response.status_code == HTTPStatus.OK
+    assert response.content_encoding == encoding
+    assert "Accept-Encoding" in response.vary
+    assert response.headers["ETag"] != identity.headers["ETag"]
+
+    payload = open_api_documentation.get_specification_payload()
+    assert response.get_data() == payload.encodings[encoding]
+
+    response = http.get(
+        uri,
+        headers={
+            "Accept-Encoding": encoding,
+            "If-None-Match": response.headers["ETag"],
+        },
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.parametrize("documentation_options__specification_encodings", [[]])
+def test_specification_without_encodings(http, open_api_documentation):
+    response = http.get(
+        http.make_uri("openapi_documentation.specification"),
+        headers={"Accept-Encoding": "gzip"},
+    )
+
+    assert response.content_encoding is None
+    assert "Accept-Encoding" not in response.vary
+    assert open_api_documentation.get_specification_payload().encodings == {}
+
+
+def test_specification_preload(http, open_api_documentation):
+    payload = open_api_documentation.preload(gc_freeze=False)
+    assert open_api_documentation.is_ready
+    assert open_api_documentation.get_specification_payload() is payload
+
+    response = http.get(http.make_uri("openapi_documentation.specification"))
+    assert response.get_data() == payload.data
+
+
+def test_specification_preload_to_file(http, open_api_documentation, tmp_path):
+    path = tmp_path / "openapi.json"
+    expected = open_api_documentation.get_specification_payload()
+    payload = open_api_documentation.preload(path=str(path), gc_freeze=False)
+
+    assert not isinstance(payload.data, bytes)
+    assert path.read_bytes() == expected.data
+    assert (tmp_path / "openapi.json.gzip").read_bytes() == expected.encodings["gzip"]
+    assert payload.etag == expected.etag
+    assert open_api_documentation.get_specification_payload() is payload
+
+    uri = http.make_uri("openapi_documentation.specification")
+    response = http.get(uri)
+    assert response.get_data() == expected.data
+    assert response.content_length == len(expected.data)
+
+    response = http.get(uri, headers={"Accept-Encoding": "gzip"})
+    assert gzip.decompress(response.get_data()) == expected.data
+
+    response = http.get(uri, headers={"If-None-Match": response.headers["ETag"]})
+    assert response.status_code == HTTPStatus.OK
+    response = http.get(uri, headers={"If-None-Match": f'"{expected.etag}"'})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_specification_preload_replaces_file(open_api_documentation, tmp_path):
+    path = tmp_path / "openapi.json"
+    previous = SpecificationPayload.from_value({"old": "x" * 1024}).map_to_files(
+        str(path)
+    )
+    payload = open_api_documentation.preload(path=str(path), gc_freeze=False)
+
+    # the file is replaced instead of being rewritten, so existing maps are unaffected.
+    assert json.loads(previous.data[:]) == {"old": "x" * 1024}
+    assert path.read_bytes() == payload.data[:]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_specification_preload_gc_freeze(open_api_documentation, monkeypatch):
+    calls = []
+    monkeypatch.setattr(gc, "freeze", lambda: calls.append(True), raising=False)
+    open_api_documentation.preload()
+
+    assert calls == [True]
+
+
+@pytest.mark.parametrize("documentation_options__specification_streaming", [True])
+def test_specification_streaming(http, open_api_documentation):
+    open_api_documentation.specification.info.description = "Ünïcode"
+    payload = open_api_documentation.get_specification_payload()
+
+    uri = http.make_uri("openapi_documentation.specification")
+    response = http.get(uri, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == HTTPStatus.OK
+    assert response.is_streamed
+    assert response.content_encoding is None
+    assert response.get_data() == payload.data
+    assert response.headers["ETag"] == f'"{payload.etag}"'
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    response = http.get(uri, headers={"If-None-Match": response.headers["ETag"]})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.parametrize("documentation_options__specification_streaming", [True])
+def test_specification_streaming_etag(http, open_api_documentation):
+    uri = http.make_uri("openapi_documentation.specification")
+    # the entity tag is computed while streaming, without encoding the payload.
+    data = http.get(uri).get_data()
+    response = http.get(uri)
+    assert response.get_data() == data
+    assert response.headers["ETag"] == f'"{hashlib.sha256(data).hexdigest()}"'
+    assert open_api_documentation.get_snapshot()._payload is None
+
+    response = http.get(uri, headers={"If-None-Match": response.headers["ETag"]})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_specification_stream(open_api_documentation):
+    payload = open_api_documentation.get_specification_payload()
+    etag, chunks = open_api_documentation.get_specification_stream()
+    assert etag == payload.etag
+    assert b"".join(chunks) == payload.data
+
+    chunks = list(
+        iter_encode(open_api_documentation.get_specification(), chunk_size=64)
+    )
+    assert len(chunks) > 1
+    assert b"".join(chunks) == payload.data
+
+    open_api_documentation.specification.info.description = "Changed"
+    etag, chunks = open_api_documentation.get_specification_stream()
+    assert etag is None  # not streamed completely yet
+    data = b"".join(chunks)
+    etag, chunks = open_api_documentation.get_specification_stream()
+    assert etag == hashlib.sha256(data).hexdigest()
+    assert b"".join(chunks) == data
+
+
+@pytest.mark.parametrize("documentation_options__build_report", [True])
+@pytest.mark.parametrize("documentation_options__build_report_endpoint", [True])
+@pytest.mark.usefixtures("open_api_documentation", "get_with_decorator")
+def test_build_report_endpoint(http):
+    response = http.get(http.make_uri("openapi_documentation.build_report"))
+    # the build report is available after the specification was built.
+    assert response.status_code == HTTPStatus.OK
+    assert response.parsed_data["phases"]["process_rule"]["calls"] == 1
+    assert response.parsed_data["slowest_endpoints"][0]["name"] == "/get_with_decorator"
+
+
+@pytest.mark.parametrize(
+    "build_report, build_report_endpoint", [(True, False), (False, True)]
+)
+def test_build_report_endpoint_disabled(
+    http, open_api_documentation, build_report, build_report_endpoint
+):
+    open_api_documentation.options = dataclasses.replace(
+        open_api_documentation.options,
+        build_report=build_report,
+        build_report_endpoint=build_report_endpoint,
+    )
+    response = http.get(http.make_uri("openapi_documentation.build_report"))
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.parametrize("documentation_options__specification_encoder", JSON_ENCODERS)
+def test_specification_encoder(open_api_documentation):
+    open_api_documentation.specification.info.description = "Ünïcode </script>"
+    open_api_documentation.specification.components.schemas["Values"] = Schema(
+        default=datetime.datetime(2022, 1, 2, 3, 4, 5),
+        example={
+            "date": datetime.date(2022, 1, 2),
+            "decimal": decimal.Decimal("1.50"),
+            "uuid": uuid.UUID(int=1),
+            "integers": {2: "two", 1: "one"},
+        },
+    )
+
+    payload = open_api_documentation.get_specification_payload()
+    expected = encode_json(open_api_documentation.get_specification())
+    # the same output as the standard library, apart from escaping.
+    assert json.loads(payload.data) == json.loads(expected)
+    assert json.loads(payload.data)["info"]["description"] == "Ünïcode </script>"
+
+
+def test_specification_encoder_default(app, open_api_documentation):
+    open_api_documentation.specification.info.description = "Ünïcode"
+    payload = open_api_documentation.get_specification_payload()
+    with app.app_context():
+        expected = flask.json.dumps(
+            open_api_documentation.get_specification(), separators=(",", ":")
+        )
+    assert payload.data == expected.encode("utf-8")
+
+
+@pytest.mark.parametrize("specification_encoder", sorted(set(JSON_ENCODERS) - {"json"}))
+def test_specification_encoder_streaming(open_api_documentation, specification_encoder):
+    options = dataclasses.replace(
+        open_api_documentation.options,
+        specification_encoder=specification_encoder,
+        specification_streaming=True,
+    )
+    with pytest.raises(ValueError):
+        OpenApiDocumentation(options=options)
+
+
+def test_specification_encoder_function(open_api_documentation):
+    options = dataclasses.replace(
+        open_api_documentation.options,
+        specification_encoder=lambda value, app: b"{}",
+    )
+    documentation = OpenApiDocumentation(options=options)
+    assert documentation.get_specification_payload().data == b"{}"
+
+
+def test_specification_encoder_unknown(open_api_documentation):
+    options = dataclasses.replace(
+        open_api_documentation.options, specification_encoder="unknown"
+    )
+    with pytest.raises(ValueError):
+        OpenApiDocumentation(options=options)
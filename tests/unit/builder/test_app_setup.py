@@ -1,6 +1,15 @@
+import threading
+import time
+
 import pytest
+from flask import jsonify
+from werkzeug.routing import Rule
 
-from openapi_builder import OpenApiDocumentation
+from openapi_builder import (
+    DocumentationOptions,
+    OpenApiDocumentation,
+    add_documentation,
+)
 
 
 def test_configuring_flask_app_option_1(app):
@@ -23,3 +32,132 @@ def test_configuring_flask_app_no_flask(app):
     documentation = OpenApiDocumentation()
     with pytest.raises(TypeError):
         documentation.init_app(app=app)
+
+
+def build_strategy(strategy):
+    return DocumentationOptions(build_strategy=strategy)
+
+
+@pytest.mark.usefixtures("get_with_decorator")
+def test_build_strategy_before_first_request(app, http):
+    documentation = OpenApiDocumentation(app=app)
+    assert not documentation.is_ready
+
+    http.get("/get_with_decorator")
+    assert documentation.is_ready
+    assert documentation.build_metrics.duration >= 0
+    assert "/get_with_decorator" in documentation.specification.paths.values
+
+
+@pytest.mark.usefixtures("get_with_decorator")
+def test_build_strategy_eager(app):
+    documentation = OpenApiDocumentation(
+        app=app, options=build_strategy(DocumentationOptions.BuildStrategy.EAGER)
+    )
+    assert documentation.is_ready
+    assert "/get_with_decorator" in documentation.specification.paths.values
+
+    metrics = documentation.build_metrics
+    assert metrics.strategy == DocumentationOptions.BuildStrategy.EAGER
+    assert metrics.thread_name == threading.current_thread().name
+    assert metrics.duration >= 0
+
+
+@pytest.mark.usefixtures("get_with_decorator")
+def test_build_strategy_background(app, http):
+    documentation = OpenApiDocumentation(
+        app=app, options=build_strategy(DocumentationOptions.BuildStrategy.BACKGROUND)
+    )
+    response = http.get(http.make_uri("openapi_documentation.specification"))
+    assert documentation.is_ready
+    assert "/get_with_decorator" in response.parsed_data["paths"]
+    assert documentation.build_metrics.thread_name == "openapi-builder"
+
+
+def test_build_strategy_eager_routes_registered_afterwards(app, http):
+    documentation = OpenApiDocumentation(
+        app=app, options=build_strategy(DocumentationOptions.BuildStrategy.EAGER)
+    )
+
+    @app.route("/birds")
+    @add_documentation(description="Get the birds.")
+    def get_birds():
+        return jsonify([])
+
+    response = http.get(http.make_uri("openapi_documentation.specification"))
+    assert "/birds" in response.parsed_data["paths"]
+    assert documentation.build_metrics.strategy == (
+        DocumentationOptions.BuildStrategy.EAGER
+    )
+
+
+def test_build_rule_being_registered(app):
+    """Test that a rule of which the view function isn't registered yet (e.g. while
+    building in the background) is skipped, and added once it's registered."""
+    documentation = OpenApiDocumentation(
+        app=app, options=build_strategy(DocumentationOptions.BuildStrategy.LAZY)
+    )
+
+    @add_documentation(description="Get the birds.")
+    def get_birds():
+        return jsonify([])
+
+    app.url_map.add(Rule("/birds", endpoint="get_birds", methods=["GET"]))
+    assert "/birds" not in documentation.get_specification()["paths"]
+
+    app.view_functions["get_birds"] = get_birds
+    assert "/birds" in documentation.get_specification()["paths"]
+
+
+@pytest.mark.usefixtures("get_with_decorator")
+def test_build_strategy_lazy(app, http):
+    documentation = OpenApiDocumentation(
+        app=app, options=build_strategy(DocumentationOptions.BuildStrategy.LAZY)
+    )
+    http.get("/get_with_decorator")
+    assert not documentation.is_ready
+
+    response = http.get(http.make_uri("openapi_documentation.specification"))
+    assert documentation.is_ready
+    assert "/get_with_decorator" in response.parsed_data["paths"]
+    assert documentation.build_metrics.duration >= 0
+
+
+def test_unknown_build_strategy(app):
+    with pytest.raises(ValueError):
+        OpenApiDocumentation(app=app, options=build_strategy(None))
+
+
+@pytest.mark.usefixtures("get_with_decorator")
+def test_build_single_flight(app, monkeypatch):
+    documentation = OpenApiDocumentation(
+        app=app, options=build_strategy(DocumentationOptions.BuildStrategy.LAZY)
+    )
+    calls = []
+    iterate_endpoints = documentation.builder.iterate_endpoints
+
+    def slow_iterate_endpoints():
+        calls.append(threading.current_thread().name)
+        time.sleep(0.01)  # give other threads the chance to start building as well.
+        iterate_endpoints()
+
+    monkeypatch.setattr(
+        documentation.builder, "iterate_endpoints", slow_iterate_endpoints
+    )
+    barrier = threading.Barrier(16)
+    results = []
+
+    def get_specification():
+        barrier.wait()
+        results.append(documentation.get_specification())
+
+    threads = [threading.Thread(target=get_specification) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 16
+    assert all(result is results[0] for result in results)
+    assert list(results[0]["paths"]) == ["/get_with_decorator"]
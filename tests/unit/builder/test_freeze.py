@@ -0,0 +1,85 @@
+import gc
+import json
+import weakref
+
+import halogen
+import pytest
+from flask import jsonify
+
+from openapi_builder import add_documentation
+from openapi_builder.parsers.docstring import DocStringParser
+
+
+class Bird(halogen.Schema):
+    """Bird class."""
+
+    name = halogen.Attr(halogen.types.String())
+    """Name of this bird."""
+
+
+@pytest.fixture
+def documentation_options__include_halogen_converters():
+    return True
+
+
+@pytest.fixture
+def bird_route(app):
+    @app.route("/birds")
+    @add_documentation(response=Bird)
+    def get_birds():
+        return jsonify([])
+
+
+@pytest.mark.usefixtures("bird_route")
+def test_freeze(http, open_api_documentation):
+    specification = open_api_documentation.get_specification()
+    payload = open_api_documentation.get_specification_payload()
+    builder = weakref.ref(open_api_documentation.builder)
+    parsers = DocStringParser.from_class.cache_info().currsize
+    assert parsers > 0
+
+    metrics = open_api_documentation.freeze()
+    gc.collect()
+    assert open_api_documentation.is_frozen
+    assert open_api_documentation.freeze() is metrics
+    assert open_api_documentation.freeze_metrics is metrics
+    assert builder() is None
+    assert metrics.reclaimed > 0
+    assert metrics.payload_size == len(payload.data) + sum(
+        len(data) for data in payload.encodings.values()
+    )
+    # the parsers are shared by the process, so they're kept.
+    assert DocStringParser.from_class.cache_info().currsize == parsers
+
+    assert open_api_documentation.get_specification_payload() is payload
+    assert open_api_documentation.get_specification() == specification
+    assert open_api_documentation.get_build_report() is None
+    with pytest.raises(RuntimeError):
+        open_api_documentation.update()
+
+    response = http.get(http.make_uri("openapi_documentation.specification"))
+    assert response.get_data() == payload.data
+
+
+@pytest.mark.usefixtures("bird_route")
+def test_freeze_keep_value(open_api_documentation):
+    specification = open_api_documentation.get_specification()
+    open_api_documentation.freeze(keep_value=True)
+    assert open_api_documentation.get_specification() is specification
+
+
+@pytest.mark.parametrize("documentation_options__freeze_after_build", [True])
+@pytest.mark.parametrize("documentation_options__build_report", [True])
+@pytest.mark.parametrize("documentation_options__specification_streaming", [True])
+@pytest.mark.usefixtures("bird_route")
+def test_freeze_after_build(http, open_api_documentation):
+    assert not open_api_documentation.is_frozen
+    response = http.get(http.make_uri("openapi_documentation.specification"))
+    assert open_api_documentation.is_frozen
+    assert "Bird" in json.loads(response.get_data())["components"]["schemas"]
+
+    etag, chunks = open_api_documentation.get_specification_stream()
+    assert etag == open_api_documentation.get_specification_payload().etag
+    assert b"".join(chunks) == response.get_data()
+    # the report of the build is kept.
+    assert open_api_documentation.get_build_report().phases["process_rule"].calls == 1
@@ -1,7 +1,11 @@
+import threading
+
+import halogen
 import pytest
+from flask import jsonify
 
-from openapi_builder import DocumentationOptions
-from openapi_builder.documentation import Documentation
+from openapi_builder import DocumentationOptions, add_documentation
+from openapi_builder.documentation import Documentation, DocumentationConfigManager
 from openapi_builder.exceptions import MissingConfigContext, MissingConverter
 from openapi_builder.specification import Schema
 
@@ -48,3 +52,129 @@ def test_unknown_documentation(open_api_documentation):
 def test_missing_context(open_api_documentation):
     with pytest.raises(MissingConfigContext):
         open_api_documentation.builder.config_manager.ensure_valid_config()
+
+
+def test_context_reset_after_error(open_api_documentation):
+    config_manager = open_api_documentation.builder.config_manager
+    with pytest.raises(RuntimeError):
+        with config_manager.use_documentation_context(Documentation()):
+            raise RuntimeError()
+
+    assert config_manager.config is None
+
+
+def test_context_per_thread(open_api_documentation):
+    config_manager = open_api_documentation.builder.config_manager
+    documentation = Documentation()
+    result = []
+
+    with config_manager.use_documentation_context(documentation):
+        thread = threading.Thread(target=lambda: result.append(config_manager.config))
+        thread.start()
+        thread.join()
+        assert config_manager.config is documentation
+
+    assert result == [None]
+
+
+def test_context_per_manager(open_api_documentation):
+    config_manager = open_api_documentation.builder.config_manager
+    other_config_manager = DocumentationConfigManager()
+    documentation, other_documentation = Documentation(), Documentation()
+
+    with config_manager.use_documentation_context(documentation):
+        with other_config_manager.use_documentation_context(other_documentation):
+            assert config_manager.config is documentation
+            assert other_config_manager.config is other_documentation
+        assert other_config_manager.config is None
+    assert config_manager.config is None
+
+
+@pytest.mark.parametrize("documentation_options__include_halogen_converters", [True])
+@pytest.mark.parametrize("documentation_options__include_head_response", [True])
+@pytest.mark.parametrize("documentation_options__include_options_response", [True])
+@pytest.mark.parametrize("documentation_options__build_report", [True])
+def test_conversion_per_configuration(app, open_api_documentation):
+    class Bird(halogen.Schema):
+        name = halogen.Attr(halogen.types.String())
+
+    class Query(halogen.Schema):
+        name = halogen.Attr(halogen.types.String(), required=False)
+
+    @add_documentation(response=Bird, request_query=Query, request_data=Bird)
+    def birds():
+        return jsonify([])
+
+    app.add_url_rule("/birds", view_func=birds, methods=["GET", "POST"])
+    app.add_url_rule("/v2/birds", view_func=birds, methods=["GET", "POST"])
+    open_api_documentation.get_specification()
+
+    # every value is converted once, although there are 2 rules with 4 methods each.
+    phases = open_api_documentation.get_build_report().phases
+    assert phases["process_rule"].calls == 2
+    assert phases["schema_manager.process"].calls == 5  # Bird, Query and 3 attributes
+    assert open_api_documentation.builder.conversions == {}
+
+    specification = open_api_documentation.get_specification()
+    for path in ("/birds", "/v2/birds"):
+        operations = specification["paths"][path]
+        assert set(operations) == {"get", "head", "options", "post"}
+        assert operations["get"] == operations["post"]
+        assert operations["get"]["parameters"][0]["name"] == "name"
+        assert operations["get"]["requestBody"]["content"]
+
+
+@pytest.mark.parametrize("documentation_options__include_halogen_converters", [True])
+def test_conversion_copied_per_operation(app, open_api_documentation):
+    class Bird(halogen.Schema):
+        name = halogen.Attr(halogen.types.String())
+
+    @add_documentation(response=halogen.types.List(Bird))
+    def birds():
+        return jsonify([])
+
+    app.add_url_rule("/birds", view_func=birds, methods=["GET", "POST"])
+    app.add_url_rule("/v2/birds", view_func=birds)
+    open_api_documentation.get_specification()
+
+    def get_schema(path, method):
+        path_item = open_api_documentation.specification.paths.values[path]
+        response = getattr(path_item, method).responses.values["200"]
+        return next(iter(response.content.values())).schema
+
+    schema = get_schema("/birds", "get")
+    assert schema is not get_schema("/birds", "post")
+    schema.description = "The birds."
+    schema.items.description = "A bird."
+
+    # modifying the schema of one operation doesn't modify the other operations.
+    specification = open_api_documentation.get_specification()
+    for path, method in [("/birds", "post"), ("/v2/birds", "get")]:
+        other = specification["paths"][path][method]["responses"]["200"]["content"]
+        assert next(iter(other.values()))["schema"] == {
+            "type": "array",
+            "items": {"$ref": "#/components/schemas/Bird"},
+        }
+
+
+class Feather(halogen.Schema):
+    color = halogen.Attr(halogen.types.String())
+
+
+@pytest.mark.parametrize("documentation_options__include_halogen_converters", [True])
+@pytest.mark.parametrize("documentation_options__build_report", [True])
+def test_conversion_per_configuration_separate(app, open_api_documentation):
+    @app.route("/first")
+    @add_documentation(response=halogen.types.List(Feather))
+    def first():
+        return jsonify([])
+
+    @app.route("/second")
+    @add_documentation(response=halogen.types.List(Feather))
+    def second():
+        return jsonify([])
+
+    open_api_documentation.get_specification()
+    # separate configurations are converted separately, apart from the cached Feather.
+    phases = open_api_documentation.get_build_report().phases
+    assert phases["schema_manager.process"].calls == 5  # 2 lists, 2 feathers, color
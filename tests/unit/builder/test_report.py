@@ -0,0 +1,126 @@
+import halogen
+import marshmallow
+import pytest
+from flask import jsonify
+
+from openapi_builder import add_documentation
+from openapi_builder.converters.schema.marshmallow import DeclaredSchema
+from openapi_builder.report import BuildRecorder, get_item_name
+
+
+class Bird(halogen.Schema):
+    """Bird class."""
+
+    name = halogen.Attr(halogen.types.String())
+    """Name of this bird."""
+
+
+@pytest.fixture
+def documentation_options__include_halogen_converters():
+    return True
+
+
+@pytest.fixture
+def documentation_options__build_report():
+    return True
+
+
+@pytest.fixture
+def bird_routes(app):
+    @app.route("/birds")
+    @add_documentation(response=Bird)
+    def get_birds():
+        return jsonify([])
+
+    @app.route("/birds/<int:bird_id>")
+    @add_documentation(response=Bird)
+    def get_bird(bird_id):
+        return jsonify({})
+
+
+@pytest.mark.usefixtures("bird_routes")
+def test_build_report(open_api_documentation):
+    open_api_documentation.get_specification()
+    report = open_api_documentation.get_build_report()
+
+    assert report.phases["iterate_endpoints"].calls == 1
+    assert report.phases["process_rule"].calls == 2
+    assert report.phases["parameter_manager.process"].calls == 1
+    assert report.phases["docstring_parser"].calls == 1  # converted once
+    assert report.phases["get_value"].calls == 1
+    assert (
+        report.phases["iterate_endpoints"].total >= report.phases["process_rule"].total
+    )
+
+    assert {item.name for item in report.slowest_endpoints} == {
+        "/birds",
+        "/birds/<int:bird_id>",
+    }
+    durations = [item.duration for item in report.slowest_endpoints]
+    assert durations == sorted(durations, reverse=True)
+    assert "Bird" in {item.name for item in report.slowest_schemas}
+
+    data = report.to_dict()
+    assert data["phases"]["process_rule"]["calls"] == 2
+    assert data["slowest_endpoints"][0]["name"] in ("/birds", "/birds/<int:bird_id>")
+
+
+@pytest.mark.parametrize("documentation_options__build_report", [False])
+@pytest.mark.usefixtures("bird_routes")
+def test_build_report_disabled(open_api_documentation):
+    open_api_documentation.get_specification()
+    assert open_api_documentation.get_build_report() is None
+
+
+def test_build_recorder_keeps_slowest():
+    recorder = BuildRecorder(slowest_amount=2)
+    for index, duration in enumerate([0.3, 0.1, 0.4, 0.2]):
+        recorder.add("phase", duration, item=f"item{index}", category="endpoints")
+
+    report = recorder.report()
+    assert report.phases["phase"].calls == 4
+    assert report.phases["phase"].total == pytest.approx(1.0)
+    assert [item.name for item in report.slowest_endpoints] == ["item2", "item0"]
+
+    recorder.clear()
+    assert recorder.report().phases == {}
+
+
+def test_build_recorder_disabled():
+    recorder = BuildRecorder(enabled=False)
+    with recorder.phase("phase"):
+        pass
+    assert recorder.report().phases == {}
+
+
+class NestSchema(marshmallow.Schema):
+    name = marshmallow.fields.String()
+    birds = marshmallow.fields.Nested("NestSchema", many=True)
+
+
+@pytest.mark.parametrize(
+    "documentation_options__include_marshmallow_converters", [True]
+)
+def test_build_report_schema_names(app, open_api_documentation):
+    @app.route("/nests")
+    @add_documentation(response=NestSchema(many=True))
+    def get_nests():
+        return jsonify([])
+
+    open_api_documentation.get_specification()
+    names = {
+        item.name for item in open_api_documentation.get_build_report().slowest_schemas
+    }
+    assert "NestSchema" in names
+    assert "NestSchema.name (String)" in names
+    assert not [name for name in names if name.endswith(" instance")]
+
+
+def test_get_item_name():
+    assert get_item_name("/birds") == "/birds"
+    assert get_item_name(Bird) == "Bird"
+    assert get_item_name(DeclaredSchema(NestSchema)) == "NestSchema"
+    assert get_item_name(halogen.types.String(), path="Bird.name") == (
+        "Bird.name (String)"
+    )
+    assert get_item_name(halogen.types.String()) == "String instance"
@@ -0,0 +1,130 @@
+import copy
+import gc
+import weakref
+
+import pytest
+from flask import jsonify
+
+from openapi_builder import add_documentation
+from openapi_builder.specification import (
+    Example,
+    Link,
+    MediaType,
+    Response,
+    Schema,
+    SecurityRequirement,
+    ServerVariable,
+)
+
+
+@pytest.fixture
+def item_route(app):
+    @app.route("/items")
+    @add_documentation(description="Get the items.")
+    def get_items():
+        return jsonify([])
+
+
+@pytest.mark.usefixtures("item_route")
+def test_snapshot(open_api_documentation):
+    snapshot = open_api_documentation.get_snapshot()
+    assert open_api_documentation.get_snapshot() is snapshot
+    assert open_api_documentation.get_specification() is snapshot.value
+    payload = open_api_documentation.get_specification_payload()
+    assert snapshot.get_payload() is payload
+
+    open_api_documentation.specification.info.description = "Changed"
+    new_snapshot = open_api_documentation.get_snapshot()
+    assert new_snapshot is not snapshot
+    assert new_snapshot.value["info"]["description"] == "Changed"
+    # the previous snapshot is left as it was, for the readers that are still using it.
+    assert "description" not in snapshot.value["info"]
+    assert snapshot.get_payload() is payload
+    assert new_snapshot.value["paths"] is snapshot.value["paths"]
+
+    reference = weakref.ref(snapshot)
+    del snapshot
+    gc.collect()
+    assert reference() is None
+
+
+@pytest.mark.usefixtures("item_route")
+def test_snapshot_while_updating(app, open_api_documentation):
+    snapshot = open_api_documentation.get_snapshot()
+
+    # another thread that is updating the specification holds the build lock.
+    with open_api_documentation._build_lock:
+        open_api_documentation.specification.info.description = "Changed"
+
+        @app.route("/items/count")
+        @add_documentation()
+        def count_items():
+            return jsonify(0)
+
+        assert open_api_documentation.get_snapshot() is snapshot
+
+    new_snapshot = open_api_documentation.get_snapshot()
+    assert new_snapshot.value["info"]["description"] == "Changed"
+    assert "/items/count" in new_snapshot.value["paths"]
+
+
+@pytest.mark.usefixtures("item_route")
+def test_snapshot_containers_modified_in_place(open_api_documentation):
+    specification = open_api_documentation.specification
+    snapshot = open_api_documentation.get_snapshot()
+    operation = specification.paths.values["/items"].get
+    operation.tags.append("items")
+    specification.servers[0].variables["version"] = ServerVariable(
+        default="v1", enum=["v1"]
+    )
+    specification.security.append(SecurityRequirement(values={"oauth": ["read"]}))
+    new_snapshot = open_api_documentation.get_snapshot()
+
+    operation.tags.append("more")
+    specification.servers[0].variables["version"].enum.append("v2")
+    specification.security[0].values["oauth"].append("write")
+    specification.security[0].values["basic"] = []
+
+    # the published snapshots don't share the containers of the specification.
+    assert "tags" not in snapshot.value["paths"]["/items"]["get"]
+    assert new_snapshot.value["paths"]["/items"]["get"]["tags"] == ["items"]
+    assert new_snapshot.value["servers"][0]["variables"]["version"]["enum"] == ["v1"]
+    assert new_snapshot.value["security"] == [{"oauth": ["read"]}]
+    # nor the lists of the security requirements, which are tracked as well.
+    assert open_api_documentation.get_snapshot().value["security"] == [
+        {"oauth": ["read", "write"], "basic": []}
+    ]
+
+
+@pytest.mark.usefixtures("item_route")
+def test_snapshot_values_modified_in_place(open_api_documentation):
+    open_api_documentation.get_snapshot()  # builds the specification
+    specification = open_api_documentation.specification
+    schema = Schema(type=["string", "null"], default={"x": 0}, example={"a": [1]})
+    schema.options = {"x-extra": {"b": [2]}}
+    specification.components.schemas["Item"] = schema
+    specification.components.examples["Item"] = Example(value={"c": [3]})
+    link = Link(parameters={"id": {"d": 4}}, request_body={"e": [5]})
+    specification.components.schemas["Item"].enum.append({"f": 6})
+    media_type = MediaType(example={"g": [7]})
+    specification.paths.values["/items"].get.responses.values["200"] = Response(
+        description="", content={"application/json": media_type}, links={"l": link}
+    )
+    snapshot = open_api_documentation.get_snapshot()
+    expected = copy.deepcopy(snapshot.value)
+
+    schema.type.append("integer")
+    schema.default["x"] = 1
+    schema.example["a"].append(2)
+    schema.options["x-extra"]["b"].append(3)
+    schema.enum[0]["f"] = 7
+    specification.components.examples["Item"].value["c"].append(4)
+    link.parameters["id"]["d"] = 5
+    link.request_body["e"].append(6)
+    media_type.example["g"].append(8)
+
+    # the published snapshot doesn't share the values of the specification.
+    assert snapshot.value == expected
+    value = open_api_documentation.get_snapshot().value
+    assert value["components"]["schemas"]["Item"]["default"] == {"x": 1}
+    assert value["components"]["schemas"]["Item"]["x-extra"] == {"b": [2, 3]}
@@ -0,0 +1,285 @@
+import importlib
+import os
+import sys
+import textwrap
+
+import halogen
+import pytest
+from flask import Flask, jsonify
+
+from openapi_builder import (
+    DocumentationOptions,
+    OpenApiDocumentation,
+    add_documentation,
+)
+from openapi_builder.builder import OpenAPIBuilder
+from openapi_builder import fingerprint
+from openapi_builder.fingerprint import compute_fingerprint
+from openapi_builder.specification import Info, OpenAPI
+
+SCHEMA_MODULE = """
+import marshmallow
+
+
+class ItemSchema(marshmallow.Schema):
+    {field} = marshmallow.fields.String()
+"""
+
+NESTING_MODULE = """
+import marshmallow
+
+
+class NestingSchema(marshmallow.Schema):
+    item = marshmallow.fields.Nested("specification_cache_schemas.ItemSchema")
+"""
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache")
+
+
+@pytest.fixture
+def iterations(monkeypatch):
+    """Counts how many times the endpoints are iterated (i.e. how often the
+    specification is built instead of loaded)."""
+    calls = []
+    iterate_endpoints = OpenAPIBuilder.iterate_endpoints
+
+    def wrapper(self):
+        calls.append(self)
+        return iterate_endpoints(self)
+
+    monkeypatch.setattr(OpenAPIBuilder, "iterate_endpoints", wrapper)
+    return calls
+
+
+@pytest.fixture
+def schema_module(tmp_path, monkeypatch):
+    """Writes (and imports) a module with a marshmallow schema."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    path = tmp_path / "specification_cache_schemas.py"
+
+    def write(field="name"):
+        path.write_text(textwrap.dedent(SCHEMA_MODULE).format(field=field))
+        sys.modules.pop("specification_cache_schemas", None)
+        return importlib.import_module("specification_cache_schemas")
+
+    yield write
+    sys.modules.pop("specification_cache_schemas", None)
+
+
+def create_documentation(
+    cache_path, schema=None, extra_route=False, title="API", **options
+):
+    """Creates a new application (e.g. after a restart), and builds its specification."""
+    app = Flask(__name__)
+
+    @app.route("/items")
+    @add_documentation(response=schema, description="Get the items.")
+    def get_items():
+        return jsonify([])
+
+    if extra_route:
+
+        @app.route("/items/<int:item_id>")
+        @add_documentation()
+        def get_item(item_id):
+            return jsonify({})
+
+    documentation = OpenApiDocumentation(
+        app=app,
+        title=title,
+        options=DocumentationOptions(
+            specification_cache_path=cache_path,
+            build_strategy=DocumentationOptions.BuildStrategy.EAGER,
+            **options,
+        ),
+    )
+    return documentation
+
+
+def test_specification_cache_hit(cache_path, iterations, schema_module):
+    module = schema_module()
+    first = create_documentation(cache_path, schema=module.ItemSchema)
+    assert not first.build_metrics.from_cache
+    assert len(os.listdir(cache_path)) == 1
+
+    second = create_documentation(cache_path, schema=module.ItemSchema)
+    assert second.build_metrics.from_cache
+    assert len(iterations) == 1
+    assert second.get_specification() == first.get_specification()
+    assert "ItemSchema" in second.get_specification()["components"]["schemas"]
+
+
+def test_specification_cache_loaded_specification_is_tracked(cache_path, iterations):
+    create_documentation(cache_path)
+    documentation = create_documentation(cache_path)
+    assert documentation.build_metrics.from_cache
+
+    # the loaded specification still invalidates its cached value after a change.
+    documentation.get_specification()
+    documentation.specification.info.title = "Changed"
+    assert documentation.get_specification()["info"]["title"] == "Changed"
+
+
+def test_specification_cache_loaded_specification_update(cache_path, iterations):
+    create_documentation(cache_path)
+    documentation = create_documentation(cache_path)
+    items = documentation.get_specification()["paths"]["/items"]
+
+    @documentation.app.route("/items/count")
+    @add_documentation(description="Count the items.")
+    def count_items():
+        return jsonify(0)
+
+    # only the rule that was added after loading the specification is processed.
+    assert documentation.update()
+    assert len(iterations) == 2
+    paths = documentation.get_specification()["paths"]
+    assert set(paths) == {"/items", "/items/count"}
+    assert paths["/items"] is items
+
+
+def create_halogen_schema(field):
+    """Returns a new halogen schema class, named `ItemSchema`."""
+    return type(
+        "ItemSchema", (halogen.Schema,), {field: halogen.Attr(halogen.types.String())}
+    )
+
+
+def test_specification_cache_loaded_specification_component_names(cache_path):
+    """Test that a halogen schema that is converted after loading the specification
+    doesn't replace a cached component with the same name."""
+    options = dict(
+        include_halogen_converters=True, include_marshmallow_converters=False
+    )
+    create_documentation(cache_path, schema=create_halogen_schema("name"), **options)
+    documentation = create_documentation(
+        cache_path, schema=create_halogen_schema("name"), **options
+    )
+    assert documentation.build_metrics.from_cache
+
+    @documentation.app.route("/other-items")
+    @add_documentation(response=create_halogen_schema("title"))
+    def get_other_items():
+        return jsonify([])
+
+    assert documentation.update()
+    schemas = documentation.get_specification()["components"]["schemas"]
+    assert list(schemas["ItemSchema"]["properties"]) == ["name"]
+    assert list(schemas["ItemSchema2"]["properties"]) == ["title"]
+
+
+def test_specification_cache_without_path(iterations):
+    documentation = create_documentation(cache_path=None)
+    assert not documentation.build_metrics.from_cache
+    create_documentation(cache_path=None)
+    assert len(iterations) == 2
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {"extra_route": True},
+        {"title": "Another API"},
+        {"include_head_response": False},
+        {"server_url": "/api"},
+    ],
+)
+def test_specification_cache_invalidated(cache_path, iterations, changes):
+    """Test that changing the routes, the initial specification or the options
+    invalidates the cached specification."""
+    create_documentation(cache_path)
+    documentation = create_documentation(cache_path, **changes)
+    assert not documentation.build_metrics.from_cache
+    assert len(iterations) == 2
+    assert len(os.listdir(cache_path)) == 2
+
+
+def test_specification_cache_invalidated_by_documentation(cache_path, schema_module):
+    module = schema_module()
+    create_documentation(cache_path)
+    documentation = create_documentation(cache_path, schema=module.ItemSchema)
+    assert not documentation.build_metrics.from_cache
+
+
+def test_specification_cache_invalidated_by_schema_source(cache_path, schema_module):
+    create_documentation(cache_path, schema=schema_module(field="name").ItemSchema)
+
+    module = schema_module(field="title")
+    documentation = create_documentation(cache_path, schema=module.ItemSchema)
+    assert not documentation.build_metrics.from_cache
+    properties = documentation.get_specification()["components"]["schemas"][
+        "ItemSchema"
+    ]["properties"]
+    assert list(properties) == ["title"]
+
+
+def test_specification_cache_invalidated_by_nested_schema_source(
+    cache_path, schema_module, tmp_path
+):
+    """Test that a schema that is only referenced by name (so it's only found while
+    building) invalidates the cached specification as well."""
+    (tmp_path / "specification_cache_nesting.py").write_text(NESTING_MODULE)
+    from specification_cache_nesting import NestingSchema
+
+    try:
+        schema_module(field="name")
+        create_documentation(cache_path, schema=NestingSchema)
+        assert create_documentation(
+            cache_path, schema=NestingSchema
+        ).build_metrics.from_cache
+
+        schema_module(field="title")
+        documentation = create_documentation(cache_path, schema=NestingSchema)
+        assert not documentation.build_metrics.from_cache
+        properties = documentation.get_specification()["components"]["schemas"][
+            "ItemSchema"
+        ]["properties"]
+        assert list(properties) == ["title"]
+    finally:
+        sys.modules.pop("specification_cache_nesting", None)
+
+
+def test_specification_cache_invalidated_by_library_version(
+    cache_path, iterations, monkeypatch
+):
+    create_documentation(cache_path)
+    versions = fingerprint.get_library_versions()
+    monkeypatch.setattr(
+        fingerprint,
+        "get_library_versions",
+        lambda: {**versions, "marshmallow": "0.0.0"},
+    )
+    documentation = create_documentation(cache_path)
+    assert not documentation.build_metrics.from_cache
+    assert len(iterations) == 2
+
+
+def test_compute_fingerprint_is_stable():
+    documentation = create_documentation(None, extra_route=True)
+    other = create_documentation(None, extra_route=True)
+    with documentation.app.app_context():
+        # the fingerprint is computed before building, from an unbuilt specification.
+        documentation.specification = other.specification = OpenAPI(
+            info=Info(title="API", version="1.0.0")
+        )
+        assert compute_fingerprint(documentation) == compute_fingerprint(other)
+
+
+def test_specification_cache_invalid_file(cache_path, iterations):
+    create_documentation(cache_path)
+    (entry_name,) = os.listdir(cache_path)
+    entry_path = os.path.join(cache_path, entry_name)
+
+    with open(entry_path, "wb") as f:
+        f.write(b"invalid")
+
+    with pytest.warns(UserWarning, match="Ignoring invalid cached specification"):
+        documentation = create_documentation(cache_path)
+    assert not documentation.build_metrics.from_cache
+    assert len(iterations) == 2
+
+    # the invalid file is replaced.
+    assert create_documentation(cache_path).build_metrics.from_cache
@@ -0,0 +1,117 @@
+import halogen
+import pytest
+from flask import Blueprint, jsonify
+
+from openapi_builder import (
+    DocumentationOptions,
+    add_documentation,
+    set_resource_options,
+)
+from openapi_builder.exceptions import MissingConverter
+from openapi_builder.specification import Tag
+
+
+class Bird(halogen.Schema):
+    name = halogen.Attr(halogen.types.String())
+
+
+class Nest(halogen.Schema):
+    bird = halogen.Attr(Bird)
+
+
+@pytest.fixture
+def documentation_options__include_halogen_converters():
+    return True
+
+
+@pytest.fixture
+def documentation_options__build_report():
+    return True
+
+
+@pytest.fixture
+def bird_route(app):
+    @app.route("/birds")
+    @add_documentation(response=Bird)
+    def get_birds():
+        return jsonify([])
+
+
+@pytest.mark.usefixtures("bird_route")
+def test_update_new_rules(app, open_api_documentation):
+    specification = open_api_documentation.get_specification()
+    assert not open_api_documentation.update()
+
+    @app.route("/nests")
+    @add_documentation(response=Nest)
+    def get_nests():
+        return jsonify([])
+
+    updated = open_api_documentation.get_specification()
+    assert set(updated["paths"]) == {"/birds", "/nests"}
+    assert set(updated["components"]["schemas"]) == {"Bird", "Nest"}
+    # only the new rule is processed, and the existing paths aren't serialized again.
+    report = open_api_documentation.get_build_report()
+    assert report.phases["process_rule"].calls == 2
+    assert report.phases["iterate_endpoints"].calls == 2
+    assert updated["paths"]["/birds"] is specification["paths"]["/birds"]
+    assert updated["info"] is specification["info"]
+
+
+@pytest.mark.usefixtures("bird_route")
+def test_update_registered_blueprint(app, open_api_documentation):
+    open_api_documentation.get_specification()
+
+    blueprint = Blueprint(name="nests", import_name=__name__, url_prefix="/nests")
+
+    @blueprint.route("/")
+    @add_documentation(response=Nest)
+    def get_nests():
+        return jsonify([])
+
+    set_resource_options(blueprint, tags=[Tag(name="nests")])
+    app.register_blueprint(blueprint)
+    assert open_api_documentation.update()
+    assert not open_api_documentation.update()
+
+    specification = open_api_documentation.get_specification()
+    assert specification["tags"] == [{"name": "nests"}]
+    assert specification["paths"]["/nests/"]["get"]["tags"] == ["nests"]
+    assert "Nest" in specification["components"]["schemas"]
+
+
+@pytest.mark.parametrize(
+    "documentation_options__strict_mode",
+    [DocumentationOptions.StrictMode.FAIL_ON_ERROR],
+)
+@pytest.mark.usefixtures("bird_route")
+def test_update_retries_failed_rule(app, open_api_documentation, caplog):
+    specification = open_api_documentation.get_specification()
+
+    @app.route("/bad")
+    @add_documentation(response=object())
+    def get_bad():
+        return jsonify([])
+
+    # the last published snapshot is served, and the error is logged once.
+    assert open_api_documentation.get_specification() is specification
+    assert open_api_documentation.get_specification() is specification
+    assert len(caplog.records) == 1
+    assert caplog.records[0].exc_info[0] is MissingConverter
+    assert not open_api_documentation.builder.has_new_rules()
+
+    # the failed rule isn't marked as processed, so an explicit update raises again.
+    with pytest.raises(MissingConverter):
+        open_api_documentation.update()
+    assert open_api_documentation.get_build_report().phases["process_rule"].calls == 3
+
+
+@pytest.mark.usefixtures("bird_route")
+def test_has_new_rules_rebuilt_url_map(app, open_api_documentation):
+    open_api_documentation.get_specification()
+    assert not open_api_documentation.builder.has_new_rules()
+
+    # the same number of rules, but another last rule.
+    rules = app.url_map._rules
+    rules[-1] = rules[-1].empty()
+    assert open_api_documentation.builder.has_new_rules()
@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+from openapi_builder.cache import BoundedCache
+
+
+def test_unbounded():
+    cache = BoundedCache()
+    for index in range(100):
+        cache.set(index, str(index))
+
+    assert len(cache) == 100
+    assert cache.get(0) == "0"
+    assert cache.get(100) is None
+    assert cache.get(100, "default") == "default"
+
+
+def test_least_recently_used_evicted():
+    cache = BoundedCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+
+def test_clear():
+    cache = BoundedCache()
+    cache.set("a", 1)
+    cache.clear()
+
+    assert len(cache) == 0
+
+
+def test_invalid_maxsize():
+    with pytest.raises(ValueError):
+        BoundedCache(maxsize=0)
+
+
+def test_thread_safe():
+    cache = BoundedCache(maxsize=10)
+
+    def fill(offset):
+        for index in range(1000):
+            cache.set(offset + index, index)
+            cache.get(offset + index - 1)
+
+    threads = [threading.Thread(target=fill, args=(i * 1000,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(cache) == 10
@@ -1,7 +1,12 @@
+import inspect
+import threading
+import time
+
 import pytest
 from flask import jsonify
 
 from openapi_builder import add_documentation
+from openapi_builder.parsers.docstring import DocStringParser
 from .cat import Cat
 from .dog import Dog
 from .fish import Fish
@@ -161,3 +166,63 @@ def test_python(http, app, open_api_documentation):
             "description": "Whether this Python is dangerous.",
         },
     }
+
+
+def test_class_result_only_processes_class_and_bases():
+    parser = DocStringParser(filename=inspect.getfile(Python))
+    result = parser.get_class_result("Snake")
+
+    assert result["Snake"] == "Snake schema."
+    assert result["Snake.name"] == "The name of the animal."
+    assert set(parser._class_results) == {"Animal", "Snake"}
+    assert parser.get_class_result("Snake") is result
+    assert parser.result == {}
+
+
+def test_class_result_equals_parse():
+    parser = DocStringParser(filename=inspect.getfile(Python))
+    parser.parse()
+
+    lazy_parser = DocStringParser(filename=inspect.getfile(Python))
+    for class_name in ("Animal", "Snake", "Python"):
+        for key, docstring in lazy_parser.get_class_result(class_name).items():
+            assert parser.result[key] == docstring
+
+
+def test_parse_once(monkeypatch):
+    parser = DocStringParser(filename=inspect.getfile(Dog))
+    parser.parse()
+    result = dict(parser.result)
+
+    monkeypatch.setattr(parser, "get_class_result", pytest.fail)
+    parser.parse()
+    assert parser.result == result
+
+
+def test_class_result_concurrently(monkeypatch):
+    """Test that a parser that is shared by several builds processes a class once."""
+    parser = DocStringParser(filename=inspect.getfile(Python))
+    process_class_definition, processed = parser._process_class_definition, []
+
+    def slow_process_class_definition(node):
+        processed.append(node.name)
+        time.sleep(0.05)  # give the other thread time to request the class as well
+        return process_class_definition(node=node)
+
+    monkeypatch.setattr(
+        parser, "_process_class_definition", slow_process_class_definition
+    )
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(parser.get_class_result("Snake"))
+        )
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert processed == ["Snake", "Animal"]
+    assert results[0] is results[1]
+    assert results[0]["Snake.name"] == "The name of the animal."
@@ -0,0 +1,160 @@
+import importlib
+import os
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+
+from openapi_builder.parsers.cache import DocStringCache
+from openapi_builder.parsers.docstring import DocStringParser
+
+from .dog import Dog
+
+BASE_MODULE = '''
+import halogen
+
+
+class Base(halogen.Schema):
+    """Base schema."""
+
+    name = halogen.Attr(halogen.types.String())
+    """{description}"""
+'''
+
+CHILD_MODULE = '''
+import halogen
+
+from docstring_cache_base import Base
+
+
+class Child(Base):
+    """Child schema."""
+
+    age = halogen.Attr(halogen.types.Int())
+    """The age."""
+'''
+
+
+@pytest.fixture
+def documentation_options__docstring_cache_path(tmp_path):
+    return str(tmp_path / "cache")
+
+
+@pytest.fixture
+def modules(tmp_path, monkeypatch):
+    """Writes a module with a schema, which inherits from a schema in another module."""
+    write_module(tmp_path / "docstring_cache_base.py", BASE_MODULE, "The name.")
+    write_module(tmp_path / "docstring_cache_child.py", CHILD_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for name in ("docstring_cache_base", "docstring_cache_child"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+        importlib.import_module(name)
+    yield tmp_path
+    for name in ("docstring_cache_base", "docstring_cache_child"):
+        sys.modules.pop(name, None)
+
+
+def write_module(path, source, description=""):
+    path.write_text(textwrap.dedent(source).format(description=description))
+
+
+def parse(path, cache):
+    DocStringParser.from_file.cache_clear()  # parsers cache their module
+    parser = DocStringParser.from_file(str(path))
+    parser.parse(cache=cache)
+    return parser
+
+
+def test_cache_hit(modules, tmp_path):
+    cache = DocStringCache(str(tmp_path / "cache"))
+    parser = parse(modules / "docstring_cache_child.py", cache)
+    assert parser.result["Child.name"] == "The name."
+    # the child, base and halogen modules are parsed.
+    assert (cache.hits, cache.misses) == (0, 3)
+
+    parser = parse(modules / "docstring_cache_child.py", DocStringCache(cache.path))
+    assert parser.result["Child.name"] == "The name."
+    assert parser.result["Child.age"] == "The age."
+    assert parser.import_names["Base"] == "docstring_cache_base.Base"
+    assert parser.dependencies[0] == str(modules / "docstring_cache_base.py")
+    assert parser._module is None  # the file is not parsed
+
+
+def test_cache_modification_time_changed(modules, tmp_path):
+    cache = DocStringCache(str(tmp_path / "cache"))
+    parse(modules / "docstring_cache_child.py", cache)
+
+    # the content is unchanged, so the hash is equal.
+    os.utime(modules / "docstring_cache_child.py", ns=(0, 0))
+    cache = DocStringCache(cache.path)
+    parse(modules / "docstring_cache_child.py", cache)
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_cache_dependency_changed(modules, tmp_path):
+    cache = DocStringCache(str(tmp_path / "cache"))
+    parse(modules / "docstring_cache_child.py", cache)
+
+    write_module(modules / "docstring_cache_base.py", BASE_MODULE, "Changed name.")
+    cache = DocStringCache(cache.path)
+    parser = parse(modules / "docstring_cache_child.py", cache)
+    assert parser.result["Child.name"] == "Changed name."
+    # the halogen module didn't change.
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_cache_corrupt_entry(modules, tmp_path):
+    cache = DocStringCache(str(tmp_path / "cache"))
+    parse(modules / "docstring_cache_base.py", cache)
+    for entry in (tmp_path / "cache").iterdir():
+        entry.write_bytes(b"corrupt")
+
+    cache = DocStringCache(cache.path)
+    parser = parse(modules / "docstring_cache_base.py", cache)
+    assert parser.result["Base.name"] == "The name."
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_cache_parse_concurrently(modules, tmp_path, monkeypatch):
+    """Test that a parser that is shared by several builds is parsed once."""
+    cache = DocStringCache(str(tmp_path / "cache"))
+    load, stored = cache.load, []
+
+    def slow_load(parser):
+        time.sleep(0.05)  # give the other thread time to start parsing as well
+        return load(parser)
+
+    monkeypatch.setattr(cache, "load", slow_load)
+    monkeypatch.setattr(cache, "store", stored.append)
+
+    parser = DocStringParser(filename=str(modules / "docstring_cache_base.py"))
+    threads = [
+        threading.Thread(target=parser.parse, kwargs={"cache": cache}) for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert stored.count(parser) == 1
+    assert parser.result["Base.name"] == "The name."
+
+
+@pytest.fixture
+def documentation_options__include_halogen_converters():
+    return True
+
+
+def test_documentation_cache(open_api_documentation, tmp_path):
+    cache = open_api_documentation.builder.docstring_cache
+    assert cache.path == str(tmp_path / "cache")
+
+    DocStringParser.from_class.cache_clear()
+    DocStringParser.from_file.cache_clear()
+    open_api_documentation.builder.schema_manager.process(Dog, name="dog")
+    assert cache.misses == 2  # the dog and halogen modules
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+
+    schema = open_api_documentation.builder.schemas["Dog"]
+    assert schema.properties["name"].description == "The name of the dog."
@@ -4,7 +4,11 @@ import halogen
 import pytest
 from flask import jsonify
 
-from openapi_builder import add_documentation, set_schema_options
+from openapi_builder import (
+    OpenApiDocumentation,
+    add_documentation,
+    set_schema_options,
+)
 from openapi_builder.documentation import DiscriminatorOptions
 
 
@@ -59,13 +63,94 @@ def test_get_halogen_string_schema(http, app, open_api_documentation):
 
     schema = configuration["components"]["schemas"]["Schema"]
     assert schema["type"] == "object"
+    # the second schema has the same class name, so it gets a unique component name.
     assert schema["discriminator"]["mapping"] == {
-        "second": "#/components/schemas/Schema"
+        "second": "#/components/schemas/Schema2"
     }
     assert schema["discriminator"]["propertyName"] == "discriminator_options"
-    assert schema["oneOf"] == [{"$ref": "#/components/schemas/Schema"}]
+    assert schema["oneOf"] == [{"$ref": "#/components/schemas/Schema2"}]
 
-    [all_of] = schema["allOf"]
+    second_schema = configuration["components"]["schemas"]["Schema2"]
+    assert second_schema["properties"] == {"field": {"type": "integer"}}
+    [all_of] = second_schema["allOf"]
     assert all_of["type"] == "object"
     assert all_of["properties"] == {"field": {"type": "string"}}
     assert all_of["required"] == ["field"]
+
+
+class Tank(halogen.Schema):
+    """Tank class."""
+
+    fish = halogen.Attr(Fish)
+    """The fish in the tank."""
+
+    spare_fish = halogen.Attr(Fish, required=False)
+    """Another fish."""
+
+    tank = halogen.Attr(halogen.types.Nullable(halogen.types.String()), required=False)
+
+
+def test_schema_cache_per_builder(open_api_documentation):
+    other_documentation = OpenApiDocumentation(options=open_api_documentation.options)
+    for documentation in (open_api_documentation, other_documentation):
+        documentation.builder.schema_manager.process(Tank, name="tank")
+
+    assert len(open_api_documentation.builder.schema_cache) == 2
+    assert len(other_documentation.builder.schema_cache) == 2
+    schema = open_api_documentation.builder.schemas["Fish"]
+    assert other_documentation.builder.schemas["Fish"] is not schema
+
+
+def test_schema_cache_new_references(open_api_documentation):
+    schema_manager = open_api_documentation.builder.schema_manager
+    schema_manager.process(Tank, name="tank")
+
+    properties = open_api_documentation.builder.schemas["Tank"].properties
+    assert properties["fish"] is not properties["spare_fish"]
+    assert properties["fish"].required is True
+    assert properties["spare_fish"].required is False
+    assert schema_manager.process(Tank, name="tank").ref == "#/components/schemas/Tank"
+
+
+@pytest.mark.parametrize("documentation_options__schema_cache_size", [1])
+def test_schema_cache_bounded(open_api_documentation):
+    schema_manager = open_api_documentation.builder.schema_manager
+    schema_manager.process(Tank, name="tank")
+    assert len(open_api_documentation.builder.schema_cache) == 1
+
+    fish = open_api_documentation.builder.schemas["Fish"]
+    reference = schema_manager.process(Fish, name="fish")
+    assert reference.ref == "#/components/schemas/Fish"
+    assert open_api_documentation.builder.schemas["Fish"] is not fish
+    assert set(open_api_documentation.builder.schemas) == {"Fish", "Tank"}
+
+
+class Aquarium(halogen.Schema):
+    """Aquarium class."""
+
+    name = halogen.Attr(halogen.types.String())
+    """Name of this aquarium."""
+
+    owner = halogen.Attr(halogen.types.String())
+
+
+def test_shared_schemas_copied_on_write(open_api_documentation):
+    schema_manager = open_api_documentation.builder.schema_manager
+    schema_manager.process(Aquarium, name="aquarium")
+    schema_manager.process(Tank, name="tank")
+
+    properties = open_api_documentation.builder.schemas["Aquarium"].properties
+    assert properties["owner"].is_shared
+    assert properties["owner"].description is None
+    assert not properties["name"].is_shared
+    assert properties["name"].description == "Name of this aquarium."
+    assert properties["owner"] is schema_manager.process(
+        halogen.types.String(), name="string", shared=True
+    )
+    # converters that modify the result get a private copy by default.
+    schema = schema_manager.process(halogen.types.String(), name="string")
+    assert not schema.is_shared
+    schema.description = "Name of the owner."
+    assert properties["owner"].description is None
+    # the nullable attribute is modified as well, so it's a private copy.
+    assert open_api_documentation.builder.schemas["Tank"].properties["tank"].nullable
@@ -1,9 +1,12 @@
 from http import HTTPStatus
 
 import marshmallow
+import pytest
 from flask import jsonify
 
-from openapi_builder import add_documentation
+from openapi_builder import add_documentation, set_schema_options
+from openapi_builder.constants import HIDDEN_ATTR_NAME
+from openapi_builder.converters.schema.marshmallow import DeclaredSchema
 
 
 def test_get_marshmallow_string_schema(http, app, open_api_documentation):
@@ -32,3 +35,148 @@ def test_get_marshmallow_string_schema(http, app, open_api_documentation):
     schema = configuration["components"]["schemas"]["GeneratedSchema"]
     assert schema["type"] == "object"
     assert schema["properties"] == {"field": {"type": "string"}}
+
+
+class UserSchema(marshmallow.Schema):
+    name = marshmallow.fields.String()
+    email = marshmallow.fields.Email()
+
+
+class GroupSchema(marshmallow.Schema):
+    owner = marshmallow.fields.Nested(UserSchema, required=True)
+    admin = marshmallow.fields.Nested(UserSchema)
+    members = marshmallow.fields.Nested(UserSchema, many=True)
+    names = marshmallow.fields.Nested(UserSchema, only=("name",))
+    parent = marshmallow.fields.Nested("self")
+    children = marshmallow.fields.Nested("GroupSchema", many=True, exclude=("parent",))
+
+
+def test_nested_schema_converted_once(open_api_documentation, monkeypatch):
+    schema_manager = open_api_documentation.builder.schema_manager
+    converter = schema_manager.dispatcher.find(DeclaredSchema(UserSchema))
+    calls = []
+    convert_component = converter.convert_component
+
+    def counting_convert_component(key, value):
+        calls.append(key)
+        return convert_component(key, value)
+
+    monkeypatch.setattr(converter, "convert_component", counting_convert_component)
+    schema_manager.process(GroupSchema(), name="group")
+
+    assert sorted(key[0].__name__ for key in calls) == [
+        "GroupSchema",
+        "GroupSchema",
+        "UserSchema",
+        "UserSchema",
+    ]
+    assert set(open_api_documentation.builder.schemas) == {
+        "GroupSchema",
+        "GroupSchema-exclude-parent",
+        "UserSchema",
+        "UserSchema-only-name",
+    }
+
+
+def test_nested_schema_references(open_api_documentation):
+    schema_manager = open_api_documentation.builder.schema_manager
+    schema_manager.process(GroupSchema(), name="group")
+
+    schemas = open_api_documentation.specification.components.get_value()["schemas"]
+    properties = schemas["GroupSchema"]["properties"]
+    user = {"$ref": "#/components/schemas/UserSchema"}
+    assert properties["owner"] == user
+    assert properties["admin"] == user
+    assert properties["members"] == {"type": "array", "items": user}
+    assert properties["names"] == {"$ref": "#/components/schemas/UserSchema-only-name"}
+    assert properties["parent"] == {"$ref": "#/components/schemas/GroupSchema"}
+    assert properties["children"] == {
+        "type": "array",
+        "items": {"$ref": "#/components/schemas/GroupSchema-exclude-parent"},
+    }
+    assert schemas["GroupSchema"]["required"] == ["owner"]
+
+    assert list(schemas["UserSchema"]["properties"]) == ["name", "email"]
+    assert list(schemas["UserSchema-only-name"]["properties"]) == ["name"]
+    assert "parent" not in schemas["GroupSchema-exclude-parent"]["properties"]
+
+
+class HeavySchema(marshmallow.Schema):
+    instances = 0
+
+    field = marshmallow.fields.String(required=True)
+    excluded = marshmallow.fields.String()
+    nested = marshmallow.fields.Nested("HeavySchema", exclude=("nested",))
+
+    class Meta:
+        exclude = ("excluded",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        HeavySchema.instances += 1
+
+
+@pytest.fixture
+def heavy_schema(monkeypatch):
+    monkeypatch.setattr(HeavySchema, "instances", 0)
+    return HeavySchema
+
+
+def test_schema_class_not_instantiated(open_api_documentation, heavy_schema):
+    schema_manager = open_api_documentation.builder.schema_manager
+    reference = schema_manager.process(heavy_schema, name="heavy")
+    assert reference.ref == "#/components/schemas/HeavySchema"
+    assert heavy_schema.instances == 0
+
+    schemas = open_api_documentation.specification.components.get_value()["schemas"]
+    assert schemas["HeavySchema"]["properties"] == {
+        "field": {"type": "string"},
+        "nested": {"$ref": "#/components/schemas/HeavySchema-exclude-nested"},
+    }
+    assert list(schemas["HeavySchema-exclude-nested"]["properties"]) == ["field"]
+
+
+def test_schema_class_instantiate_option(
+    open_api_documentation, heavy_schema, monkeypatch
+):
+    monkeypatch.setattr(heavy_schema, HIDDEN_ATTR_NAME, None, raising=False)
+    set_schema_options(heavy_schema, instantiate=True)
+    schema_manager = open_api_documentation.builder.schema_manager
+    schema_manager.process(heavy_schema, name="heavy")
+    assert heavy_schema.instances == 2
+
+    schemas = open_api_documentation.specification.components.get_value()["schemas"]
+    assert list(schemas["HeavySchema"]["properties"]) == ["field", "nested"]
+
+
+class InferredSchema(marshmallow.Schema):
+    name = marshmallow.fields.String()
+
+    class Meta:
+        additional = ("age",)
+
+
+def test_schema_class_inferred_fields(open_api_documentation):
+    schema_manager = open_api_documentation.builder.schema_manager
+    schema_manager.process(InferredSchema, name="inferred")
+    schema_manager.process(InferredSchema(only=("age",)), name="inferred")
+
+    schemas = open_api_documentation.specification.components.get_value()["schemas"]
+    assert schemas["InferredSchema"]["properties"] == {
+        "name": {"type": "string"},
+        "age": {},
+    }
+    assert schemas["InferredSchema-only-age"]["properties"] == {"age": {}}
+
+
+@pytest.mark.parametrize(
+    "declared_schema",
+    [
+        DeclaredSchema(UserSchema, only=frozenset({"unknown"})),
+        DeclaredSchema(UserSchema, exclude=frozenset({"unknown"})),
+    ],
+)
+def test_schema_class_unknown_fields(open_api_documentation, declared_schema):
+    schema_manager = open_api_documentation.builder.schema_manager
+    with pytest.raises(ValueError):
+        schema_manager.process(declared_schema, name="user")
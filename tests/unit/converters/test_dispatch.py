@@ -0,0 +1,109 @@
+import pytest
+
+from openapi_builder.converters.dispatch import ConverterDispatcher, matches_by_type
+from openapi_builder.converters.schema.base import SchemaConverter
+from openapi_builder.specification import Schema
+
+
+class IntConverter(SchemaConverter):
+    converts_class = int
+
+    def convert(self, value, name) -> Schema:
+        return Schema(type="integer")
+
+
+class NumberConverter(SchemaConverter):
+    converts_class = (int, float)
+
+    def convert(self, value, name) -> Schema:
+        return Schema(type="number")
+
+
+class PositiveConverter(SchemaConverter):
+    converts_class = int
+
+    def matches(self, value) -> bool:
+        return super().matches(value) and value > 0
+
+    def convert(self, value, name) -> Schema:
+        return Schema(type="integer", minimum=1)
+
+
+class NoneConverter(SchemaConverter):
+    matches_by_type = True
+
+    def matches(self, value) -> bool:
+        return value is None
+
+    def convert(self, value, name) -> Schema:
+        return Schema(nullable=True)
+
+
+@pytest.fixture
+def dispatcher():
+    return ConverterDispatcher([], base_class=SchemaConverter)
+
+
+def register(dispatcher, *converter_classes):
+    for converter_class in converter_classes:
+        dispatcher.converters.append(converter_class(manager=None))
+    dispatcher.clear()
+    return dispatcher.converters
+
+
+@pytest.mark.parametrize(
+    "converter_class, expected",
+    [
+        (IntConverter, True),
+        (PositiveConverter, False),
+        (NoneConverter, True),
+    ],
+)
+def test_matches_by_type(converter_class, expected):
+    assert matches_by_type(converter_class(manager=None), SchemaConverter) is expected
+
+
+def test_registration_order(dispatcher):
+    number, integer = register(dispatcher, NumberConverter, IntConverter)
+
+    assert dispatcher.find(1) is number
+    assert dispatcher.find(1.5) is number
+    assert dispatcher.find("abc") is None
+
+
+def test_value_dependent_converter(dispatcher):
+    positive, integer, none = register(
+        dispatcher, PositiveConverter, IntConverter, NoneConverter
+    )
+
+    assert dispatcher.find(1) is positive
+    assert dispatcher.find(-1) is integer
+    assert dispatcher.find(2) is positive
+    assert dispatcher.find(None) is none
+
+
+def test_find_is_cached_per_type(dispatcher, monkeypatch):
+    integer, number = register(dispatcher, IntConverter, NumberConverter)
+    assert dispatcher.find(1) is integer
+
+    monkeypatch.setattr(IntConverter, "matches", pytest.fail)
+    assert dispatcher.find(2) is integer
+
+
+def test_clear(dispatcher):
+    (number,) = register(dispatcher, NumberConverter)
+    assert dispatcher.find(1) is number
+
+    dispatcher.converters.insert(0, IntConverter(manager=None))
+    assert dispatcher.find(1) is number
+
+    dispatcher.clear()
+    assert dispatcher.find(1) is dispatcher.converters[0]
+
+
+def test_manager_register_clears_dispatcher(open_api_documentation):
+    schema_manager = open_api_documentation.builder.schema_manager
+    assert schema_manager.dispatcher.find(1) is None
+
+    schema_manager.register(IntConverter)
+    assert isinstance(schema_manager.dispatcher.find(1), IntConverter)
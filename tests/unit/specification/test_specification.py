@@ -1,7 +1,26 @@
+import copy
+import dataclasses
+import pickle
+
 import pytest
 from pytest_factoryboy import LazyFixture
 
-from openapi_builder.specification import Reference, Response
+from openapi_builder.specification import (
+    Components,
+    Info,
+    MediaType,
+    OpenAPI,
+    Operation,
+    PathItem,
+    Paths,
+    Reference,
+    Response,
+    Responses,
+    Schema,
+    SecurityRequirement,
+    TrackedDict,
+    intern_schema,
+)
 
 
 def test_openapi(open_api, info):
@@ -715,3 +734,279 @@ def test_oauth_flow_full(oauth_flow):
 
 def test_security_requirement(security_requirement):
     assert security_requirement.get_value() == {}
+
+
+@pytest.fixture
+def cached_open_api():
+    def path_item(schema_name):
+        reference = Reference.from_schema(schema_name, Schema())
+        response = Response(
+            description="", content={"application/json": MediaType(schema=reference)}
+        )
+        return PathItem(get=Operation(responses=Responses(values={"200": response})))
+
+    return OpenAPI(
+        info=Info(title="title", version="1.0.0"),
+        paths=Paths(values={"/a": path_item("A"), "/b": path_item("B")}),
+        components=Components(
+            schemas={
+                "A": Schema(type="object", properties={"a": Schema(type="string")}),
+                "B": Schema(type="object", properties={"b": Schema(type="string")}),
+            }
+        ),
+    )
+
+
+def test_get_value_is_cached(cached_open_api):
+    value = cached_open_api.get_value()
+    assert cached_open_api.get_value() is value
+
+
+def test_get_value_after_attribute_change(cached_open_api, monkeypatch):
+    value = cached_open_api.get_value()
+    a_value, b_value = value["components"]["schemas"].values()
+    paths_value = value["paths"]
+
+    calls = []
+    get_value = Schema._get_value
+    monkeypatch.setattr(
+        Schema, "_get_value", lambda self: calls.append(self) or get_value(self)
+    )
+    schema_a = cached_open_api.components.schemas["A"]
+    schema_a.properties["a"].description = "Changed"
+
+    value = cached_open_api.get_value()
+    assert value["components"]["schemas"]["A"]["properties"]["a"] == {
+        "type": "string",
+        "description": "Changed",
+    }
+    assert calls == [schema_a, schema_a.properties["a"]]
+    assert value["components"]["schemas"]["B"] is b_value
+    assert value["components"]["schemas"]["A"] is not a_value
+    assert value["paths"] is paths_value
+
+
+def test_get_value_after_container_change(cached_open_api):
+    value = cached_open_api.get_value()
+    path_item_value = value["paths"]["/a"]
+
+    cached_open_api.paths.values["/c"] = PathItem(summary="c")
+    value = cached_open_api.get_value()
+    assert value["paths"]["/c"] == {"summary": "c"}
+    assert value["paths"]["/a"] is path_item_value
+
+    cached_open_api.paths.values["/a"].get.tags.append("tag")
+    assert cached_open_api.get_value()["paths"]["/a"]["get"]["tags"] == ["tag"]
+
+    del cached_open_api.paths.values["/c"]
+    assert "/c" not in cached_open_api.get_value()["paths"]
+
+
+def test_get_value_after_nested_container_change():
+    requirement = SecurityRequirement(values={"oauth": ["read"]})
+    requirement.get_value()
+    requirement.values["oauth"].append("write")
+    assert requirement.get_value() == {"oauth": ["read", "write"]}
+
+    media_type = MediaType(example={"birds": [{"name": "Tweety"}]})
+    media_type.get_value()
+    media_type.example["birds"].append({"name": "Woody"})
+    assert len(media_type.get_value()["example"]["birds"]) == 2
+
+    media_type.example["birds"][1]["name"] = "Zazu"
+    assert media_type.get_value()["example"]["birds"][1] == {"name": "Zazu"}
+
+
+def test_get_value_shared_object(cached_open_api):
+    schema = Schema(type="integer")
+    cached_open_api.components.schemas["A"].properties["shared"] = schema
+    cached_open_api.components.schemas["B"].properties["shared"] = schema
+    cached_open_api.get_value()
+
+    schema.format = "int64"
+    schemas = cached_open_api.get_value()["components"]["schemas"]
+    assert schemas["A"]["properties"]["shared"]["format"] == "int64"
+    assert schemas["B"]["properties"]["shared"]["format"] == "int64"
+
+
+def test_get_value_after_copy(cached_open_api):
+    value = cached_open_api.get_value()
+    copied = copy.deepcopy(cached_open_api)
+    assert copied == cached_open_api
+    assert copied.get_value() == value
+
+    copied.components.schemas["A"].description = "Copied"
+    assert copied.get_value()["components"]["schemas"]["A"]["description"] == "Copied"
+    assert (
+        "description" not in cached_open_api.get_value()["components"]["schemas"]["A"]
+    )
+
+
+def test_slots():
+    schema = Schema(type="string")
+    assert not hasattr(schema, "__dict__") or not schema.__dict__
+    assert "type" in Schema.__slots__
+
+    # other attributes can still be assigned.
+    schema.nullable = True
+    assert schema.nullable is True
+    assert pickle.loads(pickle.dumps(schema)).nullable is True
+
+
+def test_lazy_containers():
+    schema = Schema(type="object")
+    assert schema._properties is None
+    assert schema.properties == {}
+    assert schema.all_of == []
+    assert schema._properties is None  # reading doesn't allocate
+
+    properties = schema.properties
+    properties["a"] = Schema(type="string")
+    assert schema._properties is properties
+    assert type(properties) is TrackedDict
+    assert schema.get_value()["properties"] == {"a": {"type": "string"}}
+
+    # a container that was read before another container was allocated.
+    all_of, stale = schema.all_of, schema.all_of
+    all_of.append(Schema(type="string"))
+    stale.append(Schema(type="integer"))
+    assert len(schema.all_of) == 2
+
+
+def test_lazy_containers_assignment():
+    schema = Schema(properties={"a": Schema()})
+    assert schema.properties == {"a": Schema()}
+
+    other = Schema(enum=schema.enum)  # assigning an unallocated container
+    assert other._enum is None
+
+    schema.properties = {}
+    assert schema.get_value() == {}
+
+
+def test_lazy_containers_change_tracking():
+    schema = Schema(type="object")
+    schema.get_value()
+    schema.properties["a"] = Schema(type="string")
+    assert "properties" in schema.get_value()
+
+    schema.get_value()
+    schema.properties["a"].type = "integer"
+    assert schema.get_value()["properties"]["a"] == {"type": "integer"}
+
+
+def test_lazy_containers_fields():
+    fields = {field.name: field for field in dataclasses.fields(Schema)}
+    assert fields["properties"].default_factory is dict
+    assert fields["enum"].default_factory is list
+    assert fields["properties"].default is dataclasses.MISSING
+    # the containers are still allocated lazily.
+    assert Schema()._properties is None
+
+
+def test_parents_allocated_lazily():
+    schema = Schema(type="string")
+    assert schema._parents is None
+    parent = Schema(items=schema)
+    assert list(schema._parents.values())[0]() is parent
+
+
+def test_lazy_containers_asdict():
+    value = dataclasses.asdict(Schema())
+    assert type(value["properties"]) is dict
+    value["properties"]["a"] = {"type": "string"}
+    value["enum"].append("a")
+
+
+def test_containers_copied_on_assignment():
+    properties = {"a": Schema(type="string")}
+    schema = Schema(type="object", properties=properties)
+    assert schema.properties is not properties
+    assert schema.properties == properties
+
+    properties["b"] = Schema(type="integer")
+    assert list(schema.get_value()["properties"]) == ["a"]
+    schema.properties["b"] = properties["b"]
+    assert list(schema.get_value()["properties"]) == ["a", "b"]
+
+
+def test_lazy_containers_copy():
+    schema = Schema(type="object")
+    schema.enum.append("a")
+    for copied in (pickle.loads(pickle.dumps(schema)), copy.deepcopy(schema)):
+        assert copied == schema
+        assert copied._properties is None
+        copied.properties["b"] = Schema()
+        assert copied.get_value()["properties"] == {"b": {}}
+
+    assert dataclasses.replace(schema, type="string").enum == ["a"]
+
+
+def test_intern_schema():
+    schema = intern_schema(Schema(type="string"))
+    assert schema.is_shared
+    assert intern_schema(Schema(type="string")) is schema
+    assert intern_schema(Schema(type="integer")) is not schema
+    # equal values of different types aren't shared.
+    assert intern_schema(Schema(example=1)) is not intern_schema(Schema(example=True))
+
+    parent = Schema(properties={"a": schema, "b": schema})
+    assert parent.get_value()["properties"]["b"] is schema.get_value()
+    assert not schema._parents  # shared schemas don't track their parents
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [
+        Schema(type="array", items=Schema(type="string")),
+        Schema(properties={"a": Schema()}),
+        Schema(type="object", default={"a": 1}),
+        Schema(type=["string", "null"]),
+    ],
+)
+def test_intern_schema_not_shared(schema):
+    assert intern_schema(schema) is schema
+    assert not schema.is_shared
+
+
+def test_intern_schema_contained():
+    schema = Schema(type="string")
+    Schema(items=schema)
+    assert intern_schema(schema) is schema
+
+    schema = Schema(type="string")
+    schema.nullable = True
+    assert intern_schema(schema) is schema
+
+
+def test_intern_schema_no_dict():
+    class ProbedSchema(Schema):
+        @property
+        def __dict__(self):
+            raise AssertionError("The __dict__ is allocated when it's read.")
+
+    schema = ProbedSchema(type="string")
+    assert intern_schema(schema) is schema
+    assert schema.is_shared
+
+
+def test_shared_schema_immutable():
+    schema = intern_schema(Schema(type="string"))
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        schema.description = "Description"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        schema.properties["a"] = Schema()
+    assert schema.get_value() == {"type": "string"}
+
+    writable = schema.writable()
+    assert writable is not schema and writable == schema
+    writable.description = "Description"
+    writable.properties["a"] = Schema()
+    assert schema.get_value() == {"type": "string"}
+    assert writable.writable() is writable
+
+
+def test_shared_schema_copy():
+    schema = intern_schema(Schema(type="string", format="email"))
+    assert pickle.loads(pickle.dumps(schema)) is schema
+    assert copy.deepcopy(Schema(items=schema)).items is schema
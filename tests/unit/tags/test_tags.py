@@ -0,0 +1,58 @@
+import pytest
+from flask import Blueprint, jsonify
+
+from openapi_builder import add_documentation, set_resource_options
+from openapi_builder.specification import Tag
+from openapi_builder.tags import TagRegistry
+
+
+def test_tag_registry():
+    registry = TagRegistry([Tag(name="b")])
+    assert not registry.changed
+
+    assert registry.add(Tag(name="a"))
+    assert not registry.add(Tag(name="b", description="duplicate"))
+    assert registry.changed
+    assert "a" in registry
+    assert "c" not in registry
+    assert len(registry) == 2
+    assert [tag.name for tag in registry.sorted()] == ["a", "b"]
+    assert registry.sorted()[1].description is None  # the first tag is kept
+
+
+@pytest.fixture
+def blueprints(app):
+    """Blueprints with overlapping tags, registered in reverse alphabetical order."""
+    for name, tag_names in [("zoo", ["zoo", "animals"]), ("farm", ["animals", "farm"])]:
+        blueprint = Blueprint(name=name, import_name=__name__, url_prefix=f"/{name}")
+
+        @blueprint.route("/animals")
+        @add_documentation(tags=["custom"])
+        def get_animals():
+            return jsonify([])
+
+        set_resource_options(blueprint, tags=[Tag(name=n) for n in tag_names])
+        app.register_blueprint(blueprint)
+
+
+@pytest.mark.usefixtures("blueprints")
+def test_tags_merged(open_api_documentation):
+    open_api_documentation.specification.tags.append(Tag(name="existing"))
+    configuration = open_api_documentation.get_specification()
+
+    assert [tag["name"] for tag in configuration["tags"]] == [
+        "animals",
+        "existing",
+        "farm",
+        "zoo",
+    ]
+    assert configuration["paths"]["/zoo/animals"]["get"]["tags"] == [
+        "custom",
+        "zoo",
+        "animals",
+    ]
+    assert configuration["paths"]["/farm/animals"]["get"]["tags"] == [
+        "custom",
+        "animals",
+        "farm",
+    ]
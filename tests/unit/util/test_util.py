@@ -0,0 +1,61 @@
+import pytest
+from werkzeug.routing import Map, Rule
+
+from openapi_builder.util import (
+    RouteTemplate,
+    compile_rule,
+    openapi_endpoint_name_from_rule,
+)
+
+
+def bind(rule: str) -> Rule:
+    """Returns the rule, bound to a url map (which parses it)."""
+    rule = Rule(rule)
+    Map([rule])
+    return rule
+
+
+@pytest.mark.parametrize(
+    "rule, expected",
+    [
+        ("/users", RouteTemplate("/users", ())),
+        ("/users/<user_id>", RouteTemplate("/users/{user_id}", ("user_id",))),
+        ("/users/<int:user_id>", RouteTemplate("/users/{user_id}", ("user_id",))),
+        (
+            "/countries/<string(length=2):code>",
+            RouteTemplate("/countries/{code}", ("code",)),
+        ),
+        (
+            "/items/<any(a, b):kind>/<path:rest>",
+            RouteTemplate("/items/{kind}/{rest}", ("kind", "rest")),
+        ),
+        (
+            # an argument that is a substring of another argument.
+            "/<int:id>/<int:user_id>/<id_suffix>",
+            RouteTemplate(
+                "/{id}/{user_id}/{id_suffix}", ("id", "user_id", "id_suffix")
+            ),
+        ),
+        ("/files/<name>.json", RouteTemplate("/files/{name}.json", ("name",))),
+    ],
+)
+def test_compile_rule(rule, expected):
+    assert compile_rule(bind(rule)) == expected
+
+
+def test_compile_rule_cached():
+    assert compile_rule(bind("/cached/<int:x>")) is compile_rule(
+        bind("/cached/<int:x>")
+    )
+
+
+def test_compile_rule_subdomain():
+    rule = Rule("/users/<int:user_id>", subdomain="<tenant>")
+    Map([rule], host_matching=False)
+    assert compile_rule(rule) == RouteTemplate("/users/{user_id}", ("user_id",))
+
+
+def test_openapi_endpoint_name_from_rule():
+    rule = Rule("/countries/<string(length=2):code>/cities/<int:city_id>")
+    Map([rule])
+    assert openapi_endpoint_name_from_rule(rule) == "/countries/{code}/cities/{city_id}"